@@ -0,0 +1,71 @@
+"""Measure the overhead the rewritten bytecode adds to every call.
+
+A function calls a leaf function many times, with 0, 3 and 10 positional
+arguments and with keyword arguments. The decorator returns the functions
+as is, so the difference from the undecorated function is the cost of the
+call site wrapping alone:
+
+    $ python benchmarks/call_overhead.py
+"""
+import timeit
+
+from recursive_decorator import recursive_decorator
+
+CALLS = 1000
+REPEAT = 25
+NUMBER = 20
+
+
+def identity_decorator(func):
+    return func
+
+
+def leaf(*args, **kwargs):
+    pass
+
+
+def args_0(count):
+    for _ in range(count):
+        leaf()
+
+
+def args_3(count):
+    for value in range(count):
+        leaf(value, 1, 2)
+
+
+def args_10(count):
+    for value in range(count):
+        leaf(value, 1, 2, 3, 4, 5, 6, 7, 8, 9)
+
+
+def args_3_kwargs(count):
+    for value in range(count):
+        leaf(value, 1, 2, a=3, b=4)
+
+
+def args_10_kwargs(count):
+    for value in range(count):
+        leaf(value, 1, 2, 3, 4, 5, 6, 7, 8, 9, a=10, b=11)
+
+
+def measure(func):
+    """Return best time of a call of leaf in nanoseconds."""
+    return min(timeit.repeat(lambda: func(CALLS), repeat=REPEAT,
+                             number=NUMBER)) / NUMBER / CALLS * 1e9
+
+
+def main():
+    decorate = recursive_decorator(identity_decorator)
+
+    print("{:<16} {:>12} {:>12} {:>12}".format(
+        "call", "plain ns", "wrapped ns", "overhead ns"))
+    for func in (args_0, args_3, args_10, args_3_kwargs, args_10_kwargs):
+        plain = measure(func)
+        wrapped = measure(decorate(func))
+        print("{:<16} {:>12.1f} {:>12.1f} {:>12.1f}".format(
+            func.__name__, plain, wrapped, wrapped - plain))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Measure the import time of recursive_decorator and of its engine.
+
+Importing the package doesn't import the rewriting backend, which is
+imported with its dependencies on the first decoration. Every measure runs
+in a new interpreter, the import is broken down by ``python -X importtime``
+(since 3.7):
+
+    $ python benchmarks/import_time.py
+"""
+import json
+import subprocess
+import sys
+
+REPEAT = 10
+SLOWEST_IMPORTS = 10
+
+MEASURE_SCRIPT = """\
+import json
+import sys
+import time
+
+start = time.perf_counter()
+import recursive_decorator
+imported = time.perf_counter()
+modules = set(sys.modules)
+
+def func():
+    pass
+
+recursive_decorator.recursive_decorator(lambda func: func)(func)()
+decorated = time.perf_counter()
+
+print(json.dumps({"import": imported - start,
+                  "decoration": decorated - imported,
+                  "modules": sorted(set(sys.modules) - modules)}))
+"""
+
+
+def measure():
+    """Return times of the import and of the first decoration.
+
+    Return:
+        dict. import and decoration times in seconds, and the modules
+            imported by the first decoration.
+    """
+    output = subprocess.run([sys.executable, "-c", MEASURE_SCRIPT],
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True).stdout
+    return json.loads(output)
+
+
+def import_times():
+    """Return self import times of modules imported by the package.
+
+    Return:
+        list. (self time in microseconds, module name), slowest first.
+    """
+    output = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                             "import recursive_decorator"],
+                            stderr=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True).stderr
+    times = []
+    for line in output.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if len(fields) == 3 and fields[0].strip().isdigit():
+            times.append((int(fields[0]), fields[2].strip()))
+
+    return sorted(times, reverse=True)
+
+
+def main():
+    measures = [measure() for _ in range(REPEAT)]
+
+    print("{:<40} {:>12}".format("step", "best us"))
+    for step in ("import", "decoration"):
+        print("{:<40} {:>12.0f}".format(
+            step, min(measure[step] for measure in measures) * 1e6))
+
+    print()
+    print("imported on first decoration:")
+    for name in measures[0]["modules"]:
+        print("    " + name)
+
+    if sys.version_info >= (3, 7):
+        print()
+        print("{:<40} {:>12}".format("slowest imports", "self us"))
+        for time, name in import_times()[:SLOWEST_IMPORTS]:
+            print("{:<40} {:>12}".format(name, time))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""Compare the sys.monitoring engine with the bytecode rewriting engines.
+
+The engines count the calls of a shallow call tree (one function calling a
+leaf many times) and of a deep call tree (a recursion), with the same logic
+before and after every function, either wrapping it (rewriting) or injected
+into its code (hooks). Requires Python 3.12:
+
+    $ python benchmarks/monitoring_vs_rewriting.py
+"""
+import sys
+import timeit
+from functools import wraps
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.hooks import recursive_hooks
+from recursive_decorator.monitoring import recursive_monitor
+
+SHALLOW_CALLS = 1000
+DEEP_DEPTH = 200
+REPEAT = 5
+NUMBER = 20
+
+calls = [0]
+
+
+def before():
+    calls[0] += 1
+
+
+def after():
+    pass
+
+
+def counting_decorator(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        before()
+        try:
+            return func(*args, **kwargs)
+
+        finally:
+            after()
+
+    return wrapper
+
+
+def on_enter(code, frame_args):
+    before()
+
+
+def on_exit(code, result):
+    after()
+
+
+def leaf(value):
+    return value + 1
+
+
+def shallow(count):
+    total = 0
+    for value in range(count):
+        total += leaf(value)
+
+    return total
+
+
+def deep(depth):
+    if depth == 0:
+        return 0
+
+    return deep(depth - 1) + 1
+
+
+def measure(func, arg):
+    """Return best time of a call of func in microseconds."""
+    return min(timeit.repeat(lambda: func(arg), repeat=REPEAT,
+                             number=NUMBER)) / NUMBER * 1e6
+
+
+def main():
+    if sys.version_info < (3, 12):
+        sys.exit("sys.monitoring requires Python 3.12")
+
+    engines = (
+        ("undecorated", lambda func: func),
+        ("rewriting", recursive_decorator(counting_decorator)),
+        ("hooks", recursive_hooks(on_enter=on_enter, on_exit=on_exit)),
+        ("monitoring", recursive_monitor(on_enter=on_enter,
+                                         on_exit=on_exit)),
+    )
+
+    print("{:<10} {:<12} {:>12} {:>8}".format("tree", "engine",
+                                              "usec/call", "ratio"))
+    for tree, func, arg in (("shallow", shallow, SHALLOW_CALLS),
+                            ("deep", deep, DEEP_DEPTH)):
+        baseline = None
+        for engine, decorate in engines:
+            elapsed = measure(decorate(func), arg)
+            baseline = baseline or elapsed
+            print("{:<10} {:<12} {:>12.1f} {:>7.1f}x".format(
+                tree, engine, elapsed, elapsed / baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare pass-through wrappers with wrappers specialized to signatures.
+
+A function calls a leaf of fixed arity many times, with the same logic
+before and after every function: in a wrapper taking *args and **kwargs,
+in a wrapper generated with the signature of the leaf, and injected into
+the code of the leaf:
+
+    $ python benchmarks/specialized_wrappers.py
+"""
+import timeit
+from functools import wraps
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.hooks import recursive_hooks
+from recursive_decorator.specialized import recursive_specialized
+
+CALLS = 1000
+REPEAT = 25
+NUMBER = 20
+
+calls = [0]
+
+
+def on_enter(code, frame_args):
+    calls[0] += 1
+
+
+def pass_through_decorator(func):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        on_enter(func.__code__, args)
+        return func(*args, **kwargs)
+
+    return wrapper
+
+
+def leaf(first, second, third=3):
+    return first + second + third
+
+
+def positional(count):
+    for value in range(count):
+        leaf(value, 1)
+
+
+def keywords(count):
+    for value in range(count):
+        leaf(value, second=1, third=2)
+
+
+def measure(func):
+    """Return best time of a call of leaf in nanoseconds."""
+    return min(timeit.repeat(lambda: func(CALLS), repeat=REPEAT,
+                             number=NUMBER)) / NUMBER / CALLS * 1e9
+
+
+def main():
+    engines = (
+        ("undecorated", lambda func: func),
+        ("pass-through", recursive_decorator(pass_through_decorator)),
+        ("specialized", recursive_specialized(on_enter=on_enter)),
+        ("hooks", recursive_hooks(on_enter=on_enter)),
+    )
+
+    print("{:<12} {:<14} {:>10}".format("call", "engine", "ns/call"))
+    for func in (positional, keywords):
+        for engine, decorate in engines:
+            print("{:<12} {:<14} {:>10.1f}".format(
+                func.__name__, engine, measure(decorate(func))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Measure the throughput of decorated call trees run by many threads.
+
+Every thread runs the same CPU bound call tree, decorated by a decorator
+returning the functions as is, after it was called once so all the call
+sites are cached. The cached call sites are read without locks, so the
+throughput of decorated trees should stay flat with threads like the
+throughput of plain trees. Free-threaded builds (3.13t and later) have no
+rewriting backend, so only GIL builds are measured:
+
+    $ python benchmarks/threads_throughput.py
+"""
+import os
+import sys
+import threading
+import time
+
+from recursive_decorator import recursive_decorator
+
+TREE_DEPTH = 12
+REPEAT = 3
+
+
+def identity_decorator(func):
+    return func
+
+
+def leaf(value):
+    return value % 7
+
+
+def node(depth, value):
+    if depth == 0:
+        return leaf(value)
+
+    return node(depth - 1, value * 2) + node(depth - 1, value * 2 + 1)
+
+
+def call_tree():
+    return node(TREE_DEPTH, 1)
+
+
+def threads_counts():
+    """Return threads counts to measure, powers of 2 up to the cores."""
+    cores = os.cpu_count() or 1
+    counts = [1]
+    while counts[-1] * 2 <= cores:
+        counts.append(counts[-1] * 2)
+
+    if counts[-1] != cores:
+        counts.append(cores)
+
+    return counts
+
+
+def measure(func, threads_count):
+    """Return best throughput of func run by threads, in calls per second.
+
+    Every thread runs func once, so the calls count is the threads count.
+    """
+    best = None
+    for _ in range(REPEAT):
+        barrier = threading.Barrier(threads_count + 1)
+
+        def run():
+            barrier.wait()
+            func()
+
+        threads = [threading.Thread(target=run)
+                   for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+
+        start = time.perf_counter()
+        barrier.wait()
+        for thread in threads:
+            thread.join()
+
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return threads_count / best
+
+
+def main():
+    decorated = recursive_decorator(identity_decorator)(call_tree)
+    assert decorated() == call_tree()
+
+    gil_enabled = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print("GIL enabled: {}, cores: {}".format(gil_enabled, os.cpu_count()))
+    print("{:<10} {:>16} {:>16} {:>10}".format(
+        "threads", "plain trees/s", "wrapped trees/s", "speedup"))
+
+    base = None
+    for threads_count in threads_counts():
+        plain = measure(call_tree, threads_count)
+        wrapped = measure(decorated, threads_count)
+        base = base or wrapped
+        print("{:<10} {:>16.1f} {:>16.1f} {:>10.2f}".format(
+            threads_count, plain, wrapped, wrapped / base))
+
+
+if __name__ == "__main__":
+    main()
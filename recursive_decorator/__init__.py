@@ -1 +1,2 @@
-from .recursive_decorator import recursive_decorator
+from .recursive_decorator import recursive_decorator, compose
+from .code_switch import disable_all, enable_all
@@ -0,0 +1,70 @@
+"""Selection of the backend rewriting bytecode of decorated functions."""
+import os
+import sys
+from importlib import import_module
+
+BACKEND_ENVIRONMENT_VARIABLE = "RECURSIVE_DECORATOR_BACKEND"
+
+CODETRANSFORMER_BACKEND = "codetransformer"
+NATIVE_BACKEND = "native"
+
+BACKENDS = {
+    CODETRANSFORMER_BACKEND: ("recursive_decorator.transformer",
+                              "RecursiveDecoratorCallTransformer"),
+    NATIVE_BACKEND: ("recursive_decorator.native_transformer",
+                     "NativeCallTransformer"),
+}
+
+# First and last interpreters whose bytecode the native backend rewrites
+NATIVE_BACKEND_VERSIONS = ((3, 6), (3, 12))
+
+
+def default_backend():
+    """Return name of the default backend of the running interpreter.
+
+    codetransformer supports the interpreters until 3.7, the native backend
+    is used since 3.8 until 3.12.
+
+    Return:
+        str. the backend name, None if no backend supports the interpreter.
+    """
+    version = sys.version_info[:2]
+    if version < (3, 8):
+        return CODETRANSFORMER_BACKEND
+
+    if version <= NATIVE_BACKEND_VERSIONS[1]:
+        return NATIVE_BACKEND
+
+    return None
+
+
+backend_name = os.environ.get(BACKEND_ENVIRONMENT_VARIABLE) or \
+    default_backend()
+
+
+def get_transformer_class(name=None):
+    """Return transformer class of given backend.
+
+    A transformer is created with the function module and the decorator to
+    apply on sub calls, returns the transformed function when called with a
+    function and lists its created call sites in call_sites.
+
+    Args:
+        name(str): name of backend, the configured backend if None.
+
+    Return:
+        type. the transformer class.
+
+    Raise:
+        ImportError. if no backend supports the running interpreter.
+    """
+    name = name or backend_name
+    if name is None:
+        raise ImportError(
+            "No backend rewrites the bytecode of Python {}.{}, the last "
+            "supported version is {}.{}".format(*sys.version_info[:2] +
+                                                NATIVE_BACKEND_VERSIONS[1]))
+
+    module_name, class_name = BACKENDS[name]
+
+    return getattr(import_module(module_name), class_name)
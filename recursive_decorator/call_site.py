@@ -0,0 +1,370 @@
+"""Inline cache of call sites rewritten by recursive_decorator."""
+import threading
+from itertools import count
+from types import CodeType
+from weakref import KeyedRef, WeakSet, ref
+
+from recursive_decorator.decoration_switch import decoration_switch
+from recursive_decorator.utils import is_function, is_method, \
+    replace_code, weak_callback
+
+_call_sites = WeakSet()
+_call_sites_lock = threading.Lock()
+
+
+class _NotCached(object):
+    """Sentinel of empty monomorphic cache."""
+
+
+_NOT_CACHED = _NotCached()
+_EMPTY_ENTRY = (ref(_NOT_CACHED), None)
+
+
+class CallSite(object):
+    """Inline cache of a rewritten call site.
+
+    The rewritten bytecode calls the call site with the callee, instead of
+    decorating the callee on every call. Functions are decorated once and
+    their wrapped callable is returned on the next calls, methods are
+    cached by their underlying function and bound again on each call.
+    Callees are referenced weakly, their entry is removed when collected.
+    Threads missing the same callee together wait for the first one to
+    decorate it, so a cached callee is decorated once. The last entry is
+    published as a single tuple, so a thread never reads the callee of one
+    entry with the wrapped callable of another.
+    While the decoration switch is disabled in the running context, callees
+    are returned as is.
+    Call sites created by transformers without a decorator are unbound,
+    they are turned into templates and bound by every recursive decorator
+    to itself, and aren't listed by get_call_sites.
+
+    Arguments:
+        decorate(func): decorator to apply on callees on cache miss, None
+            for unbound call site.
+        location(str): location of the call site in source code.
+        static_callee(tuple): names of global and attributes loading the
+            callee, None if the callee isn't loaded statically.
+
+    Attributes:
+        name(str): unique name of call site.
+        hits(int): number of calls answered from cache, approximate when
+            called by concurrent threads.
+        misses(int): number of calls that decorated the callee.
+        megamorphic(bool): whether the call site saw more callees than
+            the cache can hold.
+    """
+    SITE_NAME_PATTERN = "{decorator_name}_site_{index}"
+    POLYMORPHIC_LIMIT = 4
+
+    _indexes = count()
+
+    def __init__(self, decorate, location, static_callee=None):
+        self.decorate = decorate
+        self.location = location
+        self.static_callee = static_callee
+        self.name = self.SITE_NAME_PATTERN.format(
+            decorator_name=getattr(decorate, "__name__", "unbound"),
+            index=next(self._indexes))
+
+        self.hits = 0
+        self.misses = 0
+        self.megamorphic = False
+
+        self.entries = {}
+        self.last_entry = _EMPTY_ENTRY
+
+        # Reentrant, since decorating may call the call site again
+        self._miss_lock = threading.RLock()
+        self._forget_callback = weak_callback(self._forget)
+
+        if decorate is not None:
+            with _call_sites_lock:
+                _call_sites.add(self)
+
+    def __call__(self, callee):
+        """Return callee wrapped with the decorator.
+
+        Args:
+            callee(object): the called object.
+
+        Return:
+            object. wrapped callee, the callee itself if the decoration is
+                disabled.
+        """
+        if not decoration_switch.is_enabled():
+            return callee
+
+        last_callee, last_wrapped = self.last_entry
+        if last_callee() is callee:
+            self.hits += 1
+            return last_wrapped
+
+        if is_method(callee):
+            wrapped_as_function = self(callee.__func__)
+            instance = callee.__self__
+
+            return wrapped_as_function.__get__(instance, instance.__class__)
+
+        if not is_function(callee):
+            return callee
+
+        entry = self.entries.get(id(callee))
+        if entry is None:
+            entry = self.miss(callee)
+
+        else:
+            self.hits += 1
+
+        self.last_entry = entry
+
+        return entry[1]
+
+    def miss(self, callee):
+        """Decorate and cache callee function missing from the cache.
+
+        Once megamorphic, callees aren't cached and are decorated without
+        waiting for other threads.
+
+        Args:
+            callee(function): the called function.
+
+        Return:
+            tuple. the cache entry, weak reference to callee and wrapped.
+        """
+        if self.megamorphic:
+            self.misses += 1
+            return self.cache(callee, self.decorate(callee))
+
+        with self._miss_lock:
+            entry = self.entries.get(id(callee))
+            if entry is not None:
+                self.hits += 1
+                return entry
+
+            self.misses += 1
+            return self.cache(callee, self.decorate(callee))
+
+    def cache(self, callee, wrapped):
+        """Cache wrapped callable of callee function.
+
+        Args:
+            callee(function): the called function.
+            wrapped(object): the callee wrapped with the decorator.
+
+        Return:
+            tuple. the cache entry, weak reference to callee and wrapped.
+        """
+        entry = (KeyedRef(callee, self._forget_callback, id(callee)),
+                 wrapped)
+
+        if len(self.entries) < self.POLYMORPHIC_LIMIT:
+            self.entries[id(callee)] = entry
+
+        else:
+            self.megamorphic = True
+
+        return entry
+
+    def template(self):
+        """Return template of call site, not referencing its decorator.
+
+        Return:
+            CallSiteTemplate. template of the same call, weakly referencing
+                the decorator of bound call sites.
+        """
+        return CallSiteTemplate(self.decorate, self.location,
+                                self.static_callee)
+
+    def is_cached(self, callee):
+        """Return if callee function is cached in the call site.
+
+        Args:
+            callee(function): the called function.
+
+        Return:
+            bool. true if callee is cached else false.
+        """
+        return id(callee) in self.entries
+
+    def _forget(self, callee_ref):
+        """Remove entry of collected callee.
+
+        Args:
+            callee_ref(KeyedRef): weak reference to the collected callee.
+        """
+        entry = self.entries.get(callee_ref.key)
+        if entry is not None and entry[0] is callee_ref:
+            self.entries.pop(callee_ref.key, None)
+
+        if self.last_entry[0] is callee_ref:
+            self.last_entry = _EMPTY_ENTRY
+
+    def __repr__(self):
+        return "<{} {} at {} hits={} misses={}>".format(
+            self.__class__.__name__, self.name, self.location,
+            self.hits, self.misses)
+
+
+class CallSiteTemplate(object):
+    """Call site of cached transformed code, bound once per decorator.
+
+    Templates of call sites created by the transformer are bound to the
+    decorator binding the code. Templates of call sites the code already
+    had, as the call sites of decorated code decorated again, are bound to
+    their own decorator while it is alive. Templates have no cache and
+    reference decorators weakly, so cached transformed code doesn't keep
+    decorators, nor the callees they decorated, alive.
+
+    Arguments:
+        decorate(func): decorator of the call site, None for the binding
+            decorator.
+        location(str): location of the call site in source code.
+        static_callee(tuple): names of global and attributes loading the
+            callee, None if the callee isn't loaded statically.
+
+    Attributes:
+        bound(bool): whether the template has its own decorator.
+    """
+
+    def __init__(self, decorate, location, static_callee=None):
+        self.location = location
+        self.static_callee = static_callee
+        self.bound = decorate is not None
+
+        self._decorate_ref = None
+        if decorate is not None:
+            try:
+                self._decorate_ref = ref(decorate)
+
+            except TypeError:
+                # Not weakly referable, kept alive by the template
+                self._decorate_ref = lambda: decorate
+
+    def bind(self, decorate):
+        """Return new call site of the template.
+
+        Args:
+            decorate(func): decorator binding the code of the template.
+
+        Return:
+            CallSite. call site decorating with its own decorator if alive,
+                else with decorate.
+        """
+        own_decorate = None if self._decorate_ref is None else \
+            self._decorate_ref()
+
+        return CallSite(decorate if own_decorate is None else own_decorate,
+                        self.location, self.static_callee)
+
+
+def get_call_sites():
+    """Return all live call sites.
+
+    Return:
+        list. call sites sorted by number of misses, most missed first.
+    """
+    with _call_sites_lock:
+        call_sites = list(_call_sites)
+
+    return sorted(call_sites, key=lambda site: site.misses, reverse=True)
+
+
+def resolve_static_callee(static_callee, namespace):
+    """Return function loaded by global and attributes names.
+
+    Attributes are looked up statically, so no descriptor code is run.
+
+    Args:
+        static_callee(tuple): global name and attributes names.
+        namespace(dict): globals of the loading code.
+
+    Return:
+        object. the loaded object, None if not resolved.
+    """
+    # inspect is slow to import, and only needed once decorating
+    from inspect import getattr_static
+
+    global_name, attributes = static_callee[0], static_callee[1:]
+    builtins = namespace.get("__builtins__", {})
+    builtins = getattr(builtins, "__dict__", builtins)
+
+    value = namespace.get(global_name, builtins.get(global_name))
+    try:
+        for attribute in attributes:
+            value = getattr_static(value, attribute)
+
+    except AttributeError:
+        return None
+
+    if isinstance(value, (staticmethod, classmethod)):
+        return value.__func__
+
+    return value
+
+
+def get_code_call_sites(code):
+    """Return call sites loaded by code and its nested code.
+
+    Args:
+        code(code): transformed code loading call sites as constants.
+
+    Return:
+        list. the call sites of code.
+    """
+    call_sites = []
+    for const in code.co_consts:
+        if isinstance(const, CallSite):
+            call_sites.append(const)
+
+        elif isinstance(const, CodeType):
+            call_sites.extend(get_code_call_sites(const))
+
+    return call_sites
+
+
+def _replace_consts(code, const_type, replace):
+    """Return copy of code and nested code with constants of type replaced.
+
+    Args:
+        code(code): code to replace its constants.
+        const_type(type): type of replaced constants.
+        replace(function): returns the new constant of a constant.
+
+    Return:
+        code. the new code, code itself if it has no constant of type.
+    """
+    consts = tuple(
+        replace(const) if isinstance(const, const_type) else
+        _replace_consts(const, const_type, replace)
+        if isinstance(const, CodeType) else const
+        for const in code.co_consts)
+    if all(new is old for new, old in zip(consts, code.co_consts)):
+        return code
+
+    return replace_code(code, co_consts=consts)
+
+
+def make_code_template(code):
+    """Return template of transformed code, its call sites as templates.
+
+    Args:
+        code(code): transformed code.
+
+    Return:
+        code. the code with call sites templates, not to be run.
+    """
+    return _replace_consts(code, CallSite, CallSite.template)
+
+
+def bind_code_template(template, decorate):
+    """Return code of template with new call sites bound to decorate.
+
+    Args:
+        template(code): template of transformed code.
+        decorate(func): recursive decorator applied by the call sites.
+
+    Return:
+        code. the code to run.
+    """
+    return _replace_consts(template, CallSiteTemplate,
+                           lambda site: site.bind(decorate))
@@ -0,0 +1,144 @@
+"""Process wide switch swapping the code of decorated functions.
+
+Every function created by recursive_decorator runs rewritten code. The
+switch tracks the original code of these functions, and disabling it
+assigns their original code back to them, so their sub calls run as is
+without any check on the call path. Enabling it assigns the rewritten
+code again.
+"""
+import threading
+import time
+from collections import namedtuple
+from weakref import KeyedRef
+
+from recursive_decorator.utils import weak_callback
+
+SwapStats = namedtuple("SwapStats", ["functions", "seconds"])
+
+
+class CodeSwitch(object):
+    """Switch between the original and the rewritten code of functions.
+
+    Functions are referenced weakly, their entries are removed when
+    collected. Functions tracked while the switch is disabled get their
+    original code at once.
+
+    Attributes:
+        enabled(bool): whether the functions run their rewritten code.
+        functions(dict): (function ref, original code, rewritten code) by
+            the function id.
+    """
+
+    def __init__(self):
+        self.enabled = True
+        self.functions = {}
+
+        self._lock = threading.RLock()
+        self._forget_callback = weak_callback(self._forget)
+
+    def track(self, func, original_code):
+        """Track function running rewritten code.
+
+        Args:
+            func(function): function running its rewritten code.
+            original_code(code): code to run while disabled.
+        """
+        rewritten_code = func.__code__
+        with self._lock:
+            self.functions[id(func)] = (
+                KeyedRef(func, self._forget_callback, id(func)),
+                original_code,
+                rewritten_code)
+
+            if not self.enabled:
+                func.__code__ = original_code
+
+    def original_code(self, func):
+        """Return original code of function, its code if not tracked.
+
+        Args:
+            func(function): function to return its original code.
+
+        Return:
+            code. the code of the function before rewriting.
+        """
+        entry = self.functions.get(id(func))
+        if entry is None or entry[0]() is not func:
+            return func.__code__
+
+        return entry[1]
+
+    def disable_all(self):
+        """Assign their original code to all tracked functions.
+
+        Return:
+            SwapStats. number of functions swapped and the swap duration.
+        """
+        return self._swap(enabled=False)
+
+    def enable_all(self):
+        """Assign their rewritten code to all tracked functions.
+
+        Return:
+            SwapStats. number of functions swapped and the swap duration.
+        """
+        return self._swap(enabled=True)
+
+    def _swap(self, enabled):
+        """Assign original or rewritten code to all tracked functions.
+
+        Functions whose code was assigned by others are left as is.
+
+        Args:
+            enabled(bool): whether to assign the rewritten code.
+
+        Return:
+            SwapStats. number of functions swapped and the swap duration.
+        """
+        start = time.perf_counter()
+        swapped = 0
+        with self._lock:
+            self.enabled = enabled
+            for func_ref, original_code, rewritten_code in \
+                    list(self.functions.values()):
+                func = func_ref()
+                old_code, new_code = (original_code, rewritten_code) \
+                    if enabled else (rewritten_code, original_code)
+                if func is not None and func.__code__ is old_code:
+                    func.__code__ = new_code
+                    swapped += 1
+
+        return SwapStats(functions=swapped,
+                         seconds=time.perf_counter() - start)
+
+    def _forget(self, func_ref):
+        """Remove entry of collected function.
+
+        Args:
+            func_ref(KeyedRef): weak reference to the collected function.
+        """
+        with self._lock:
+            entry = self.functions.get(func_ref.key)
+            if entry is not None and entry[0] is func_ref:
+                del self.functions[func_ref.key]
+
+
+code_switch = CodeSwitch()
+
+
+def disable_all():
+    """Run the original code in all functions decorated recursively.
+
+    Return:
+        SwapStats. number of functions swapped and the swap duration.
+    """
+    return code_switch.disable_all()
+
+
+def enable_all():
+    """Run the rewritten code in all functions decorated recursively.
+
+    Return:
+        SwapStats. number of functions swapped and the swap duration.
+    """
+    return code_switch.enable_all()
@@ -0,0 +1,112 @@
+"""Switch of the decoration of sub functions, scoped to the running context.
+
+The rewritten call sites check the switch on every call: when disabled,
+callees are called as is, so the sub functions run their original code,
+without transforming or swapping code. The switch is a context variable,
+so it is scoped to the running thread and asyncio task.
+"""
+import threading
+from contextlib import contextmanager
+
+try:
+    from contextvars import ContextVar
+
+except ImportError:
+    # Until 3.7, the switch is scoped to the running thread only
+    ContextVar = None
+
+
+class _ThreadLocalVar(object):
+    """Variable of the running thread, with the interface of ContextVar."""
+
+    def __init__(self, name):
+        self.name = name
+        self._local = threading.local()
+
+    def get(self, default):
+        """Return value of the running thread, default if not set."""
+        return getattr(self._local, "value", default)
+
+    def set(self, value):
+        """Set value of the running thread, return token of the old value."""
+        token = getattr(self._local, "value", _NOT_SET)
+        self._local.value = value
+
+        return token
+
+    def reset(self, token):
+        """Restore value of the running thread, before set of token."""
+        if token is _NOT_SET:
+            del self._local.value
+
+        else:
+            self._local.value = token
+
+
+class _NotSet(object):
+    """Sentinel of variable not set in the running thread."""
+
+
+_NOT_SET = _NotSet()
+
+
+class DecorationSwitch(object):
+    """Whether call sites decorate callees in the running context.
+
+    Contexts which didn't enable or disable the decoration use the default,
+    shared by all threads and tasks.
+
+    Arguments:
+        default(bool): whether the decoration is enabled by default.
+
+    Attributes:
+        default(bool): whether the decoration is enabled by default.
+    """
+    VARIABLE_NAME = "recursive_decorator_enabled"
+
+    def __init__(self, default=True):
+        self.default = default
+
+        variable_type = _ThreadLocalVar if ContextVar is None else ContextVar
+        self._enabled = variable_type(self.VARIABLE_NAME)
+
+    def is_enabled(self):
+        """Return whether the decoration is enabled in the running context.
+
+        Return:
+            bool. the value set in the running context, else the default.
+        """
+        return self._enabled.get(self.default)
+
+    def set_default(self, enabled):
+        """Set whether the decoration is enabled by default.
+
+        Args:
+            enabled(bool): whether the decoration is enabled in contexts
+                which didn't enable or disable it.
+        """
+        self.default = enabled
+
+    @contextmanager
+    def enabled(self, enabled=True):
+        """Enable the decoration in the running context, until exit.
+
+        Tasks and threads started by the context inherit the value, where
+        the context variables are copied to them.
+
+        Args:
+            enabled(bool): whether the decoration is enabled.
+        """
+        token = self._enabled.set(enabled)
+        try:
+            yield
+
+        finally:
+            self._enabled.reset(token)
+
+    def disabled(self):
+        """Disable the decoration in the running context, until exit."""
+        return self.enabled(False)
+
+
+decoration_switch = DecorationSwitch()
@@ -1,5 +1,45 @@
 """Adapter for decorator function"""
-from cached_property import cached_property
+import threading
+
+try:
+    from functools import cached_property
+
+except ImportError:
+    # Until 3.8
+    from cached_property import cached_property
+
+from recursive_decorator.utils import get_decorators_mask
+
+
+def _qualified_name(func):
+    """Return module and qualified name of function."""
+    return "{}.{}".format(getattr(func, "__module__", None),
+                          getattr(func, "__qualname__", func.__name__))
+
+
+class _NoWrapper(object):
+    """Sentinel of wrapper not created yet."""
+
+
+_NO_WRAPPER = _NoWrapper()
+
+
+class DecoratorChain(object):
+    """Decorator applying given decorators, the last one first.
+
+    Arguments:
+        decorators(tuple): the decorators, outermost first.
+    """
+
+    def __init__(self, *decorators):
+        self.decorators = decorators
+
+    def __call__(self, func):
+        """Return func decorated by all decorators."""
+        for decorator in reversed(self.decorators):
+            func = decorator(func)
+
+        return func
 
 
 class DecoratorAdapter(object):
@@ -10,36 +50,96 @@ class DecoratorAdapter(object):
         args(tuple): the decorator args.
         kwargs(dict): the decorator kwargs.
     """
-    ADAPTER_NAME_PATTERN = "{decorator_name}_adapter"
+    IDENTITY_KEY = "identity"
 
     def __init__(self, func, args, kwargs):
         self.func = func
         self.args = args
         self.kwargs = kwargs
 
-    @cached_property
+        self._wrapper = _NO_WRAPPER
+        # Reentrant, since the decorator may decorate with the adapter
+        self._wrapper_lock = threading.RLock()
+
+    @property
     def wrapper(self):
         """Get real decorator function after args injection if needed.
 
+        The decorator is called once with its args, even by concurrent
+        threads.
+
         Return:
             function. wrapper if has args or kwargs, else the decorator itself.
         """
-        if self.args or self.kwargs:
-            return self.func(*self.args, **self.kwargs)
+        wrapper = self._wrapper
+        if wrapper is _NO_WRAPPER:
+            with self._wrapper_lock:
+                if self._wrapper is _NO_WRAPPER:
+                    self._wrapper = self.func(*self.args, **self.kwargs) \
+                        if self.args or self.kwargs else self.func
 
-        return self.func
+                wrapper = self._wrapper
+
+        return wrapper
 
     @property
-    def adapter_name(self):
-        """Decorator adapter name."""
-        decorator_name = self.func.__name__
-        return self.ADAPTER_NAME_PATTERN.format(decorator_name=decorator_name)
+    def decorators(self):
+        """Decorators applied by the wrapper, innermost first.
+
+        Return:
+            list. the decorators of a chain, else the decorator itself.
+        """
+        if self.func is DecoratorChain:
+            return list(reversed(self.args))
+
+        return [self.func]
+
+    @cached_property
+    def mask(self):
+        """Wrapped mask of the decorators applied by the wrapper.
+
+        Return:
+            int. the bits of the decorators.
+        """
+        return get_decorators_mask(self.decorators)
+
+    @cached_property
+    def key(self):
+        """Hashable key of decorator and its args.
+
+        Args are keyed with their type, so equal args of other types (1,
+        True and 1.0) are told apart. Unhashable args are keyed by their
+        identity.
+
+        Return:
+            tuple. decorator, args and kwargs items.
+        """
+        kwargs_items = tuple(sorted(self.kwargs.items()))
+        key = (self.func,
+               tuple((type(arg), arg) for arg in self.args),
+               tuple((name, type(value), value)
+                     for name, value in kwargs_items))
+        try:
+            hash(key)
+
+        except TypeError:
+            key = (self.IDENTITY_KEY,
+                   id(self.func),
+                   tuple(id(arg) for arg in self.args),
+                   tuple((name, id(value)) for name, value in kwargs_items))
+
+        return key
 
     @property
-    def as_tuple(self):
-        """Return decorator fields as tuple.
+    def identity(self):
+        """Identity of decorator and its args, stable between processes.
 
         Return:
-            tuple. decorator, args, kwargs
+            str. decorator qualified name and args representation.
         """
-        return self.func, self.args, self.kwargs
+        args = self.args
+        if self.func is DecoratorChain:
+            args = tuple(_qualified_name(decorator) for decorator in args)
+
+        return "{}{!r}{!r}".format(_qualified_name(self.func), args,
+                                   sorted(self.kwargs.items()))
@@ -0,0 +1,299 @@
+"""Persistent cache of transformed code objects."""
+import marshal
+import os
+import sys
+from importlib.util import MAGIC_NUMBER
+from types import CodeType
+
+from recursive_decorator.backend import backend_name
+from recursive_decorator.call_site import CallSite, CallSiteTemplate, \
+    get_code_call_sites
+from recursive_decorator.elision import call_site_elision
+from recursive_decorator.utils import get_code_line_table, replace_code, \
+    FUNCTION_TYPES
+
+CACHE_DIRECTORY_ENVIRONMENT_VARIABLE = "RECURSIVE_DECORATOR_CACHE_DIR"
+
+# Constants of transformed code that marshal can't store, by their names
+RUNTIME_CONSTANTS = {"type": type, "function_types": FUNCTION_TYPES}
+RUNTIME_CONSTANT_MARKER = "__recursive_decorator_constant__"
+# Elided callees constants are stored by module and qualified name
+CALLEE_CONSTANT_MARKER = "__recursive_decorator_callee__"
+# Call sites templates are stored by location, static callee and whether
+# they are bound, and loaded bound to the decorator of the same call site of
+# the original code
+CALL_SITE_CONSTANT_MARKER = "__recursive_decorator_call_site__"
+
+
+def _update_code_digest(digest, code):
+    """Update digest with the fields of code and its nested code objects.
+
+    Args:
+        digest(hash): digest to update.
+        code(code): code to digest.
+    """
+    for field in (code.co_argcount, code.co_kwonlyargcount, code.co_nlocals,
+                  code.co_flags, code.co_names, code.co_varnames,
+                  code.co_freevars, code.co_cellvars, code.co_filename,
+                  code.co_name, code.co_firstlineno):
+        digest.update(repr(field).encode())
+
+    digest.update(code.co_code)
+    digest.update(get_code_line_table(code))
+    digest.update(getattr(code, "co_exceptiontable", b""))
+
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            _update_code_digest(digest, const)
+
+        elif isinstance(const, frozenset):
+            digest.update(repr(sorted(map(repr, const))).encode())
+
+        elif isinstance(const, (CallSite, CallSiteTemplate)):
+            # Call sites are created again by every process, and counted
+            digest.update(repr(
+                (CallSite, const.location, const.static_callee)).encode())
+
+        else:
+            digest.update(repr((type(const), const)).encode())
+
+
+def _replace_code_consts(code, replace):
+    """Return copy of code and its nested code with constants replaced.
+
+    Args:
+        code(code): code to replace its constants.
+        replace(function): returns the new constant of a constant.
+
+    Return:
+        code. the new code.
+    """
+    return replace_code(code, co_consts=tuple(
+        _replace_code_consts(const, replace)
+        if isinstance(const, CodeType) else replace(const)
+        for const in code.co_consts))
+
+
+def _find_callee(module_name, qualified_name):
+    """Return callee by its module and qualified name.
+
+    Modules are looked up in sys.modules only, so nothing is imported.
+
+    Return:
+        object. the callee, None if not found.
+    """
+    value = sys.modules.get(module_name)
+    for name in qualified_name.split("."):
+        value = getattr(value, name, None)
+
+    return value
+
+
+def _dump_constant(const):
+    """Return marker of runtime constant, or the constant itself."""
+    for name, value in RUNTIME_CONSTANTS.items():
+        if const is value:
+            return RUNTIME_CONSTANT_MARKER, name
+
+    if isinstance(const, CallSiteTemplate):
+        return CALL_SITE_CONSTANT_MARKER, const.location, \
+            const.static_callee, const.bound
+
+    if callable(const):
+        module_name = getattr(const, "__module__", None)
+        qualified_name = getattr(const, "__qualname__", None)
+        if isinstance(module_name, str) and \
+                isinstance(qualified_name, str) and \
+                _find_callee(module_name, qualified_name) is const:
+            return CALLEE_CONSTANT_MARKER, module_name, qualified_name
+
+    return const
+
+
+def _load_constant(const, call_sites):
+    """Return runtime constant of marker, or the constant itself.
+
+    Args:
+        const(object): constant of loaded code.
+        call_sites(dict): lists of decorators of the call sites of the
+            original code, by their location and static callee, to bind
+            the bound templates to in order.
+
+    Raise:
+        LookupError. if the callee of marker isn't found.
+    """
+    if type(const) is tuple and len(const) == 2 and \
+            const[0] == RUNTIME_CONSTANT_MARKER:
+        return RUNTIME_CONSTANTS[const[1]]
+
+    if type(const) is tuple and len(const) == 4 and \
+            const[0] == CALL_SITE_CONSTANT_MARKER:
+        _, location, static_callee, bound = const
+        decorate = None
+        if bound:
+            decorates = call_sites.get((location, static_callee))
+            if not decorates:
+                raise LookupError("Call site {} not found".format(location))
+
+            decorate = decorates.pop(0)
+
+        return CallSiteTemplate(decorate, location, static_callee)
+
+    if type(const) is tuple and len(const) == 3 and \
+            const[0] == CALLEE_CONSTANT_MARKER:
+        callee = _find_callee(*const[1:])
+        if callee is None:
+            raise LookupError("Callee {}.{} not found".format(*const[1:]))
+
+        return callee
+
+    return const
+
+
+class DiskCache(object):
+    """Cache of transformed code objects persisted between processes.
+
+    Every entry is marshaled into its own file, named by a digest of the
+    original code, the interpreter version, the rewriting backend, the
+    decorator identity and the call sites elision policy.
+    Files are written atomically and entries of another format version are
+    ignored. Constants marshal can't store are replaced by markers, call
+    sites templates are loaded unbound, or bound to the decorators of the
+    call sites the original code already had.
+
+    Arguments:
+        directory(str): directory of cache files, None to disable the cache.
+
+    Attributes:
+        loads(int): number of entries loaded.
+        stores(int): number of entries stored.
+    """
+    FORMAT_VERSION = 7
+    FILE_NAME_PATTERN = "{digest}.rdc"
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self.loads = 0
+        self.stores = 0
+
+    @property
+    def enabled(self):
+        """Whether the cache has a directory."""
+        return self.directory is not None
+
+    def configure(self, directory):
+        """Set cache directory.
+
+        Args:
+            directory(str): directory of cache files, None to disable the
+                cache.
+        """
+        self.directory = directory
+
+    @property
+    def header(self):
+        """Header identifying compatible cache files."""
+        return self.FORMAT_VERSION, MAGIC_NUMBER, backend_name
+
+    def path(self, code, decorator):
+        """Return path of cache file of given code and decorator.
+
+        Args:
+            code(code): original code object.
+            decorator(DecoratorAdapter): adapter of applied decorator.
+
+        Return:
+            str. cache file path.
+        """
+        # hashlib and tempfile are slow to import, and only needed when
+        # the cache is enabled
+        import hashlib
+
+        digest = hashlib.sha256()
+        digest.update(repr(self.header).encode())
+        digest.update(sys.version.encode())
+        digest.update(decorator.identity.encode())
+        digest.update(call_site_elision.identity.encode())
+        _update_code_digest(digest, code)
+
+        return os.path.join(self.directory, self.FILE_NAME_PATTERN.format(
+            digest=digest.hexdigest()))
+
+    def load(self, code, decorator):
+        """Load transformed code template of given code and decorator.
+
+        Args:
+            code(code): original code object.
+            decorator(DecoratorAdapter): adapter of applied decorator.
+
+        Return:
+            code. template of transformed code, None if not cached.
+        """
+        if not self.enabled:
+            return None
+
+        try:
+            with open(self.path(code, decorator), "rb") as cache_file:
+                header, transformed_code = marshal.load(cache_file)
+
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if header != self.header:
+            return None
+
+        call_sites = {}
+        for call_site in get_code_call_sites(code):
+            call_sites.setdefault(
+                (call_site.location, call_site.static_callee),
+                []).append(call_site.decorate)
+
+        try:
+            transformed_code = _replace_code_consts(
+                transformed_code,
+                lambda const: _load_constant(const, call_sites))
+
+        except LookupError:
+            return None
+
+        self.loads += 1
+
+        return transformed_code
+
+    def store(self, code, decorator, transformed_code):
+        """Store transformed code template of given code and decorator.
+
+        Args:
+            code(code): original code object.
+            decorator(DecoratorAdapter): adapter of applied decorator.
+            transformed_code(code): template of code after transformation.
+        """
+        if not self.enabled:
+            return
+
+        import tempfile
+
+        try:
+            data = marshal.dumps((
+                self.header,
+                _replace_code_consts(transformed_code, _dump_constant)))
+            os.makedirs(self.directory, exist_ok=True)
+            file_descriptor, temp_path = tempfile.mkstemp(dir=self.directory)
+
+        except (OSError, ValueError):
+            return
+
+        try:
+            with os.fdopen(file_descriptor, "wb") as temp_file:
+                temp_file.write(data)
+
+            os.replace(temp_path, self.path(code, decorator))
+
+        except OSError:
+            os.unlink(temp_path)
+            return
+
+        self.stores += 1
+
+
+disk_cache = DiskCache(os.environ.get(CACHE_DIRECTORY_ENVIRONMENT_VARIABLE))
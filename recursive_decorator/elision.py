@@ -0,0 +1,89 @@
+"""Call sites elided at transform time for callees implemented in C."""
+from recursive_decorator.call_site import resolve_static_callee
+from recursive_decorator.utils import FUNCTION_TYPES
+
+
+class CallSiteElision(object):
+    """Policy of call sites elided for statically resolved C callees.
+
+    A call of a global missing from the module globals, that resolves to a
+    builtin at transform time, or of a global and attributes that resolve
+    to a known callee, is guarded by an identity check of the resolved
+    callee instead of a type check. While the name loads the resolved
+    callee it is called directly, once the module shadows the name or the
+    attribute is replaced the call falls back to its call site.
+
+    Arguments:
+        known_callees(iterable): C callables whose call sites are elided.
+        elide_builtins(bool): whether call sites of builtins are elided.
+
+    Attributes:
+        known_callees(dict): known callees by their ids.
+    """
+
+    def __init__(self, known_callees=(), elide_builtins=True):
+        self.known_callees = {}
+        self.elide_builtins = elide_builtins
+        self.add(*known_callees)
+
+    def configure(self, known_callees=None, elide_builtins=None):
+        """Set elision policy, code transformed from now on follows it.
+
+        Args:
+            known_callees(iterable): C callables whose call sites are
+                elided, None to keep the current callees.
+            elide_builtins(bool): whether call sites of builtins are elided,
+                None to keep the current policy.
+        """
+        if known_callees is not None:
+            self.known_callees = {}
+            self.add(*known_callees)
+
+        if elide_builtins is not None:
+            self.elide_builtins = elide_builtins
+
+    @property
+    def identity(self):
+        """Identity of elision policy, stable between processes.
+
+        Return:
+            str. whether builtins are elided and the known callees names.
+        """
+        return "{!r}{!r}".format(self.elide_builtins, sorted(
+            "{}.{}".format(getattr(callee, "__module__", None),
+                           getattr(callee, "__qualname__", repr(callee)))
+            for callee in self.known_callees.values()))
+
+    def add(self, *callees):
+        """Add C callables whose call sites are elided."""
+        self.known_callees.update((id(callee), callee) for callee in callees)
+
+    def elided_callee(self, static_callee, namespace):
+        """Return the callee of a call site to elide.
+
+        Args:
+            static_callee(tuple): global name and attributes names loading
+                the called function, None if not loaded statically.
+            namespace(dict): globals of the calling code.
+
+        Return:
+            object. the resolved callee, None if the call site is kept.
+        """
+        if static_callee is None:
+            return None
+
+        callee = resolve_static_callee(static_callee, namespace)
+        if callee is None or isinstance(callee, FUNCTION_TYPES):
+            return None
+
+        if id(callee) in self.known_callees:
+            return callee
+
+        if self.elide_builtins and len(static_callee) == 1 and \
+                static_callee[0] not in namespace:
+            return callee
+
+        return None
+
+
+call_site_elision = CallSiteElision()
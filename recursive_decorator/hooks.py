@@ -0,0 +1,388 @@
+"""Hooks injected into the bytecode of sub functions.
+
+Instead of wrapping every sub function with another function, the hooks
+are called by the sub function itself: the call of on_enter is injected
+into its prologue, and the call of on_exit before each of its returns and
+into a handler of the exceptions it raises. An instrumented function adds
+no frame to the stack.
+"""
+import dis
+from functools import partial
+from weakref import KeyedRef
+
+from recursive_decorator.code_switch import code_switch
+from recursive_decorator.native_transformer import PYTHON_VERSION, \
+    NULL_CALLS, SITE_CALL, SWAP, Instruction, disassemble, assemble, \
+    encode_locations, const_index, _encode_exception_table
+from recursive_decorator.recursive_decorator import recursive_decorator
+from recursive_decorator.utils import get_code_args_count, rebuild_function, \
+    replace_code, weak_callback
+
+# Until 3.7 returns unwind the blocks, and enter the handler of the body
+# block with the result and the WHY_RETURN status
+RETURNS_UNWIND = PYTHON_VERSION < (3, 8)
+WHY_RETURN = 0x0008
+
+# Exception raised again at the end of the handler
+if PYTHON_VERSION >= (3, 10):
+    RERAISE = ("RERAISE", 1)
+
+elif PYTHON_VERSION >= (3, 9):
+    RERAISE = ("RERAISE", 0)
+
+else:
+    RERAISE = ("END_FINALLY", 0)
+
+# Stack items pushed on entering the handler, the exception and the last
+# instruction since 3.11, the exception and the handled exception until
+# 3.10
+HANDLER_STACK = 2 if NULL_CALLS else 6
+# Extra stack used by the hook call of a return, above the result
+RETURN_STACK_GROWTH = 2
+
+PROLOGUE_PREFIXES = frozenset(("GEN_START", "RETURN_GENERATOR", "POP_TOP",
+                               "MAKE_CELL", "COPY_FREE_VARS", "RESUME"))
+
+
+def prologue_index(instrs):
+    """Return index of the first instruction of the function body.
+
+    Since 3.11 the body follows the first RESUME, which follows the cells
+    creation and the generator creation. In 3.10 generators start by
+    GEN_START.
+    """
+    if NULL_CALLS:
+        for index, instr in enumerate(instrs):
+            if instr.opname == "RESUME":
+                return index + 1
+
+            if instr.opname not in PROLOGUE_PREFIXES:
+                break
+
+        return 0
+
+    return int(bool(instrs) and instrs[0].opname == "GEN_START")
+
+
+def call_hook(consts, hook, location):
+    """Return instructions calling hook with the value on top of stack.
+
+    The hook is called like a call site, as method of the value since 3.11.
+
+    Return:
+        list. instructions replacing the value with the hook result.
+    """
+    return [Instruction("LOAD_CONST", const_index(consts, hook), location),
+            Instruction(*SWAP, location=location)] + \
+        [Instruction(opname, arg, location) for opname, arg in SITE_CALL]
+
+
+def load_frame_args(code, location):
+    """Return instructions pushing a tuple of the arguments of code.
+
+    Arguments that are cells are loaded from their cell, since their fast
+    local is cleared (until 3.10) or replaced by the cell (since 3.11).
+
+    Return:
+        list. instructions pushing the arguments values by their order in
+            co_varnames.
+    """
+    args_count = get_code_args_count(code)
+    instrs = []
+    for index, name in enumerate(code.co_varnames[:args_count]):
+        if name not in code.co_cellvars:
+            instrs.append(Instruction("LOAD_FAST", index, location))
+
+        elif NULL_CALLS:
+            instrs.append(Instruction("LOAD_DEREF", index, location))
+
+        else:
+            instrs.append(Instruction("LOAD_DEREF",
+                                      code.co_cellvars.index(name),
+                                      location))
+
+    instrs.append(Instruction("BUILD_TUPLE", args_count, location))
+    return instrs
+
+
+def return_handler(consts, on_exit, exception_handler, location):
+    """Return instructions of the handler of returns, until 3.7.
+
+    The handler of the body block is entered with the result and the
+    WHY_RETURN status by returns, after the finally blocks of the function
+    run, or with the exception and the handled exception.
+
+    Arguments:
+        consts(list): constants of the code, the hook is added.
+        on_exit(function): hook called with the result.
+        exception_handler(Instruction): handler of exceptions.
+        location(int): line number of the handler.
+
+    Return:
+        list. instructions returning the result, or jumping to the handler
+            of exceptions.
+    """
+    jump = Instruction("POP_JUMP_IF_FALSE", 0, location)
+    jump.target = exception_handler
+
+    return [Instruction("DUP_TOP", 0, location),
+            Instruction("LOAD_CONST", const_index(consts, WHY_RETURN),
+                        location),
+            Instruction("COMPARE_OP", dis.cmp_op.index("=="), location),
+            jump,
+            Instruction("POP_TOP", 0, location),
+            Instruction("DUP_TOP", 0, location)] + \
+        call_hook(consts, on_exit, location) + \
+        [Instruction("POP_TOP", 0, location),
+         Instruction("RETURN_VALUE", 0, location)]
+
+
+def protect_body(instrs, injected, exception_entries, handler):
+    """Return exception table entries sending body exceptions to handler.
+
+    The body instructions not covered by entries of the code are covered by
+    new entries, so exceptions raised by the code itself and by its
+    exception handlers reach the handler.
+
+    Arguments:
+        instrs(list): instructions of the code, without the handler.
+        injected(set): injected instructions, not protected.
+        exception_entries(list): entries of the code, sorted.
+        handler(Instruction): first instruction of the handler.
+
+    Return:
+        list. all entries, sorted.
+    """
+    positions = {instr: index for index, instr in enumerate(instrs)}
+    covered = set()
+    for start, end, _, _, _ in exception_entries:
+        covered.update(range(positions[start], positions[end]))
+
+    entries = list(exception_entries)
+    start = None
+    for index, instr in enumerate(instrs + [handler]):
+        protected = instr is not handler and instr not in injected and \
+            index not in covered
+        if protected and start is None:
+            start = index
+
+        elif not protected and start is not None:
+            entries.append((instrs[start], instr, handler, 0, True))
+            start = None
+
+    entries.sort(key=lambda entry: positions[entry[0]])
+    return entries
+
+
+def inject_hooks(code, on_enter=None, on_exit=None):
+    """Return copy of code calling hooks on its start and on its end.
+
+    on_enter is called with the tuple of the arguments values, before the
+    function body. on_exit is called with the result before every return,
+    and with None when the function raises. Generators call on_enter on
+    their first resume, and on_exit on their end.
+
+    Args:
+        code(code): code to inject hooks into, nested code isn't changed.
+        on_enter(function): hook called with the frame args, None for no
+            hook.
+        on_exit(function): hook called with the result, None for no hook.
+
+    Return:
+        code. the code calling the hooks.
+    """
+    if on_enter is None and on_exit is None:
+        return code
+
+    instrs, exception_entries = disassemble(code)
+    consts = list(code.co_consts)
+    body_index = prologue_index(instrs)
+    location = instrs[body_index].location
+
+    prologue = []
+    if on_enter is not None:
+        prologue = [Instruction("LOAD_CONST", const_index(consts, on_enter),
+                                location)] + \
+            load_frame_args(code, location) + \
+            [Instruction(opname, arg, location)
+             for opname, arg in SITE_CALL] + \
+            [Instruction("POP_TOP", 0, location)]
+
+    handler = []
+    if on_exit is not None:
+        handler = [Instruction("LOAD_CONST", const_index(consts, on_exit),
+                               location),
+                   Instruction("LOAD_CONST", const_index(consts, None),
+                               location)] + \
+            [Instruction(opname, arg, location)
+             for opname, arg in SITE_CALL] + \
+            [Instruction("POP_TOP", 0, location),
+             Instruction(*RERAISE, location=location)]
+
+        if RETURNS_UNWIND:
+            handler = return_handler(consts, on_exit, handler[0],
+                                     location) + handler
+
+        if not NULL_CALLS:
+            setup = Instruction("SETUP_FINALLY", 0, location)
+            setup.target = handler[0]
+            prologue.append(setup)
+
+    new_instrs = instrs[:body_index] + prologue
+    injected = set(prologue)
+    redirects = {}
+    for instr in instrs[body_index:]:
+        if on_exit is None or RETURNS_UNWIND or \
+                instr.opname not in ("RETURN_VALUE", "RETURN_CONST"):
+            new_instrs.append(instr)
+            continue
+
+        epilogue = []
+        if instr.opname == "RETURN_CONST":
+            epilogue.append(Instruction("LOAD_CONST", instr.arg,
+                                        instr.location))
+
+        # The block of the handler is the only block left on return
+        if not NULL_CALLS:
+            epilogue.append(Instruction("POP_BLOCK", 0, instr.location))
+
+        copy = ("COPY", 1) if NULL_CALLS else ("DUP_TOP", 0)
+        epilogue.append(Instruction(*copy, location=instr.location))
+        epilogue.extend(call_hook(consts, on_exit, instr.location))
+        epilogue.extend([Instruction("POP_TOP", 0, instr.location),
+                         Instruction("RETURN_VALUE", 0, instr.location)])
+
+        redirects[instr] = epilogue[0]
+        injected.update(epilogue)
+        new_instrs.extend(epilogue)
+
+    for instr in new_instrs:
+        if instr.target is not None:
+            instr.target = redirects.get(instr.target, instr.target)
+
+    exception_entries = [
+        tuple(redirects.get(instr, instr) for instr in entry[:3]) +
+        entry[3:]
+        for entry in exception_entries]
+
+    if handler:
+        # Entries until the code end don't cover the handler
+        exception_entries = [
+            (start, handler[0] if end is None else end) + tuple(entry)
+            for start, end, *entry in exception_entries]
+        if NULL_CALLS:
+            exception_entries = protect_body(new_instrs, injected,
+                                             exception_entries, handler[0])
+
+        new_instrs.extend(handler)
+
+    bytecode = assemble(new_instrs)
+    fields = encode_locations(new_instrs, code.co_firstlineno)
+    if hasattr(code, "co_exceptiontable"):
+        fields.update(_encode_exception_table(exception_entries,
+                                              len(bytecode)))
+
+    return replace_code(
+        code,
+        co_code=bytecode,
+        co_consts=tuple(consts),
+        co_stacksize=max(code.co_stacksize + RETURN_STACK_GROWTH,
+                         get_code_args_count(code) + 2,
+                         HANDLER_STACK + 2),
+        **fields)
+
+
+class HooksDecorator(object):
+    """Decorator injecting hooks into the code of functions.
+
+    Hooks are bound to the original code of every decorated function, as
+    before its call sites were transformed, and the code with the injected
+    hooks is created once per code object.
+
+    Arguments:
+        on_enter(function): called with code and frame args of every
+            started function, None for no hook.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised, None for no
+            hook.
+
+    Attributes:
+        codes(dict): (code ref, code with hooks) by the code id.
+    """
+
+    def __init__(self, on_enter=None, on_exit=None):
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+        self.codes = {}
+
+        self._forget_callback = weak_callback(self._forget)
+
+    def __call__(self, func):
+        """Return new function running code of func with the hooks."""
+        code = func.__code__
+        entry = self.codes.get(id(code))
+        if entry is None or entry[0]() is not code:
+            entry = (KeyedRef(code, self._forget_callback, id(code)),
+                     self.inject(code, code_switch.original_code(func)))
+            self.codes[id(code)] = entry
+
+        new_func = rebuild_function(func, entry[1])
+        new_func.__kwdefaults__ = func.__kwdefaults__
+        code_switch.track(new_func, code_switch.original_code(func))
+
+        return new_func
+
+    def inject(self, code, original_code):
+        """Return copy of code calling the hooks, bound to original_code.
+
+        Args:
+            code(code): code to inject the hooks into.
+            original_code(code): code reported to the hooks.
+        """
+        return inject_hooks(
+            code,
+            on_enter=None if self.on_enter is None
+            else partial(self.on_enter, original_code),
+            on_exit=None if self.on_exit is None
+            else partial(self.on_exit, original_code))
+
+    def _forget(self, code_ref):
+        """Remove code with hooks of collected code.
+
+        Args:
+            code_ref(KeyedRef): weak reference to the collected code.
+        """
+        entry = self.codes.get(code_ref.key)
+        if entry is not None and entry[0] is code_ref:
+            self.codes.pop(code_ref.key, None)
+
+
+def recursive_hooks(on_enter=None, on_exit=None, eager=False,
+                    max_depth=None, include=None, exclude=None):
+    """Return decorator injecting hooks into all sub functions.
+
+    The bytecode counterpart of recursive_monitor: the decorated function
+    and every sub function it calls are transformed to call the hooks
+    themselves, instead of being wrapped by a decorator.
+
+    Args:
+        on_enter(function): called with code and frame args of every
+            started function.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised.
+        eager(bool): whether sub functions are decorated ahead, as in
+            recursive_decorator.
+        max_depth(int): depth of the last decorated sub functions, as in
+            recursive_decorator.
+        include(iterable): rules of decorated functions, as in
+            recursive_decorator.
+        exclude(iterable): rules of functions not decorated, as in
+            recursive_decorator.
+
+    Return:
+        function. decorator of instrumented functions.
+    """
+    return recursive_decorator(HooksDecorator, on_enter=on_enter,
+                               on_exit=on_exit, eager=eager,
+                               max_depth=max_depth, include=include,
+                               exclude=exclude)
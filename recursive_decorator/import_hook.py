@@ -0,0 +1,167 @@
+"""Import hook applying recursive decorator on modules at import time."""
+import sys
+from fnmatch import fnmatch
+from importlib.abc import MetaPathFinder
+
+from recursive_decorator.utils import is_function
+
+
+def match_module(module_name, patterns):
+    """Return if module matches any of given patterns.
+
+    A pattern matches the modules matching it as glob and their sub modules.
+
+    Args:
+        module_name(str): full name of module.
+        patterns(iterable): glob patterns of modules names.
+
+    Return:
+        bool. true if module matches any pattern else false.
+    """
+    return any(fnmatch(module_name, pattern) or
+               module_name.startswith(pattern + ".")
+               for pattern in patterns)
+
+
+def decorate_class(cls, decorator):
+    """Apply decorator on all functions defined in class body.
+
+    Args:
+        cls(type): class to decorate its functions.
+        decorator(function): decorator returned from recursive_decorator.
+    """
+    for name, member in list(vars(cls).items()):
+        if is_function(member):
+            setattr(cls, name, decorator(member))
+
+        elif isinstance(member, (staticmethod, classmethod)):
+            setattr(cls, name, type(member)(decorator(member.__func__)))
+
+        elif isinstance(member, type) and \
+                member.__module__ == cls.__module__ and \
+                member.__qualname__.startswith(cls.__qualname__ + "."):
+            decorate_class(member, decorator)
+
+
+def decorate_module(module, decorator):
+    """Apply decorator on all functions and methods defined in module.
+
+    Args:
+        module(module): module to decorate its functions.
+        decorator(function): decorator returned from recursive_decorator.
+    """
+    for name, value in list(vars(module).items()):
+        if getattr(value, "__module__", None) != module.__name__:
+            continue
+
+        if is_function(value):
+            setattr(module, name, decorator(value))
+
+        elif isinstance(value, type):
+            decorate_class(value, decorator)
+
+
+class DecoratingLoader(object):
+    """Loader decorating module functions after executing the module.
+
+    Arguments:
+        loader(Loader): the original loader of the module.
+        decorator(function): decorator returned from recursive_decorator.
+    """
+
+    def __init__(self, loader, decorator):
+        self.loader = loader
+        self.decorator = decorator
+
+    def create_module(self, spec):
+        """Create module with the original loader."""
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module):
+        """Execute module with the original loader and decorate it."""
+        self.loader.exec_module(module)
+        decorate_module(module, self.decorator)
+
+    def __getattr__(self, name):
+        return getattr(self.loader, name)
+
+
+class RecursiveDecoratorImportHook(MetaPathFinder):
+    """Finder applying decorator on matching modules when imported.
+
+    Arguments:
+        decorator(function): decorator returned from recursive_decorator.
+        include(iterable): glob patterns of modules to decorate.
+        exclude(iterable): glob patterns of modules not to decorate.
+    """
+
+    def __init__(self, decorator, include, exclude=()):
+        self.decorator = decorator
+        self.include = tuple(include)
+        self.exclude = tuple(exclude)
+
+    def match(self, module_name):
+        """Return if module should be decorated.
+
+        Args:
+            module_name(str): full name of module.
+
+        Return:
+            bool. true if module is included and not excluded else false.
+        """
+        return match_module(module_name, self.include) and \
+            not match_module(module_name, self.exclude)
+
+    def find_spec(self, fullname, path, target=None):
+        """Find module spec with the other finders and decorate its loader.
+
+        Return:
+            ModuleSpec. spec of module, None if not found or not matched.
+        """
+        if not self.match(fullname):
+            return None
+
+        for finder in sys.meta_path:
+            find_spec = getattr(finder, "find_spec", None)
+            if finder is self or find_spec is None:
+                continue
+
+            spec = find_spec(fullname, path, target)
+            if spec is not None:
+                break
+
+        else:
+            return None
+
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = DecoratingLoader(spec.loader, self.decorator)
+
+        return spec
+
+    def install(self):
+        """Insert the hook first in sys.meta_path."""
+        if self not in sys.meta_path:
+            sys.meta_path.insert(0, self)
+
+    def uninstall(self):
+        """Remove the hook from sys.meta_path."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+
+
+def install_import_hook(decorator, include, exclude=()):
+    """Apply decorator on functions of modules imported from now on.
+
+    Args:
+        decorator(function): decorator returned from recursive_decorator.
+        include(iterable): glob patterns of modules to decorate, sub modules
+            of matching modules are included too.
+        exclude(iterable): glob patterns of modules not to decorate.
+
+    Return:
+        RecursiveDecoratorImportHook. the installed hook.
+    """
+    hook = RecursiveDecoratorImportHook(decorator, include, exclude)
+    hook.install()
+
+    return hook
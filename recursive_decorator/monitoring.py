@@ -0,0 +1,290 @@
+"""Engine applying hooks on sub functions with sys.monitoring (PEP 669).
+
+Instead of rewriting bytecode, the engine receives the start and return
+events of every Python function while a monitored call runs, and calls the
+monitor hooks with the started and returned code objects. Available since
+Python 3.12.
+"""
+import sys
+import threading
+from functools import wraps
+
+from recursive_decorator.utils import get_code_args_count
+
+MONITORING_AVAILABLE = hasattr(sys, "monitoring")
+
+TOOL_NAME = "recursive_decorator"
+
+
+def get_frame_args(frame):
+    """Return values of arguments of frame.
+
+    Args:
+        frame(frame): frame of a started function.
+
+    Return:
+        tuple. values of positional, keyword only, var positional and var
+            keyword arguments, by their order in co_varnames.
+    """
+    code = frame.f_code
+    frame_locals = frame.f_locals
+
+    return tuple(frame_locals.get(name) for name in
+                 code.co_varnames[:get_code_args_count(code)])
+
+
+class Monitor(object):
+    """Hooks called on start and return of functions of monitored calls.
+
+    A hook returning DISABLE from on_enter stops the monitoring of the
+    started code object, for all monitors, until MonitoringEngine.reset.
+
+    Arguments:
+        on_enter(function): called with code and frame args of every
+            started function, None for no hook.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised, None for no
+            hook.
+    """
+
+    def __init__(self, on_enter=None, on_exit=None):
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+
+
+class MonitoringEngine(object):
+    """Dispatcher of sys.monitoring events to the active monitors.
+
+    Events are enabled while any thread runs a monitored call, and
+    dispatched only to the monitors of the thread they occur in. Functions
+    started before the monitored call are not reported, nor the code of the
+    engine and of the monitored wrappers. A monitor entered again by its
+    thread, as by a recursive monitored function, is active once.
+
+    Attributes:
+        tool_id(int): sys.monitoring tool id, None if not registered.
+        active_calls(int): number of monitored calls running in all threads.
+    """
+
+    def __init__(self):
+        self.tool_id = None
+        self.active_calls = 0
+
+        self._lock = threading.Lock()
+        self._state = threading.local()
+        self._engine_codes = {self.enter.__code__, self.exit.__code__,
+                              self.register.__code__}
+        self._disabled_codes = set(self._engine_codes)
+
+    @property
+    def events(self):
+        """Events monitored by the engine."""
+        events = sys.monitoring.events
+        return events.PY_START | events.PY_RESUME | events.PY_THROW | \
+            events.PY_RETURN | events.PY_YIELD | events.PY_UNWIND
+
+    def register(self):
+        """Register the engine as a sys.monitoring tool.
+
+        Raise:
+            RuntimeError. if sys.monitoring is unavailable or has no free
+                tool id.
+        """
+        if self.tool_id is not None:
+            return
+
+        if not MONITORING_AVAILABLE:
+            raise RuntimeError("sys.monitoring requires Python 3.12")
+
+        monitoring = sys.monitoring
+        for tool_id in range(monitoring.OPTIMIZER_ID, -1, -1):
+            if monitoring.get_tool(tool_id) is None:
+                break
+
+        else:
+            raise RuntimeError("No free sys.monitoring tool id")
+
+        monitoring.use_tool_id(tool_id, TOOL_NAME)
+        events = monitoring.events
+        for event, callback in (
+                (events.PY_START, self._on_start),
+                (events.PY_RESUME, self._on_resume),
+                (events.PY_THROW, self._on_throw),
+                (events.PY_RETURN, self._on_return),
+                (events.PY_YIELD, self._on_yield),
+                (events.PY_UNWIND, self._on_unwind)):
+            monitoring.register_callback(tool_id, event, callback)
+
+        self.tool_id = tool_id
+
+    def reset(self):
+        """Restart monitoring of code objects disabled by monitors."""
+        self._disabled_codes = set(self._engine_codes)
+        if self.tool_id is not None:
+            sys.monitoring.restart_events()
+
+    def ignore(self, code):
+        """Never report given code object to monitors.
+
+        Args:
+            code(code): code of a wrapper calling enter and exit.
+        """
+        self._engine_codes.add(code)
+        self._disabled_codes.add(code)
+
+    def enter(self, monitor):
+        """Start monitored call of given monitor in current thread.
+
+        Args:
+            monitor(Monitor): hooks to call on the sub functions.
+
+        Return:
+            bool. whether the call was started, False if the monitor is
+                already active in current thread, then exit isn't called.
+        """
+        state = self._state
+        if not getattr(state, "monitors", None):
+            state.monitors = []
+            state.depth = 0
+
+        elif monitor in state.monitors:
+            return False
+
+        with self._lock:
+            self.register()
+            self.active_calls += 1
+            if self.active_calls == 1:
+                sys.monitoring.set_events(self.tool_id, self.events)
+
+        state.monitors.append(monitor)
+        return True
+
+    def exit(self, monitor):
+        """End monitored call of given monitor in current thread.
+
+        Args:
+            monitor(Monitor): hooks given to enter.
+        """
+        self._state.monitors.remove(monitor)
+        with self._lock:
+            self.active_calls -= 1
+            if self.active_calls == 0:
+                sys.monitoring.set_events(self.tool_id, 0)
+
+    def _on_start(self, code, instruction_offset):
+        if code in self._disabled_codes:
+            return sys.monitoring.DISABLE
+
+        state = self._state
+        monitors = getattr(state, "monitors", None)
+        if not monitors:
+            return None
+
+        frame_args = None
+        for monitor in monitors:
+            if monitor.on_enter is None:
+                continue
+
+            if frame_args is None:
+                frame_args = get_frame_args(sys._getframe(1))
+
+            if monitor.on_enter(code, frame_args) is \
+                    sys.monitoring.DISABLE:
+                self._disabled_codes.add(code)
+                return sys.monitoring.DISABLE
+
+        state.depth += 1
+        return None
+
+    def _on_resume(self, code, instruction_offset):
+        if code in self._disabled_codes:
+            return sys.monitoring.DISABLE
+
+        self._resume_function()
+        return None
+
+    def _on_throw(self, code, instruction_offset, exception):
+        if code not in self._disabled_codes:
+            self._resume_function()
+
+    def _on_yield(self, code, instruction_offset, value):
+        if code in self._disabled_codes:
+            return sys.monitoring.DISABLE
+
+        state = self._state
+        if getattr(state, "monitors", None) and state.depth:
+            state.depth -= 1
+
+        return None
+
+    def _on_return(self, code, instruction_offset, result):
+        if code in self._disabled_codes:
+            return sys.monitoring.DISABLE
+
+        self._exit_function(code, result)
+        return None
+
+    def _on_unwind(self, code, instruction_offset, exception):
+        if code not in self._disabled_codes:
+            self._exit_function(code, None)
+
+    def _resume_function(self):
+        """Count resumed generator of current thread."""
+        state = self._state
+        if getattr(state, "monitors", None):
+            state.depth += 1
+
+    def _exit_function(self, code, result):
+        """Call exit hooks of current thread monitors.
+
+        Functions started before the monitored call aren't reported.
+        """
+        state = self._state
+        if not getattr(state, "monitors", None) or not state.depth:
+            return
+
+        state.depth -= 1
+        for monitor in reversed(state.monitors):
+            if monitor.on_exit is not None:
+                monitor.on_exit(code, result)
+
+
+monitoring_engine = MonitoringEngine()
+
+
+def recursive_monitor(on_enter=None, on_exit=None):
+    """Return decorator calling hooks on all sub functions of its calls.
+
+    The sys.monitoring counterpart of recursive_decorator, for decorators
+    made of logic before and after the decorated function. The decorated
+    function and every Python function it reaches, in the same thread, are
+    reported to the hooks without transforming their code.
+
+    Args:
+        on_enter(function): called with code and frame args of every
+            started function.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised.
+
+    Return:
+        function. decorator of monitored functions.
+    """
+    monitor = Monitor(on_enter=on_enter, on_exit=on_exit)
+
+    def monitor_decorator(func_to_decorate):
+        """Decorator monitoring calls of function."""
+        @wraps(func_to_decorate)
+        def monitored(*args, **kwargs):
+            if not monitoring_engine.enter(monitor):
+                return func_to_decorate(*args, **kwargs)
+
+            try:
+                return func_to_decorate(*args, **kwargs)
+
+            finally:
+                monitoring_engine.exit(monitor)
+
+        monitoring_engine.ignore(monitored.__code__)
+        return monitored
+
+    return monitor_decorator
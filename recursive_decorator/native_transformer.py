@@ -0,0 +1,909 @@
+"""Call transformer rewriting bytecode with dis, without codetransformer.
+
+Supports the wordcode interpreters, CPython 3.6 to 3.12.
+"""
+import dis
+import sys
+
+from types import CodeType
+
+from recursive_decorator.backend import NATIVE_BACKEND_VERSIONS
+from recursive_decorator.call_site import CallSite
+from recursive_decorator.elision import call_site_elision
+from recursive_decorator.utils import rebuild_function, replace_code, \
+    FUNCTION_TYPES
+
+PYTHON_VERSION = sys.version_info[:2]
+
+if not NATIVE_BACKEND_VERSIONS[0] <= PYTHON_VERSION <= \
+        NATIVE_BACKEND_VERSIONS[1]:
+    # The bytecode of other versions would be rewritten into invalid code
+    raise ImportError(
+        "The native backend supports Python {}.{} to {}.{}, not {}.{}".format(
+            *NATIVE_BACKEND_VERSIONS[0] + NATIVE_BACKEND_VERSIONS[1] +
+            PYTHON_VERSION))
+
+# Calls are prefixed by NULL or by a method since 3.11
+NULL_CALLS = PYTHON_VERSION >= (3, 11)
+# Jumps arguments count bytes until 3.10 and code units since
+JUMP_UNIT = 2 if PYTHON_VERSION >= (3, 10) else 1
+# Extra stack used by the instructions wrapping a call
+STACK_GROWTH = 2
+
+EXTENDED_ARG = dis.opmap["EXTENDED_ARG"]
+CACHE = dis.opmap.get("CACHE", 0)
+JUMPS = frozenset(dis.hasjrel) | frozenset(dis.hasjabs)
+ABSOLUTE_JUMPS = frozenset(dis.hasjabs)
+INLINE_CACHE_ENTRIES = getattr(dis, "_inline_cache_entries", None)
+
+if PYTHON_VERSION >= (3, 12):
+    CALLS = frozenset(("CALL", "CALL_FUNCTION_EX"))
+    SITE_CALL = (("CALL", 0),)
+    CONTAINS = ("CONTAINS_OP", 0)
+    IS = ("IS_OP", 0)
+    POP_JUMP_IF_FALSE = "POP_JUMP_IF_FALSE"
+    POP_JUMP_IF_TRUE = "POP_JUMP_IF_TRUE"
+
+elif PYTHON_VERSION >= (3, 11):
+    CALLS = frozenset(("PRECALL", "CALL_FUNCTION_EX"))
+    SITE_CALL = (("PRECALL", 0), ("CALL", 0))
+    CONTAINS = ("CONTAINS_OP", 0)
+    IS = ("IS_OP", 0)
+    POP_JUMP_IF_FALSE = "POP_JUMP_FORWARD_IF_FALSE"
+    POP_JUMP_IF_TRUE = "POP_JUMP_FORWARD_IF_TRUE"
+
+else:
+    CALLS = frozenset(("CALL_FUNCTION", "CALL_FUNCTION_KW",
+                       "CALL_FUNCTION_EX", "CALL_METHOD"))
+    SITE_CALL = (("CALL_FUNCTION", 1),)
+    CONTAINS = ("CONTAINS_OP", 0) if PYTHON_VERSION >= (3, 9) else \
+        ("COMPARE_OP", dis.cmp_op.index("in"))
+    IS = ("IS_OP", 0) if PYTHON_VERSION >= (3, 9) else \
+        ("COMPARE_OP", dis.cmp_op.index("is"))
+    POP_JUMP_IF_FALSE = "POP_JUMP_IF_FALSE"
+    POP_JUMP_IF_TRUE = "POP_JUMP_IF_TRUE"
+
+SWAP = ("SWAP", 2) if NULL_CALLS else ("ROT_TWO", 0)
+# Stack manipulations that may reach items pushed before them
+STACK_MANIPULATIONS = frozenset(("ROT_TWO", "ROT_THREE", "ROT_FOUR", "ROT_N",
+                                 "DUP_TOP", "DUP_TOP_TWO", "SWAP", "COPY"))
+
+
+class Instruction(object):
+    """Bytecode instruction, jumps reference their target instruction.
+
+    Arguments:
+        opname(str): name of instruction operation.
+        arg(int): argument of instruction.
+        location(object): line number of instruction, or its positions
+            since 3.11.
+
+    Attributes:
+        target(Instruction): instruction jumped to, None if not a jump.
+        offset(int): offset of instruction, including its extended args.
+        extended_args(int): number of EXTENDED_ARG prefixes.
+    """
+
+    def __init__(self, opname, arg=0, location=None):
+        self.opcode = dis.opmap[opname]
+        self.arg = arg
+        self.location = location
+        self.target = None
+        self.offset = 0
+        self.extended_args = 0
+
+    @property
+    def opname(self):
+        """Name of instruction operation."""
+        return dis.opname[self.opcode]
+
+    @property
+    def cache_entries(self):
+        """Number of inline cache entries following the instruction."""
+        if INLINE_CACHE_ENTRIES is None:
+            return 0
+
+        if isinstance(INLINE_CACHE_ENTRIES, dict):
+            return INLINE_CACHE_ENTRIES.get(self.opname, 0)
+
+        return INLINE_CACHE_ENTRIES[self.opcode]
+
+    @property
+    def size(self):
+        """Size of instruction in bytes."""
+        return 2 * (1 + self.extended_args + self.cache_entries)
+
+    @property
+    def stack_effect(self):
+        """Stack effect of instruction when not jumping."""
+        return dis.stack_effect(
+            self.opcode,
+            self.arg if self.opcode >= dis.HAVE_ARGUMENT else None)
+
+    def __repr__(self):
+        return "<{} {} {}>".format(self.__class__.__name__, self.opname,
+                                   self.arg)
+
+
+def code_locations(code):
+    """Return location of every instruction offset of code.
+
+    Return:
+        dict. line numbers, or positions since 3.11, by offsets.
+    """
+    offsets = range(0, len(code.co_code), 2)
+    if PYTHON_VERSION >= (3, 11):
+        return dict(zip(offsets, code.co_positions()))
+
+    if PYTHON_VERSION >= (3, 10):
+        return {offset: line
+                for start, end, line in code.co_lines()
+                for offset in range(start, end, 2)}
+
+    line_starts = dict(dis.findlinestarts(code))
+    locations = {}
+    line = code.co_firstlineno
+    for offset in offsets:
+        line = locations[offset] = line_starts.get(offset, line)
+
+    return locations
+
+
+def disassemble(code):
+    """Return instructions and exception table entries of code.
+
+    Extended args are merged into their instructions, and jumps and
+    exception table entries reference instructions instead of offsets.
+
+    Return:
+        tuple. list of instructions and list of (start, end, target, depth,
+            lasti) exception table entries, end is None for code end.
+    """
+    locations = code_locations(code)
+    instrs = []
+    by_offset = {}
+    offsets = []
+    for dis_instr in dis.get_instructions(code):
+        offsets.append(dis_instr.offset)
+        if dis_instr.opcode == EXTENDED_ARG:
+            continue
+
+        instr = Instruction(dis_instr.opname, dis_instr.arg or 0,
+                            locations[dis_instr.offset])
+        if dis_instr.opcode in JUMPS:
+            instr.target = dis_instr.argval
+
+        by_offset.update((offset, instr) for offset in offsets)
+        offsets = []
+        instrs.append(instr)
+
+    for instr in instrs:
+        if instr.target is not None:
+            instr.target = by_offset[instr.target]
+
+    exception_entries = []
+    if hasattr(code, "co_exceptiontable"):
+        exception_entries = [
+            (by_offset[entry.start], by_offset.get(entry.end),
+             by_offset[entry.target], entry.depth, entry.lasti)
+            for entry in dis._parse_exception_table(code)]
+
+    return instrs, exception_entries
+
+
+def _jump_arg(instr):
+    """Return argument of jump instruction by its current offsets."""
+    if instr.opcode in ABSOLUTE_JUMPS:
+        distance = instr.target.offset
+
+    else:
+        distance = instr.target.offset - (instr.offset + instr.size)
+        if "BACKWARD" in instr.opname:
+            distance = -distance
+
+    return distance // JUMP_UNIT
+
+
+def assemble(instrs):
+    """Return bytecode of instructions, setting their offsets.
+
+    Extended args are added until every argument fits, jump arguments are
+    recalculated after every change of the instructions sizes.
+
+    Return:
+        bytes. the bytecode.
+    """
+    grown = True
+    while grown:
+        offset = 0
+        for instr in instrs:
+            instr.offset = offset
+            offset += instr.size
+
+        grown = False
+        for instr in instrs:
+            if instr.target is not None:
+                instr.arg = _jump_arg(instr)
+
+            extended_args = max(instr.arg.bit_length() - 1, 0) // 8
+            if extended_args > instr.extended_args:
+                instr.extended_args = extended_args
+                grown = True
+
+    bytecode = bytearray()
+    for instr in instrs:
+        for shift in range(instr.extended_args, 0, -1):
+            bytecode += bytes((EXTENDED_ARG, (instr.arg >> 8 * shift) & 0xFF))
+
+        bytecode += bytes((instr.opcode, instr.arg & 0xFF))
+        bytecode += bytes((CACHE, 0)) * instr.cache_entries
+
+    return bytes(bytecode)
+
+
+def _encode_lnotab(instrs, first_line):
+    """Return line number table of instructions, until 3.10."""
+    lnotab = bytearray()
+    last_offset, last_line = 0, first_line
+    for instr in instrs:
+        line = instr.location
+        if line is None or line == last_line:
+            continue
+
+        offset_delta = instr.offset - last_offset
+        line_delta = line - last_line
+        while offset_delta > 255:
+            lnotab += bytes((255, 0))
+            offset_delta -= 255
+
+        while line_delta > 127:
+            lnotab += bytes((offset_delta, 127))
+            offset_delta, line_delta = 0, line_delta - 127
+
+        while line_delta < -128:
+            lnotab += bytes((offset_delta, 0x80))
+            offset_delta, line_delta = 0, line_delta + 128
+
+        lnotab += bytes((offset_delta, line_delta & 0xFF))
+        last_offset, last_line = instr.offset, line
+
+    return {"co_lnotab": bytes(lnotab)}
+
+
+def _encode_linetable(instrs, first_line):
+    """Return line table of instructions, of 3.10."""
+    ranges = []
+    for instr in instrs:
+        if ranges and ranges[-1][1] == instr.location:
+            ranges[-1][0] += instr.size
+
+        else:
+            ranges.append([instr.size, instr.location])
+
+    linetable = bytearray()
+    last_line = first_line
+    for size, line in ranges:
+        line_delta = -128 if line is None else line - last_line
+        while size > 254:
+            linetable += bytes((254, line_delta & 0xFF))
+            size, line_delta = size - 254, -128 if line is None else 0
+
+        while line is not None and line_delta > 127:
+            linetable += bytes((0, 127))
+            line_delta -= 127
+
+        while line is not None and line_delta < -127:
+            linetable += bytes((0, -127 & 0xFF))
+            line_delta += 127
+
+        linetable += bytes((size, line_delta & 0xFF))
+        if line is not None:
+            last_line = line
+
+    return {"co_linetable": bytes(linetable)}
+
+
+def _write_varint(table, value):
+    """Write value as little endian varint of 6 bits chunks."""
+    while value >= 64:
+        table.append(64 | (value & 63))
+        value >>= 6
+
+    table.append(value)
+
+
+def _write_signed_varint(table, value):
+    """Write signed value as varint, sign in the lowest bit."""
+    _write_varint(table, (-value << 1) | 1 if value < 0 else value << 1)
+
+
+def _encode_location_table(instrs, first_line):
+    """Return locations table of instructions, since 3.11.
+
+    Locations are written in the long form, or the no location form.
+    """
+    table = bytearray()
+    last_line = first_line
+    for instr in instrs:
+        line, end_line, column, end_column = instr.location
+        units = instr.size // 2
+        while units:
+            length = min(units, 8)
+            units -= length
+            if line is None:
+                table.append(0x80 | (15 << 3) | (length - 1))
+                continue
+
+            table.append(0x80 | (14 << 3) | (length - 1))
+            _write_signed_varint(table, line - last_line)
+            _write_varint(table, 0 if end_line is None else end_line - line)
+            _write_varint(table, 0 if column is None else column + 1)
+            _write_varint(table, 0 if end_column is None else end_column + 1)
+            last_line = line
+
+    return {"co_linetable": bytes(table)}
+
+
+def _write_exception_varint(table, value, start=False):
+    """Write value as big endian varint of 6 bits chunks."""
+    chunks = [value & 63]
+    value >>= 6
+    while value:
+        chunks.append(64 | (value & 63))
+        value >>= 6
+
+    chunks.reverse()
+    if start:
+        chunks[0] |= 128
+
+    table += bytes(chunks)
+
+
+def _encode_exception_table(exception_entries, code_size):
+    """Return exception table of entries, since 3.11."""
+    table = bytearray()
+    for start, end, target, depth, lasti in exception_entries:
+        end_offset = code_size if end is None else end.offset
+        _write_exception_varint(table, start.offset // 2, start=True)
+        _write_exception_varint(table, (end_offset - start.offset) // 2)
+        _write_exception_varint(table, target.offset // 2)
+        _write_exception_varint(table, (depth << 1) | int(lasti))
+
+    return {"co_exceptiontable": bytes(table)}
+
+
+if PYTHON_VERSION >= (3, 11):
+    encode_locations = _encode_location_table
+
+elif PYTHON_VERSION >= (3, 10):
+    encode_locations = _encode_linetable
+
+else:
+    encode_locations = _encode_lnotab
+
+
+def name_index(instr):
+    """Return index in co_names of name loaded by instruction."""
+    if (instr.opname == "LOAD_GLOBAL" and NULL_CALLS) or \
+            (instr.opname == "LOAD_ATTR" and PYTHON_VERSION >= (3, 12)):
+        return instr.arg >> 1
+
+    return instr.arg
+
+
+def const_index(consts, value):
+    """Return index of value in constants, adding it if missing.
+
+    Constants are compared by identity, as they may not be comparable.
+    """
+    for index, const in enumerate(consts):
+        if const is value:
+            return index
+
+    consts.append(value)
+    return len(consts) - 1
+
+
+def is_method_load(instr):
+    """Return if instruction loads a method and its instance."""
+    return instr.opname == "LOAD_METHOD" or \
+        (PYTHON_VERSION >= (3, 12) and instr.arg & 1 and
+         instr.opname in ("LOAD_ATTR", "LOAD_SUPER_ATTR"))
+
+
+class NativeCallTransformer(object):
+    """Transformer wrapping every call in function with a call site.
+
+    The bytecode is rewritten with dis and CodeType. Methods are loaded as
+    bound methods, so every called function is a single stack item, and
+    wrapped with the same instructions as RecursiveDecoratorCallTransformer.
+
+    Arguments:
+        function_module(module): module of function to transform.
+        decorate(func): recursive decorator to apply on sub calls, None
+            for unbound call sites.
+
+    Attributes:
+        call_sites(list): call sites created by the transformer.
+    """
+
+    def __init__(self, function_module, decorate):
+        self.function_module = function_module
+        self.decorate = decorate
+        self.call_sites = []
+
+    def __call__(self, func):
+        """Return new function with transformed code of given function."""
+        return rebuild_function(func, self.transform(func.__code__))
+
+    def transform(self, code):
+        """Return copy of code with calls of code and nested code wrapped.
+
+        Args:
+            code(code): code to transform.
+
+        Return:
+            code. the transformed code.
+        """
+        self.code = code
+        instrs, exception_entries = disassemble(code)
+        names = list(code.co_names)
+        consts = list(code.co_consts)
+        jump_targets = {instr.target for instr in instrs
+                        if instr.target is not None} | \
+            {entry[2] for entry in exception_entries}
+
+        # Calls whose function is wrapped once loaded, by the load index
+        loaded_calls = {}
+        if not NULL_CALLS:
+            for index, instr in enumerate(instrs):
+                if instr.opname not in CALLS or \
+                        self.call_params_count(instr) == 0 or \
+                        self.is_wrapped_call(instrs, index, consts,
+                                             jump_targets):
+                    continue
+
+                load_index = self.function_load_index(instrs, index,
+                                                      jump_targets)
+                if load_index is not None:
+                    loaded_calls[load_index] = index
+
+        new_instrs = []
+        redirects = {}
+        added_jumps = []
+        kw_names = []
+        for index, instr in enumerate(instrs):
+            if instr.opname == "KW_NAMES":
+                # Keyword names are consumed by the next call
+                kw_names = [instr]
+                continue
+
+            if is_method_load(instr):
+                group = self.load_attribute(instr)
+
+            elif instr.opname not in CALLS:
+                group = [instr]
+
+            elif self.is_guard_call(instrs, index, consts):
+                # Type guard of an already transformed call
+                group = [instr]
+
+            elif self.is_site_call(instrs, index, consts):
+                # Already transformed call, wrap function with another site
+                group = self.wrap_function_with_recursive_decorator(
+                    instr, consts) + [instr]
+
+            else:
+                call = instr
+                if instr.opname == "CALL_METHOD":
+                    call = Instruction("CALL_FUNCTION", instr.arg,
+                                       instr.location)
+
+                if index in loaded_calls.values() or \
+                        self.is_wrapped_call(instrs, index, consts,
+                                             jump_targets):
+                    group = kw_names + [call]
+
+                else:
+                    end = kw_names[0] if kw_names else call
+                    group = self.wrap_call(
+                        call, consts, end,
+                        self.static_callee(instrs, index, names,
+                                           jump_targets)) + \
+                        kw_names + [call]
+
+            first = kw_names[0] if kw_names else instr
+            if group[0] is not first:
+                redirects[first] = group[0]
+
+            if instr is not group[-1]:
+                redirects.setdefault(instr, group[0])
+
+            kw_names = []
+            new_instrs.extend(group)
+
+            if index in loaded_calls:
+                call_index = loaded_calls[index]
+                wrap = self.wrap_loaded_function(
+                    instrs[call_index], consts, instrs[index + 1],
+                    self.static_callee(instrs, call_index, names,
+                                       jump_targets))
+                added_jumps.extend(wrap_instr for wrap_instr in wrap
+                                   if wrap_instr.target is not None)
+                new_instrs.extend(wrap)
+
+        # Jumps added around calls already target their instruction
+        for instr in instrs + added_jumps:
+            if instr.target is not None:
+                instr.target = redirects.get(instr.target, instr.target)
+
+        exception_entries = [
+            tuple(redirects.get(instr, instr) for instr in entry[:3]) +
+            entry[3:]
+            for entry in exception_entries]
+
+        bytecode = assemble(new_instrs)
+        fields = encode_locations(new_instrs, code.co_firstlineno)
+        if hasattr(code, "co_exceptiontable"):
+            fields.update(_encode_exception_table(exception_entries,
+                                                  len(bytecode)))
+
+        return replace_code(
+            code,
+            co_code=bytecode,
+            co_stacksize=code.co_stacksize + STACK_GROWTH,
+            co_consts=tuple(self.transform(const)
+                            if isinstance(const, CodeType) else const
+                            for const in consts),
+            **fields)
+
+    @staticmethod
+    def load_attribute(instr):
+        """Return instructions loading bound method instead of method.
+
+        Arguments:
+            instr(Instruction): the method load instruction.
+
+        Return:
+            list. instructions loading the bound method, preceded by NULL
+                since 3.11.
+        """
+        arg = instr.arg & ~1 if PYTHON_VERSION >= (3, 12) else instr.arg
+        opname = "LOAD_ATTR" if instr.opname == "LOAD_METHOD" else \
+            instr.opname
+
+        load = Instruction(opname, arg, instr.location)
+        if not NULL_CALLS:
+            return [load]
+
+        return [load,
+                Instruction("PUSH_NULL", 0, instr.location),
+                Instruction(*SWAP, location=instr.location)]
+
+    @staticmethod
+    def call_params_count(call):
+        """Calculate function call number of arguments.
+
+        Return:
+             int. number of stack items above the called function.
+        """
+        if call.opname == "CALL_FUNCTION_EX":
+            return 1 + (call.arg & 1)
+
+        if call.opname == "CALL_FUNCTION_KW":
+            return call.arg + 1
+
+        return call.arg
+
+    @staticmethod
+    def is_guard_call(instrs, index, consts):
+        """Return if instruction calls type on the called function.
+
+        Arguments:
+            instrs(list): instructions of the code.
+            index(int): index of the call instruction.
+            consts(list): constants of the code.
+
+        Return:
+            bool. true if the call is a call of a type guard else false.
+        """
+        call = instrs[index]
+        if index < 2 or (call.opname, call.arg) != SITE_CALL[0]:
+            return False
+
+        load_type, swap = instrs[index - 2:index]
+        return load_type.opname == "LOAD_CONST" and \
+            (swap.opname, swap.arg) == SWAP and \
+            consts[load_type.arg] is type
+
+    @staticmethod
+    def is_site_call(instrs, index, consts):
+        """Return if instruction calls a call site on the called function.
+
+        Arguments:
+            instrs(list): instructions of the code.
+            index(int): index of the call instruction.
+            consts(list): constants of the code.
+
+        Return:
+            bool. true if the call is a call of call site else false.
+        """
+        call = instrs[index]
+        if index < 2 or (call.opname, call.arg) != SITE_CALL[0]:
+            return False
+
+        load_site, swap = instrs[index - 2:index]
+        return load_site.opname == "LOAD_CONST" and \
+            (swap.opname, swap.arg) == SWAP and \
+            isinstance(consts[load_site.arg], CallSite)
+
+    def is_wrapped_call(self, instrs, index, consts, jump_targets):
+        """Return if the function of call is already wrapped by a call site.
+
+        Arguments:
+            instrs(list): instructions of the code.
+            index(int): index of the call instruction.
+            consts(list): constants of the code.
+            jump_targets(set): instructions jumped to.
+
+        Return:
+            bool. true if the call is an already transformed call else false.
+        """
+        args_count = self.call_params_count(instrs[index])
+        if NULL_CALLS:
+            if index > 0 and instrs[index - 1].opname == "KW_NAMES":
+                index -= 1
+
+            site_index = index - 2 - len(SITE_CALL)
+            return site_index >= 0 and \
+                [(instr.opname, instr.arg)
+                 for instr in instrs[index - 2:index]] == \
+                [("SWAP", args_count + 2), ("POP_TOP", 0)] and \
+                self.is_site_call(instrs, site_index, consts)
+
+        if index >= 5 and [instr.opname for instr in
+                           instrs[index - 4:index]] == \
+                ["ROT_TWO", "UNPACK_SEQUENCE", "BUILD_TUPLE",
+                 "UNPACK_SEQUENCE"]:
+            return self.is_site_call(instrs, index - 5, consts)
+
+        load_index = self.function_load_index(instrs, index, jump_targets,
+                                              entry=True)
+        return load_index is not None and \
+            self.is_site_call(instrs, load_index, consts)
+
+    def function_load_index(self, instrs, index, jump_targets, entry=False):
+        """Return index of the instruction loading the function of call.
+
+        The instructions pushing the call arguments are scanned backwards,
+        as long as they don't jump, aren't jumped to and don't manipulate
+        the stack below them, until the instruction before them.
+
+        Arguments:
+            instrs(list): instructions of the code.
+            index(int): index of the call instruction.
+            jump_targets(set): instructions jumped to.
+            entry(bool): whether the first argument instruction may be
+                jumped to.
+
+        Return:
+            int. index of the function load, None if not found.
+        """
+        # Number of stack items above the function before each instruction
+        stack_level = self.call_params_count(instrs[index])
+        while stack_level > 0:
+            index -= 1
+            if index < 0:
+                return None
+
+            instr = instrs[index]
+            stack_level -= instr.stack_effect
+            if instr.target is not None or \
+                    instr.opname in STACK_MANIPULATIONS or \
+                    (instr in jump_targets and
+                     not (entry and stack_level == 0)):
+                return None
+
+        if stack_level < 0 or index == 0:
+            return None
+
+        return index - 1
+
+    def static_callee(self, instrs, index, names, jump_targets):
+        """Return names of global and attributes loading the called function.
+
+        The instructions before the call are scanned backwards, as long as
+        they don't jump, until the instruction loading the function. Calls
+        of functions loaded by dynamic expressions are not resolved.
+
+        Arguments:
+            instrs(list): instructions of the code.
+            index(int): index of the call instruction.
+            names(list): names of the code.
+            jump_targets(set): instructions jumped to.
+
+        Return:
+            tuple. global name and attributes names, None if not resolved.
+        """
+        if instrs[index] in jump_targets:
+            return None
+
+        index = self.function_load_index(instrs, index, jump_targets)
+        if index is None:
+            return None
+
+        attributes = []
+        while index >= 0 and \
+                instrs[index].opname in ("LOAD_ATTR", "LOAD_METHOD"):
+            if instrs[index] in jump_targets:
+                return None
+
+            attributes.append(names[name_index(instrs[index])])
+            index -= 1
+
+        if index < 0 or instrs[index].opname != "LOAD_GLOBAL":
+            return None
+
+        return (names[name_index(instrs[index])],) + \
+            tuple(reversed(attributes))
+
+    def wrap_call(self, call, consts, end, static_callee=None):
+        """Return instructions wrapping the function of call with call site.
+
+        Functions of other types skip the call site, calls of elided callees
+        are guarded by the callee identity instead. Since 3.11 the function
+        is copied above the arguments, wrapped and swapped back in place.
+        Until 3.10 calls with arguments, whose function isn't wrapped once
+        loaded, switch the function with a tuple of the arguments.
+
+        Arguments:
+            call(Instruction): the call instruction.
+            consts(list): constants of the code, the call site and guard
+                constants are added.
+            end(Instruction): the instruction following the wrapping.
+            static_callee(tuple): names of global and attributes loading the
+                called function.
+
+        Return:
+            list. instructions to insert before the call.
+        """
+        args_count = self.call_params_count(call)
+        location = call.location
+        callee = call_site_elision.elided_callee(
+            static_callee, vars(self.function_module))
+
+        if NULL_CALLS:
+            return self.guard_function(call, consts, args_count, end,
+                                       callee) + \
+                [Instruction("COPY", args_count + 1, location)] + \
+                self.wrap_function_with_recursive_decorator(
+                    call, consts, static_callee) + \
+                [Instruction("SWAP", args_count + 2, location),
+                 Instruction("POP_TOP", 0, location)]
+
+        if args_count == 0:
+            return self.wrap_loaded_function(call, consts, end,
+                                             static_callee)
+
+        switch_back = Instruction(*SWAP, location=location)
+
+        # Make tuple of all function args and switch it with the function
+        instrs = [Instruction("BUILD_TUPLE", args_count, location),
+                  Instruction(*SWAP, location=location)]
+        instrs.extend(self.guard_function(call, consts, 0, switch_back,
+                                          callee))
+        instrs.extend(self.wrap_function_with_recursive_decorator(
+            call, consts, static_callee))
+        # Switch back and unpack args in the same order they supplied
+        instrs.extend([switch_back,
+                       Instruction("UNPACK_SEQUENCE", args_count, location),
+                       Instruction("BUILD_TUPLE", args_count, location),
+                       Instruction("UNPACK_SEQUENCE", args_count, location)])
+
+        return instrs
+
+    def wrap_loaded_function(self, call, consts, end, static_callee=None):
+        """Return instructions wrapping function of call on top of stack.
+
+        Used until 3.10, right after the function is loaded and before its
+        arguments are pushed, so the arguments aren't moved.
+
+        Arguments:
+            call(Instruction): the call instruction.
+            consts(list): constants of the code, the call site and guard
+                constants are added.
+            end(Instruction): the instruction following the wrapping.
+            static_callee(tuple): names of global and attributes loading the
+                called function.
+
+        Return:
+            list. instructions to insert after the function load.
+        """
+        callee = call_site_elision.elided_callee(
+            static_callee, vars(self.function_module))
+
+        return self.guard_function(call, consts, 0, end, callee) + \
+            self.wrap_function_with_recursive_decorator(call, consts,
+                                                        static_callee)
+
+    @staticmethod
+    def guard_function(call, consts, depth, target, callee=None):
+        """Return instructions jumping to target if callee isn't a function.
+
+        Arguments:
+            call(Instruction): the call instruction.
+            consts(list): constants of the code, the guard constants are
+                added.
+            depth(int): number of stack items above the called function.
+            target(Instruction): instruction to jump to.
+            callee(object): elided callee, the jump is taken if the called
+                function is the callee instead.
+
+        Return:
+            list. instructions testing the type of the called function.
+        """
+        def load_const(value):
+            return Instruction("LOAD_CONST", const_index(consts, value),
+                               call.location)
+
+        copy = ("COPY", depth + 1) if NULL_CALLS else ("DUP_TOP", 0)
+        if callee is not None:
+            jump = Instruction(POP_JUMP_IF_TRUE, 0, call.location)
+            jump.target = target
+
+            return [Instruction(*copy, location=call.location),
+                    load_const(callee),
+                    Instruction(*IS, location=call.location),
+                    jump]
+
+        jump = Instruction(POP_JUMP_IF_FALSE, 0, call.location)
+        jump.target = target
+
+        return [Instruction(*copy, location=call.location),
+                load_const(type),
+                Instruction(*SWAP, location=call.location)] + \
+            [Instruction(opname, arg, call.location)
+             for opname, arg in SITE_CALL] + \
+            [load_const(FUNCTION_TYPES),
+             Instruction(*CONTAINS, location=call.location),
+             jump]
+
+    def call_location(self, call):
+        """Return source location of call in the transformed code.
+
+        Arguments:
+            call(Instruction): the call instruction.
+
+        Return:
+            str. file name, line number and name of the calling code.
+        """
+        line = call.location
+        if isinstance(line, tuple):
+            line = line[0]
+
+        return "{}:{} ({})".format(self.code.co_filename, line,
+                                   self.code.co_name)
+
+    def wrap_function_with_recursive_decorator(self, call, consts,
+                                               static_callee=None):
+        """Wrap function on top of stack with a call site.
+
+        Arguments:
+            call(Instruction): the call instruction to wrap its function.
+            consts(list): constants of the code, the call site is added.
+            static_callee(tuple): names of global and attributes loading the
+                called function.
+
+        Return:
+             list. instructions to wrap function with recursive_decorator.
+        """
+        call_site = CallSite(self.decorate, self.call_location(call),
+                             static_callee)
+        self.call_sites.append(call_site)
+
+        # Apply call site on function, as method of the function since 3.11
+        return [Instruction("LOAD_CONST", const_index(consts, call_site),
+                            call.location),
+                Instruction(*SWAP, location=call.location)] + \
+            [Instruction(opname, arg, call.location)
+             for opname, arg in SITE_CALL]
@@ -0,0 +1,157 @@
+"""Policy of the functions decorated by recursive_decorator.
+
+Rules include or exclude functions by their module, by the path of their
+source file or by a predicate. The rules are compiled once into a regular
+expression of modules, a tuple of path prefixes and a list of predicates,
+and the decision of every code object is cached, so a callee is matched
+against the rules once.
+"""
+import os
+import re
+import threading
+from fnmatch import translate
+from weakref import KeyedRef
+
+from recursive_decorator.utils import weak_callback
+
+# File name prefix of the standard library modules frozen since 3.11
+FROZEN_FILE_PREFIX = "<frozen "
+
+
+def library_paths():
+    """Return paths of the standard library and of the installed packages.
+
+    Return:
+        tuple. path prefixes of the library source files, and the file name
+            prefix of frozen modules.
+    """
+    import sysconfig
+
+    paths = sysconfig.get_paths()
+    return tuple(sorted({os.path.join(paths[name], "")
+                         for name in ("stdlib", "platstdlib",
+                                      "purelib", "platlib")
+                         if name in paths})) + (FROZEN_FILE_PREFIX,)
+
+
+class CompiledRules(object):
+    """Rules matching functions, compiled for matching many functions.
+
+    A rule is a glob pattern of modules names (modules matching it and
+    their sub modules match), a path prefix of source files (a string
+    containing a path separator, or starting with < as the file names of
+    frozen modules) or a predicate called with the function.
+
+    Arguments:
+        rules(iterable): the rules.
+
+    Attributes:
+        modules(Pattern): regular expression of all modules patterns, None
+            if no module rule.
+        paths(tuple): path prefixes of source files.
+        predicates(tuple): predicates of functions.
+    """
+
+    def __init__(self, rules):
+        module_patterns = []
+        paths = []
+        predicates = []
+        for rule in rules:
+            if callable(rule):
+                predicates.append(rule)
+
+            elif os.sep in rule or "/" in rule or rule.startswith("<"):
+                paths.append(rule)
+
+            else:
+                module_patterns.append(rule)
+
+        self.modules = None
+        if module_patterns:
+            self.modules = re.compile("|".join(
+                "(?:{})|(?:{})".format(translate(pattern),
+                                       re.escape(pattern + ".") + ".*")
+                for pattern in module_patterns))
+
+        self.paths = tuple(paths)
+        self.predicates = tuple(predicates)
+
+    def match(self, func):
+        """Return if function matches any of the rules.
+
+        Args:
+            func(function): function to match.
+
+        Return:
+            bool. true if any rule matches else false.
+        """
+        module_name = getattr(func, "__module__", None)
+        if self.modules is not None and isinstance(module_name, str) and \
+                self.modules.match(module_name):
+            return True
+
+        if self.paths and func.__code__.co_filename.startswith(self.paths):
+            return True
+
+        return any(predicate(func) for predicate in self.predicates)
+
+
+class DecorationPolicy(object):
+    """Policy deciding which functions are decorated.
+
+    Functions are decorated if they match an include rule, all functions
+    if there are none, and match no exclude rule. The decision is made
+    once per code object, by the first function of the code.
+
+    Arguments:
+        include(iterable): rules of decorated functions, None to include
+            all functions.
+        exclude(iterable): rules of functions not decorated.
+
+    Attributes:
+        key(tuple): the include and exclude rules.
+        decisions(dict): (code ref, decision) by the code id.
+    """
+
+    def __init__(self, include=None, exclude=()):
+        self.key = (None if include is None else tuple(include),
+                    tuple(exclude))
+        self.include = None if include is None else CompiledRules(include)
+        self.exclude = CompiledRules(exclude)
+        self.decisions = {}
+
+        self._lock = threading.RLock()
+        self._forget_callback = weak_callback(self._forget)
+
+    def allows(self, func):
+        """Return if function should be decorated.
+
+        Args:
+            func(function): function to decide.
+
+        Return:
+            bool. true if included and not excluded else false.
+        """
+        code = func.__code__
+        entry = self.decisions.get(id(code))
+        if entry is not None and entry[0]() is code:
+            return entry[1]
+
+        decision = (self.include is None or self.include.match(func)) and \
+            not self.exclude.match(func)
+        with self._lock:
+            self.decisions[id(code)] = (
+                KeyedRef(code, self._forget_callback, id(code)), decision)
+
+        return decision
+
+    def _forget(self, code_ref):
+        """Remove decision of collected code.
+
+        Args:
+            code_ref(KeyedRef): weak reference to the collected code.
+        """
+        with self._lock:
+            entry = self.decisions.get(code_ref.key)
+            if entry is not None and entry[0] is code_ref:
+                del self.decisions[code_ref.key]
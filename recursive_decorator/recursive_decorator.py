@@ -1,69 +1,282 @@
 """Decorator to apply given decorator recursively on all sub functions."""
+import threading
 from functools import wraps
+from weakref import WeakValueDictionary
 
-from recursive_decorator.decorator_adapter import DecoratorAdapter
-from recursive_decorator.utils import mount_to_module, \
-    set_func_args_and_kwargs_count, get_func_module, is_function, is_wrapped, \
+from recursive_decorator.decorator_adapter import DecoratorAdapter, \
+    DecoratorChain
+from recursive_decorator.backend import get_transformer_class
+from recursive_decorator.utils import get_func_module, is_function, \
     get_function_wrapped_value, set_function_wrapped_value, \
-    set_function_kwargs_default_values, is_method
-from .transformer import RecursiveDecoratorCallTransformer
+    get_function_wrapped_mask, set_function_wrapped_mask, \
+    get_function_wrapped_decorators, \
+    set_function_kwargs_default_values, is_method, rebuild_function
+from .call_site import get_code_call_sites, resolve_static_callee, \
+    make_code_template
+from .code_switch import code_switch
+from .disk_cache import disk_cache
+from .transform_cache import transform_cache, BoundCodes
 
+EAGER_DEPTH = 5
 
-def recursive_decorator(func_decorator, *func_decorator_args,
+_real_decorators = WeakValueDictionary()
+_real_decorators_lock = threading.Lock()
+
+
+def recursive_decorator(func_decorator, *func_decorator_args, eager=False,
+                        max_depth=None, include=None, exclude=None,
                         **func_decorator_kwargs):
     """Return new decorator that applying given decorator recursively
-        on all sub functions."""
+        on all sub functions.
+
+    The decorator is created once per decorator, args and kwargs, and
+    returned again on the next calls with the same arguments while alive.
+
+    With eager, sub functions loaded from globals are resolved statically
+    and decorated when decorating the function, instead of on their first
+    call, transitively up to the given depth (EAGER_DEPTH if True).
+
+    With max_depth, only sub functions up to the given depth of calls are
+    decorated, the decorated function is at depth 0. Functions at max_depth
+    are decorated but not transformed, so their sub functions run as is.
+
+    With include and exclude rules (modules globs, source files path
+    prefixes or predicates of functions, see DecorationPolicy), sub
+    functions not included or excluded are returned as is, and run their
+    original code. The rules are matched once per code object, and don't
+    apply to the explicitly decorated functions.
+    """
+    eager_depth = EAGER_DEPTH if eager is True else int(eager)
+    decorator = DecoratorAdapter(func=func_decorator,
+                                 args=func_decorator_args,
+                                 kwargs=func_decorator_kwargs)
+    include = None if include is None else tuple(include)
+    exclude = () if exclude is None else tuple(exclude)
+
+    key = (decorator.key, eager_depth, max_depth, include, exclude)
+    with _real_decorators_lock:
+        real_decorator = _real_decorators.get(key)
+        if real_decorator is None:
+            policy = None
+            if include is not None or exclude:
+                # The policy imports re, only needed with rules
+                from .policy import DecorationPolicy
+                policy = DecorationPolicy(include, exclude)
+
+            real_decorator = _create_real_decorator(decorator, eager_depth,
+                                                    max_depth, policy)
+            _real_decorators[key] = real_decorator
+
+    return real_decorator
+
+
+def compose(*func_decorators, eager=False, max_depth=None, include=None,
+            exclude=None):
+    """Return new decorator applying given decorators recursively on all
+        sub functions, in a single pass.
+
+    Equivalent to stacking recursive_decorator of every decorator, the first
+    one outermost, but every sub function is transformed once and every
+    call site applies the whole chain of decorators.
+    """
+    if not func_decorators:
+        raise TypeError("compose requires at least one decorator")
+
+    return recursive_decorator(DecoratorChain, *func_decorators, eager=eager,
+                               max_depth=max_depth, include=include,
+                               exclude=exclude)
+
+
+def _create_real_decorator(decorator, eager_depth, max_depth=None,
+                           policy=None, depth=0):
+    """Return decorator that applying given decorator recursively on all
+        sub functions.
+
+    Decorators limited in depth have a variant per depth, decorating the
+    sub functions with the variant of the next depth.
+    Every variant binds the cached transformed code to itself, and tracks
+    the code it bound in its bound_codes attribute.
+
+    Args:
+        decorator(DecoratorAdapter): adapter of decorator to apply.
+        eager_depth(int): depth of sub functions to decorate ahead.
+        max_depth(int): depth of the last decorated sub functions, None
+            for unlimited depth.
+        policy(DecorationPolicy): policy of decorated sub functions, None
+            to decorate all functions.
+        depth(int): depth of the functions decorated by the variant.
+    """
+    func_decorator = decorator.func
+    bound_codes = BoundCodes()
+    sub_decorators = []
+
+    def get_sub_decorator():
+        """Return decorator of sub functions, created on first use."""
+        if max_depth is None:
+            return real_decorator
+
+        if not sub_decorators:
+            sub_decorators.append(
+                _create_real_decorator(decorator, 0, max_depth, policy,
+                                       depth + 1))
+
+        return sub_decorators[0]
 
     @wraps(func_decorator)
-    def real_decorator(func_to_decorate):
+    def real_decorator(func_to_decorate, explicit=False):
         """Decorator to apply given decorator recursively on function
-            sub calls."""
+            sub calls.
+
+        The policy applies to sub functions only, explicitly decorated
+        functions are always decorated.
+        """
         if is_method(func_to_decorate):
-            wrapped_as_function = real_decorator(func_to_decorate.__func__)
+            wrapped_as_function = real_decorator(func_to_decorate.__func__,
+                                                 explicit)
             instance = func_to_decorate.__self__
 
             return wrapped_as_function.__get__(instance,
                                                instance.__class__)
 
-        if (not is_function(func_to_decorate)) or \
-                is_wrapped(func_to_decorate, func_decorator):
+        if not is_function(func_to_decorate) or \
+                (not explicit and policy is not None and
+                 not policy.allows(func_to_decorate)):
             return func_to_decorate
 
-        decorator = DecoratorAdapter(func=func_decorator,
-                                     args=func_decorator_args,
-                                     kwargs=func_decorator_kwargs)
-
-        func_module = get_func_module(func_to_decorate)
+        wrapped_mask = get_function_wrapped_mask(func_to_decorate)
+        if wrapped_mask & decorator.mask == decorator.mask:
+            return func_to_decorate
 
-        mount_to_module(module_to_mount=func_module,
-                        object_to_mount=recursive_decorator,
-                        name_in_module=recursive_decorator.__name__)
+        if max_depth is not None and depth >= max_depth:
+            new_code = func_to_decorate.__code__
 
-        transformer = RecursiveDecoratorCallTransformer(func_module, decorator)
-        new_func = transformer(func_to_decorate)
+        else:
+            template = transform_cache.get_or_transform(
+                func_to_decorate.__code__,
+                lambda: _transform_code(func_to_decorate, decorator))
+            new_code = bound_codes.get_or_bind(template,
+                                               get_sub_decorator())
 
-        # TODO: remove when
-        # TODO: https://github.com/llllllllll/codetransformer/issues/67 is fixed
-        old_code = func_to_decorate.__code__
-        set_func_args_and_kwargs_count(new_func,
-                                       old_code.co_argcount,
-                                       old_code.co_kwonlyargcount)
+        new_func = rebuild_function(func_to_decorate, new_code)
 
         # TODO: remove when
         # TODO: https://github.com/llllllllll/codetransformer/issues/69 is fixed
         set_function_kwargs_default_values(new_func,
                                            func_to_decorate.__kwdefaults__)
+        if new_code is not func_to_decorate.__code__:
+            code_switch.track(new_func,
+                              code_switch.original_code(func_to_decorate))
 
-        already_wrapped_dec = get_function_wrapped_value(func_to_decorate)[:]
-        wrapped_function_list = already_wrapped_dec + [func_decorator.__name__]
+        wrapped_function_list = \
+            get_function_wrapped_value(func_to_decorate) + \
+            [wrapping_decorator.__name__
+             for wrapping_decorator in decorator.decorators]
+        wrapped_mask |= decorator.mask
+        wrapped_decorators = \
+            get_function_wrapped_decorators(func_to_decorate) + \
+            tuple(decorator.decorators)
 
         value = decorator.wrapper(new_func)
-        if is_function(value):
-            set_function_wrapped_value(value, wrapped_function_list)
+        wrapped_value = value.__func__ if is_method(value) else value
+        if is_function(wrapped_value):
+            set_function_wrapped_value(wrapped_value, wrapped_function_list)
+            set_function_wrapped_mask(wrapped_value, wrapped_mask,
+                                      wrapped_decorators)
 
-        if is_method(value):
-            set_function_wrapped_value(value.__func__, wrapped_function_list)
+        return value
+
+    real_decorator.bound_codes = bound_codes
+    if depth or (not eager_depth and policy is None):
+        return real_decorator
+
+    @wraps(func_decorator)
+    def explicit_decorator(func_to_decorate):
+        """Decorator to apply given decorator recursively on function
+            sub calls, and on its static sub functions ahead if eager."""
+        value = real_decorator(func_to_decorate, explicit=True)
+        if eager_depth:
+            _prime_call_sites(func_to_decorate, bound_codes, eager_depth)
 
         return value
 
-    return real_decorator
+    explicit_decorator.bound_codes = bound_codes
+    return explicit_decorator
+
+
+def _transform_code(func_to_decorate, decorator):
+    """Return template of code of function with sub calls wrapped.
+
+    The template is loaded from the disk cache when possible, otherwise the
+    code is transformed with unbound call sites, and its template is stored
+    to the disk cache.
+
+    Args:
+        func_to_decorate(function): function to transform its code.
+        decorator(DecoratorAdapter): adapter of applied decorator.
+
+    Return:
+        code. the template of transformed code.
+    """
+    old_code = func_to_decorate.__code__
+    func_module = get_func_module(func_to_decorate)
+
+    template = disk_cache.load(old_code, decorator)
+    if template is not None:
+        return template
+
+    transformer = get_transformer_class()(func_module, None)
+    template = make_code_template(transformer(func_to_decorate).__code__)
+
+    disk_cache.store(old_code, decorator, template)
+
+    return template
+
+
+def _prime_call_sites(func_to_decorate, bound_codes, depth):
+    """Decorate static sub functions and cache them in their call sites.
+
+    Sub functions are decorated by the decorator of their call site, and
+    their own sub functions are found in the code bound by it.
+
+    Args:
+        func_to_decorate(function): the decorated function.
+        bound_codes(BoundCodes): codes bound by the decorator.
+        depth(int): depth of sub functions to decorate.
+    """
+    if is_method(func_to_decorate):
+        func_to_decorate = func_to_decorate.__func__
+
+    if not is_function(func_to_decorate):
+        return
+
+    functions = [(func_to_decorate, bound_codes)]
+    visited_codes = {func_to_decorate.__code__}
+    for _ in range(depth):
+        callees = []
+        for function, codes in functions:
+            template = transform_cache.get(function.__code__)
+            new_code = None if template is None else codes.get(template)
+            if new_code is None:
+                continue
+
+            for call_site in get_code_call_sites(new_code):
+                if call_site.static_callee is None:
+                    continue
+
+                callee = resolve_static_callee(call_site.static_callee,
+                                               function.__globals__)
+                if is_method(callee):
+                    callee = callee.__func__
+
+                if not is_function(callee) or call_site.is_cached(callee):
+                    continue
+
+                call_site.cache(callee, call_site.decorate(callee))
+                callee_codes = getattr(call_site.decorate, "bound_codes",
+                                       None)
+                if callee_codes is not None and \
+                        callee.__code__ not in visited_codes:
+                    visited_codes.add(callee.__code__)
+                    callees.append((callee, callee_codes))
+
+        functions = callees
@@ -0,0 +1,250 @@
+"""Wrappers generated with the exact signature of the wrapped functions.
+
+A pass-through wrapper taking *args and **kwargs packs the arguments of
+every call into a tuple and a dict, and unpacks them again to call the
+wrapped function. The wrappers generated here have the parameters of the
+wrapped function, so calls of functions with a fixed arity don't allocate
+a dict.
+"""
+from functools import update_wrapper
+
+from recursive_decorator.recursive_decorator import recursive_decorator
+from recursive_decorator.utils import get_code_args_count, CO_VARARGS, \
+    CO_VARKEYWORDS
+
+WRAPPER_TEMPLATE = """\
+def make_wrapper({func}, {on_enter}, {on_exit}, {code}):
+    def wrapper({parameters}):
+{body}
+    return wrapper
+"""
+
+ENTER_TEMPLATE = """\
+        {on_enter}({code}, {frame_args})
+"""
+
+CALL_TEMPLATE = """\
+        return {func}({arguments})
+"""
+
+CALL_WITH_EXIT_TEMPLATE = """\
+        try:
+            {result} = {func}({arguments})
+        except BaseException:
+            {on_exit}({code}, None)
+            raise
+        {on_exit}({code}, {result})
+        return {result}
+"""
+
+# Wrapper factories by the signature shape of the wrapped code
+_wrapper_factories = {}
+
+
+def get_signature_shape(func):
+    """Return shape of the signature of function.
+
+    Functions of the same shape are wrapped by the same generated code.
+
+    Return:
+        tuple. arguments names, positional only and positional arguments
+            count, var positional and var keyword flags, defaults count and
+            names of keyword only arguments with defaults.
+    """
+    code = func.__code__
+    return (code.co_varnames[:get_code_args_count(code)],
+            getattr(code, "co_posonlyargcount", 0),
+            code.co_argcount,
+            bool(code.co_flags & CO_VARARGS),
+            bool(code.co_flags & CO_VARKEYWORDS),
+            len(func.__defaults__ or ()),
+            tuple(sorted(func.__kwdefaults__ or ())))
+
+
+def unique_name(name, names):
+    """Return name prefixed with underscores until it isn't in names."""
+    while name in names:
+        name = "_" + name
+
+    return name
+
+
+def make_wrapper_source(shape, on_enter, on_exit):
+    """Return source of factory of wrappers of given signature shape.
+
+    Args:
+        shape(tuple): signature shape of the wrapped functions.
+        on_enter(bool): whether the wrappers call on_enter.
+        on_exit(bool): whether the wrappers call on_exit.
+
+    Return:
+        str. source of make_wrapper, creating a wrapper from the wrapped
+            function, the hooks and the wrapped code.
+    """
+    names, posonly_count, positional_count, var_positional, var_keyword, \
+        defaults_count, keyword_defaults = shape
+    hidden = {name: unique_name(name, names)
+              for name in ("func", "on_enter", "on_exit", "code", "result")}
+
+    positional = names[:positional_count]
+    keyword_only = names[positional_count:len(names) - var_positional -
+                         var_keyword]
+
+    parameters = []
+    arguments = list(positional)
+    for index, name in enumerate(positional):
+        default = index >= positional_count - defaults_count
+        parameters.append(name + "=None" if default else name)
+        if index == posonly_count - 1:
+            parameters.append("/")
+
+    if var_positional:
+        name = names[len(positional) + len(keyword_only)]
+        parameters.append("*" + name)
+        arguments.append("*" + name)
+
+    elif keyword_only:
+        parameters.append("*")
+
+    for name in keyword_only:
+        parameters.append(name + "=None" if name in keyword_defaults
+                          else name)
+        arguments.append("{0}={0}".format(name))
+
+    if var_keyword:
+        parameters.append("**" + names[-1])
+        arguments.append("**" + names[-1])
+
+    body = ""
+    if on_enter:
+        body += ENTER_TEMPLATE.format(
+            frame_args="(" + "".join(name + ", " for name in names) + ")",
+            **hidden)
+
+    call_template = CALL_WITH_EXIT_TEMPLATE if on_exit else CALL_TEMPLATE
+    body += call_template.format(arguments=", ".join(arguments), **hidden)
+
+    return WRAPPER_TEMPLATE.format(parameters=", ".join(parameters),
+                                   body=body.rstrip("\n"), **hidden)
+
+
+def make_generic_wrapper(func, on_enter, on_exit, code):
+    """Return wrapper of function taking any arguments.
+
+    Functions whose parameters aren't identifiers can't be wrapped by
+    generated source, as comprehensions and generator expressions taking
+    their iterator as .0. The compiler calls them with positional args
+    only, which are their frame args.
+
+    Args:
+        func(function): the wrapped function.
+        on_enter(function): called with code and frame args, None for no
+            hook.
+        on_exit(function): called with code and result, None for no hook.
+        code(code): the wrapped code.
+
+    Return:
+        function. the wrapper.
+    """
+    def wrapper(*args, **kwargs):
+        if on_enter is not None:
+            on_enter(code, args + tuple(kwargs.values()))
+
+        if on_exit is None:
+            return func(*args, **kwargs)
+
+        try:
+            result = func(*args, **kwargs)
+
+        except BaseException:
+            on_exit(code, None)
+            raise
+
+        on_exit(code, result)
+        return result
+
+    return wrapper
+
+
+def get_wrapper_factory(shape, on_enter, on_exit):
+    """Return factory of wrappers of given signature shape.
+
+    The factory source is compiled once per shape and hooks presence.
+    Shapes of arguments names that aren't identifiers get the generic
+    factory.
+
+    Return:
+        function. make_wrapper of the generated source.
+    """
+    if not all(name.isidentifier() for name in shape[0]):
+        return make_generic_wrapper
+
+    key = (shape, on_enter, on_exit)
+    factory = _wrapper_factories.get(key)
+    if factory is None:
+        namespace = {}
+        exec(make_wrapper_source(shape, on_enter, on_exit), namespace)
+        factory = _wrapper_factories[key] = namespace["make_wrapper"]
+
+    return factory
+
+
+class SpecializedWrapperDecorator(object):
+    """Decorator wrapping functions with wrappers of their own signature.
+
+    The wrappers call on_enter before the wrapped function, and on_exit
+    after it returns or raises, like the hooks of recursive_hooks.
+
+    Arguments:
+        on_enter(function): called with code and frame args of every
+            called function, None for no hook.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised, None for no
+            hook.
+    """
+
+    def __init__(self, on_enter=None, on_exit=None):
+        self.on_enter = on_enter
+        self.on_exit = on_exit
+
+    def __call__(self, func):
+        """Return wrapper of func with the signature of func."""
+        factory = get_wrapper_factory(get_signature_shape(func),
+                                      self.on_enter is not None,
+                                      self.on_exit is not None)
+        wrapper = factory(func, self.on_enter, self.on_exit, func.__code__)
+        wrapper.__defaults__ = func.__defaults__
+        wrapper.__kwdefaults__ = func.__kwdefaults__
+
+        return update_wrapper(wrapper, func)
+
+
+def recursive_specialized(on_enter=None, on_exit=None, eager=False,
+                          max_depth=None, include=None, exclude=None):
+    """Return decorator wrapping all sub functions with specialized wrappers.
+
+    The wrapping counterpart of recursive_hooks: the code of the sub
+    functions isn't changed beyond their call sites, and every sub function
+    is wrapped by a wrapper generated for its signature, calling the hooks.
+
+    Args:
+        on_enter(function): called with code and frame args of every
+            called function.
+        on_exit(function): called with code and result of every returned
+            function, result is None if the function raised.
+        eager(bool): whether sub functions are decorated ahead, as in
+            recursive_decorator.
+        max_depth(int): depth of the last decorated sub functions, as in
+            recursive_decorator.
+        include(iterable): rules of decorated functions, as in
+            recursive_decorator.
+        exclude(iterable): rules of functions not decorated, as in
+            recursive_decorator.
+
+    Return:
+        function. decorator of wrapped functions.
+    """
+    return recursive_decorator(SpecializedWrapperDecorator, on_enter=on_enter,
+                               on_exit=on_exit, eager=eager,
+                               max_depth=max_depth, include=include,
+                               exclude=exclude)
@@ -0,0 +1,292 @@
+"""Process wide cache of transformed code objects."""
+import sys
+import threading
+from collections import OrderedDict, namedtuple
+from types import CodeType
+from weakref import KeyedRef
+
+from recursive_decorator.call_site import bind_code_template
+from recursive_decorator.utils import weak_callback, get_code_line_table
+
+TransformCacheStats = namedtuple("TransformCacheStats",
+                                 ["entries", "bytes", "evictions"])
+
+
+def estimate_code_size(code):
+    """Estimate memory size of code object and its nested code objects.
+
+    Args:
+        code(code): code object to estimate.
+
+    Return:
+        int. estimated size in bytes.
+    """
+    return sys.getsizeof(code) + \
+        len(code.co_code) + \
+        len(get_code_line_table(code)) + \
+        sum(estimate_code_size(const) for const in code.co_consts
+            if isinstance(const, CodeType))
+
+
+class TransformCache(object):
+    """Cache of code objects transformed by RecursiveDecoratorCallTransformer.
+
+    Entries are keyed by the original code object, so the bytecode of a
+    callee is rewritten only once for all decorators. The transformed code
+    is a template, its call sites are templates bound by every recursive
+    decorator to itself (see BoundCodes), so entries don't keep decorators
+    alive. Original code objects are referenced weakly, their entries are
+    removed when collected. When the cache exceeds its entries count or
+    bytes budget, the least recently used entries are evicted.
+    The cache is shared by threads, concurrent transformations of the same
+    code run once, the other threads wait for the result.
+
+    Arguments:
+        max_entries(int): maximum number of entries, None for unbounded.
+        max_bytes(int): maximum estimated size of transformed code objects,
+            None for unbounded.
+
+    Attributes:
+        entries(OrderedDict): (code ref, transformed code, size) by the
+            code id, least recently used first.
+        total_bytes(int): estimated size of cached transformed code objects.
+        evictions(int): number of entries evicted.
+    """
+    DEFAULT_MAX_ENTRIES = 16384
+    DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+    def __init__(self, max_entries=DEFAULT_MAX_ENTRIES,
+                 max_bytes=DEFAULT_MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        self.evictions = 0
+
+        # Reentrant, since collected codes are forgotten by the collecting
+        # thread while it may hold the lock
+        self._lock = threading.RLock()
+        # Locks of running transformations by the code id
+        self._transform_locks = {}
+
+        self._forget_callback = weak_callback(self._forget)
+
+    def get(self, code):
+        """Return transformed code of given code.
+
+        Args:
+            code(code): original code object.
+
+        Return:
+            code. the transformed code, None if not cached.
+        """
+        key = id(code)
+        with self._lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+
+            self.entries.move_to_end(key)
+
+        return entry[1]
+
+    def set(self, code, transformed_code):
+        """Cache transformed code of given code.
+
+        Args:
+            code(code): original code object.
+            transformed_code(code): code after transformation.
+        """
+        key = id(code)
+        size = estimate_code_size(transformed_code)
+        with self._lock:
+            self._remove(key)
+            self.entries[key] = (KeyedRef(code, self._forget_callback, key),
+                                 transformed_code,
+                                 size)
+            self.total_bytes += size
+
+            self._evict()
+
+    def get_or_transform(self, code, transform):
+        """Return transformed code of code, transforming it once if missing.
+
+        Threads missing the same code together wait for the first one to
+        transform it, and return its transformed code.
+
+        Args:
+            code(code): original code object.
+            transform(function): returns the transformed code, called
+                without arguments.
+
+        Return:
+            code. the transformed code.
+        """
+        transformed_code = self.get(code)
+        if transformed_code is not None:
+            return transformed_code
+
+        key = id(code)
+        with self._lock:
+            transform_lock = self._transform_locks.setdefault(
+                key, threading.Lock())
+
+        try:
+            with transform_lock:
+                transformed_code = self.get(code)
+                if transformed_code is None:
+                    transformed_code = transform()
+                    self.set(code, transformed_code)
+
+        finally:
+            with self._lock:
+                if self._transform_locks.get(key) is transform_lock:
+                    del self._transform_locks[key]
+
+        return transformed_code
+
+    def configure(self, max_entries=DEFAULT_MAX_ENTRIES,
+                  max_bytes=DEFAULT_MAX_BYTES):
+        """Set cache limits and evict entries exceeding them.
+
+        Args:
+            max_entries(int): maximum number of entries, None for unbounded.
+            max_bytes(int): maximum estimated size of transformed code
+                objects, None for unbounded.
+        """
+        with self._lock:
+            self.max_entries = max_entries
+            self.max_bytes = max_bytes
+
+            self._evict()
+
+    def stats(self):
+        """Return current cache usage.
+
+        Return:
+            TransformCacheStats. number of entries, estimated bytes and
+                number of evictions.
+        """
+        return TransformCacheStats(entries=len(self.entries),
+                                   bytes=self.total_bytes,
+                                   evictions=self.evictions)
+
+    def clear(self):
+        """Remove all cached entries."""
+        with self._lock:
+            self.entries.clear()
+            self.total_bytes = 0
+
+    def _exceeded(self):
+        """Return if cache exceeds its limits."""
+        return (self.max_entries is not None and
+                len(self.entries) > self.max_entries) or \
+            (self.max_bytes is not None and
+             self.total_bytes > self.max_bytes)
+
+    def _evict(self):
+        """Evict least recently used entries while exceeding limits."""
+        while self.entries and self._exceeded():
+            _, (_, _, size) = self.entries.popitem(last=False)
+            self.total_bytes -= size
+            self.evictions += 1
+
+    def _remove(self, key):
+        """Remove entry of given key if exists.
+
+        Args:
+            key(int): id of the original code.
+        """
+        entry = self.entries.pop(key, None)
+        if entry is not None:
+            self.total_bytes -= entry[2]
+
+    def _forget(self, code_ref):
+        """Remove entry of collected code.
+
+        Args:
+            code_ref(KeyedRef): weak reference to the collected code.
+        """
+        with self._lock:
+            entry = self.entries.get(code_ref.key)
+            if entry is not None and entry[0] is code_ref:
+                self._remove(code_ref.key)
+
+
+class BoundCodes(object):
+    """Transformed code objects bound to a recursive decorator.
+
+    Every recursive decorator binds the templates of the transform cache to
+    itself, once while the bound code runs in some function. Bound code is
+    referenced weakly, since its call sites reference the decorator and
+    code objects aren't tracked by the garbage collector, so the decorator
+    lives as long as functions running its code.
+
+    Attributes:
+        codes(dict): (template ref, bound code ref) by the template id.
+    """
+
+    def __init__(self):
+        self.codes = {}
+
+        # Reentrant, since collected codes are forgotten by the collecting
+        # thread while it may hold the lock
+        self._lock = threading.RLock()
+        self._forget_callback = weak_callback(self._forget)
+
+    def get(self, template):
+        """Return bound code of given template.
+
+        Args:
+            template(code): template of transformed code.
+
+        Return:
+            code. the bound code, None if not bound.
+        """
+        entry = self.codes.get(id(template))
+        if entry is None or entry[0]() is not template:
+            return None
+
+        return entry[1]()
+
+    def get_or_bind(self, template, decorate):
+        """Return bound code of template, binding it once if missing.
+
+        Args:
+            template(code): template of transformed code.
+            decorate(function): recursive decorator applied by the call
+                sites of the template.
+
+        Return:
+            code. the bound code.
+        """
+        bound_code = self.get(template)
+        if bound_code is not None:
+            return bound_code
+
+        with self._lock:
+            bound_code = self.get(template)
+            if bound_code is None:
+                bound_code = bind_code_template(template, decorate)
+                self.codes[id(template)] = (
+                    KeyedRef(template, self._forget_callback, id(template)),
+                    KeyedRef(bound_code, self._forget_callback,
+                             id(template)))
+
+        return bound_code
+
+    def _forget(self, code_ref):
+        """Remove entry of collected template or bound code.
+
+        Args:
+            code_ref(KeyedRef): weak reference to the collected code.
+        """
+        with self._lock:
+            entry = self.codes.get(code_ref.key)
+            if entry is not None and \
+                    any(ref is code_ref for ref in entry):
+                del self.codes[code_ref.key]
+
+
+transform_cache = TransformCache()
@@ -2,11 +2,17 @@
 import sys
 
 from codetransformer import CodeTransformer, pattern
+from codetransformer.patterns import matchany
 from codetransformer.instructions import (CALL_FUNCTION, BUILD_TUPLE, ROT_TWO,
                                           LOAD_GLOBAL, UNPACK_SEQUENCE,
-                                          CALL_FUNCTION_KW)
+                                          CALL_FUNCTION_KW, LOAD_ATTR,
+                                          LOAD_CONST, DUP_TOP, COMPARE_OP,
+                                          POP_JUMP_IF_FALSE, POP_JUMP_IF_TRUE)
 
-from recursive_decorator.utils import mount_to_module
+from recursive_decorator.call_site import CallSite
+from recursive_decorator.elision import call_site_elision
+from recursive_decorator.utils import set_func_args_and_kwargs_count, \
+    FUNCTION_TYPES
 
 WORDCODE = sys.version_info >= (3, 6)
 
@@ -23,56 +29,208 @@ class RecursiveDecoratorCallTransformer(CodeTransformer):
 
     Arguments:
         function_module(module): module of function to transform.
-        decorator(DecoratorAdapter): adapter of decorator to apply on sub calls.
+        decorate(func): recursive decorator to apply on sub calls, None
+            for unbound call sites.
 
+    Attributes:
+        call_sites(list): call sites created by the transformer.
     """
-    RECURSIVE_DECORATOR_CALL_TYPE = CALL_FUNCTION_EX if WORDCODE \
-        else CALL_FUNCTION_VAR_KW
-
     CALL_TYPES = CALL_FUNCTION | CALL_FUNCTION_KW
+    CALL_CLASSES = (CALL_FUNCTION, CALL_FUNCTION_KW)
 
     if WORDCODE:
         CALL_TYPES = CALL_TYPES | CALL_FUNCTION_EX
+        CALL_CLASSES += (CALL_FUNCTION_EX,)
     else:
         CALL_TYPES = CALL_TYPES | CALL_FUNCTION_VAR | CALL_FUNCTION_VAR_KW
+        CALL_CLASSES += (CALL_FUNCTION_VAR, CALL_FUNCTION_VAR_KW)
+
+    # Stack manipulations that may reach items pushed before them
+    STACK_MANIPULATIONS = frozenset(("ROT_TWO", "ROT_THREE", "ROT_FOUR",
+                                     "DUP_TOP", "DUP_TOP_TWO"))
 
-    RECURSIVE_DECORATOR = "recursive_decorator"
+    def __init__(self, function_module, decorate):
+        self.function_module = function_module
+        self.decorate = decorate
+        self.call_sites = []
 
-    def __init__(self, function_module, decorator):
-        self.decorator_adapter_name = decorator.adapter_name
+    def __call__(self, func):
+        """Return new function with transformed code of given function."""
+        new_func = super().__call__(func)
 
-        dec_func, args, kwargs = decorator.as_tuple
-        # marge function and args to args
-        decorator_as_tuple = (tuple([dec_func] + list(args)), kwargs) \
-            if WORDCODE else (dec_func, args, kwargs)
-        decorator_as_tuple = tuple(reversed(decorator_as_tuple))
-        self.decorator_as_tuple_len = len(decorator_as_tuple)
+        # TODO: remove when
+        # TODO: https://github.com/llllllllll/codetransformer/issues/67 is fixed
+        set_func_args_and_kwargs_count(new_func,
+                                       func.__code__.co_argcount,
+                                       func.__code__.co_kwonlyargcount)
 
-        mount_to_module(module_to_mount=function_module,
-                        object_to_mount=decorator_as_tuple,
-                        name_in_module=self.decorator_adapter_name)
+        return new_func
 
-    @pattern(LOAD_GLOBAL[2], UNPACK_SEQUENCE, RECURSIVE_DECORATOR_CALL_TYPE,
-             ROT_TWO,
-             CALL_FUNCTION,
+    @pattern(LOAD_CONST, ROT_TWO, CALL_FUNCTION,
              ROT_TWO, UNPACK_SEQUENCE, BUILD_TUPLE, UNPACK_SEQUENCE,
              CALL_TYPES)
-    def _call(self, g1, *ins):
-        yield g1
-        yield from ins[:5]
-        if g1.arg == "recursive_decorator":
-            yield from self.wrap_function_with_recursive_decorator()
-        yield from ins[5:]
+    def _call(self, load_site, *ins):
+        """Transformer to wrap calls already wrapped by a call site."""
+        if not isinstance(load_site.arg, CallSite):
+            yield from self._const_call(load_site, *ins[:2])
+            yield from ins[2:-1]
+            yield from self.wrap_call(ins[-1])
+            return
+
+        yield load_site
+        yield from ins[:2]
+        yield from self.wrap_function_with_recursive_decorator(ins[-1])
+        yield from ins[2:]
+        yield from self.wrap_loaded_function(ins[-1])
+
+    @pattern(LOAD_CONST, ROT_TWO, CALL_FUNCTION)
+    def _const_call(self, load_const, *ins):
+        """Transformer to wrap functions already wrapped once loaded, and to
+        keep calls of callee type guards unwrapped."""
+        yield load_const
+        yield ins[0]
+        if isinstance(load_const.arg, CallSite):
+            yield from self.wrap_function_with_recursive_decorator(ins[1])
+            yield ins[1]
+
+        elif load_const.arg is type:
+            yield ins[1]
+
+        else:
+            yield from self.wrap_call(ins[1])
 
     @pattern(CALL_TYPES)
     def _call_transformer(self, call):
         """Transformer to wrap calls with recursive_decorator"""
+        yield from self.wrap_call(call)
+
+    @pattern(matchany)
+    def _load_transformer(self, instr):
+        """Transformer to wrap functions of calls once loaded."""
+        yield instr
+        yield from self.wrap_loaded_function(instr)
+
+    @property
+    def loaded_calls(self):
+        """Calls whose function is wrapped once loaded, of current code.
+
+        Return:
+            dict. call and the instruction following the function load, by
+                the function load instruction.
+        """
+        context = self.context
+        if not hasattr(context, "loaded_calls"):
+            context.loaded_calls = {}
+            instrs = self.code.instrs
+            for index, call in enumerate(instrs):
+                if not isinstance(call, self.CALL_CLASSES) or \
+                        self.call_params_count(call) == 0 or \
+                        self.is_wrapped_call(index):
+                    continue
+
+                load_index = self.function_load_index(index)
+                if load_index is not None:
+                    context.loaded_calls[instrs[load_index]] = \
+                        call, instrs[load_index + 1]
+
+        return context.loaded_calls
+
+    def wrap_call(self, call):
+        """Wrap function of call with a call site if it is a function.
+
+        Functions of other types skip the call site, calls of elided callees
+        are guarded by the callee identity instead. Calls with arguments,
+        whose function isn't wrapped once loaded, switch the function with
+        a tuple of the arguments.
+
+        Arguments:
+            call(Instruction): the call instruction.
+
+        Yield:
+            instructions to wrap the call function, and the call.
+        """
         call_args_count = self.call_params_count(call)
+        if any(loaded_call is call
+               for loaded_call, _ in self.loaded_calls.values()) or \
+                self.is_wrapped_call(self.code.instrs.index(call)):
+            yield call
+            yield from self.wrap_loaded_function(call)
+            return
+
+        static_callee = self.static_callee(call)
+        callee = call_site_elision.elided_callee(
+            static_callee, vars(self.function_module))
+
+        # Jumps to the call should run the wrapping too, so they are stolen
+        # before the guard jumps to the call
+        switch_back = list(self.switch_args_and_function(call_args_count))
+        if call_args_count == 0:
+            guard = self.guard_function(call, callee)
+            instrs = [next(guard)]
+            instrs[0].steal(call)
+            instrs.extend(guard)
 
-        yield from self.switch_function_and_args(call_args_count)
-        yield from self.wrap_function_with_recursive_decorator()
-        yield from self.switch_args_and_function(call_args_count)
+        else:
+            instrs = list(self.switch_function_and_args(call_args_count))
+            instrs[0].steal(call)
+            instrs.extend(self.guard_function(switch_back[0], callee))
+
+        instrs.extend(self.wrap_function_with_recursive_decorator(
+            call, static_callee))
+        if call_args_count > 0:
+            instrs.extend(switch_back)
+
+        yield from instrs
         yield call
+        yield from self.wrap_loaded_function(call)
+
+    def wrap_loaded_function(self, instr):
+        """Wrap function of call once loaded, before its arguments are pushed.
+
+        Arguments:
+            instr(Instruction): the instruction loading the function.
+
+        Yield:
+            instructions to wrap the function, none if instr doesn't load a
+                function of call.
+        """
+        call, end = self.loaded_calls.get(instr, (None, None))
+        if call is None:
+            return
+
+        static_callee = self.static_callee(call)
+        callee = call_site_elision.elided_callee(
+            static_callee, vars(self.function_module))
+
+        yield from self.guard_function(end, callee)
+        yield from self.wrap_function_with_recursive_decorator(
+            call, static_callee)
+
+    @staticmethod
+    def guard_function(target, callee=None):
+        """Jump to target if function on top of stack isn't a function.
+
+        Arguments:
+            target(Instruction): instruction to jump to.
+            callee(object): elided callee, the jump is taken if function is
+                the callee instead.
+
+        Yield:
+            instructions testing the type of function.
+        """
+        yield DUP_TOP()
+        if callee is not None:
+            yield LOAD_CONST(callee)
+            yield COMPARE_OP.IS
+            yield POP_JUMP_IF_TRUE(target)
+            return
+
+        yield LOAD_CONST(type)
+        yield ROT_TWO()
+        yield CALL_FUNCTION(1)
+        yield LOAD_CONST(FUNCTION_TYPES)
+        yield COMPARE_OP.IN
+        yield POP_JUMP_IF_FALSE(target)
 
     @staticmethod
     def call_params_count(call):
@@ -129,25 +287,131 @@ class RecursiveDecoratorCallTransformer(CodeTransformer):
         yield BUILD_TUPLE(args_count)
         yield UNPACK_SEQUENCE(args_count)
 
-    def apply_recursive_decorator_on_decorator(self):
-        """Call recursive_decorator(decorator, *args, **kwargs).
+    def call_location(self, call):
+        """Return source location of call in the transformed code.
 
-        Yield:
-            instructions to apply recursive_decorator on decorator.
+        Arguments:
+            call(Instruction): the call instruction.
+
+        Return:
+            str. file name, line number and name of the calling code.
+        """
+        lines = {id(instr): line for line, instr in self.code.lnotab.items()}
+        line = self.code.firstlineno
+        for instr in self.code.instrs:
+            line = lines.get(id(instr), line)
+            if instr is call:
+                break
+
+        return "{}:{} ({})".format(self.code.filename, line, self.code.name)
+
+    def is_wrapped_call(self, index):
+        """Return if the function of call is wrapped once loaded already.
+
+        Arguments:
+            index(int): index of the call instruction in current code.
+
+        Return:
+            bool. true if the call is an already transformed call else false.
         """
-        yield LOAD_GLOBAL(self.RECURSIVE_DECORATOR)
-        yield LOAD_GLOBAL(self.decorator_adapter_name)
-        yield UNPACK_SEQUENCE(self.decorator_as_tuple_len)
-        yield self.RECURSIVE_DECORATOR_CALL_TYPE(1)
+        instrs = self.code.instrs
+        load_index = self.function_load_index(index, entry=True)
+        if load_index is None or load_index < 2:
+            return False
+
+        load_site, switch, site_call = instrs[load_index - 2:load_index + 1]
+        return isinstance(load_site, LOAD_CONST) and \
+            isinstance(switch, ROT_TWO) and \
+            isinstance(site_call, CALL_FUNCTION) and \
+            isinstance(load_site.arg, CallSite)
+
+    def function_load_index(self, index, entry=False):
+        """Return index of the instruction loading the function of call.
+
+        The instructions pushing the call arguments are scanned backwards,
+        as long as they don't jump, aren't jumped to and don't manipulate
+        the stack below them, until the instruction before them.
+
+        Arguments:
+            index(int): index of the call instruction in current code.
+            entry(bool): whether the first argument instruction may be
+                jumped to.
+
+        Return:
+            int. index of the function load, None if not found.
+        """
+        instrs = self.code.instrs
+        # Number of stack items above the function before each instruction
+        stack_level = self.call_params_count(instrs[index])
+        while stack_level > 0:
+            index -= 1
+            if index < 0:
+                return None
+
+            instr = instrs[index]
+            stack_level -= instr.stack_effect
+            if instr.is_jmp or instr.opname in self.STACK_MANIPULATIONS or \
+                    (instr._target_of and not (entry and stack_level == 0)):
+                return None
 
-    def wrap_function_with_recursive_decorator(self):
-        """Wrap function with recursive_decorator.
+        if stack_level < 0 or index == 0:
+            return None
+
+        return index - 1
+
+    def static_callee(self, call):
+        """Return names of global and attributes loading the called function.
+
+        The instructions before the call are scanned backwards, as long as
+        they don't jump, until the instruction loading the function. Calls
+        of functions loaded by dynamic expressions are not resolved.
+
+        Arguments:
+            call(Instruction): the call instruction.
+
+        Return:
+            tuple. global name and attributes names, None if not resolved.
+        """
+        if call._target_of:
+            return None
+
+        instrs = self.code.instrs
+        index = self.function_load_index(instrs.index(call))
+        if index is None:
+            return None
+
+        names = []
+        while index >= 0 and isinstance(instrs[index], LOAD_ATTR):
+            names.append(instrs[index].arg)
+            if instrs[index]._target_of:
+                return None
+
+            index -= 1
+
+        if index < 0 or not isinstance(instrs[index], LOAD_GLOBAL):
+            return None
+
+        names.append(instrs[index].arg)
+
+        return tuple(reversed(names))
+
+    def wrap_function_with_recursive_decorator(self, call,
+                                               static_callee=None):
+        """Wrap function with a call site of recursive_decorator.
+
+        Arguments:
+            call(Instruction): the call instruction to wrap its function.
+            static_callee(tuple): names of global and attributes loading the
+                called function.
 
         Yield:
              instructions to wrap function with recursive_decorator.
         """
-        yield from self.apply_recursive_decorator_on_decorator()
+        call_site = CallSite(self.decorate, self.call_location(call),
+                             static_callee)
+        self.call_sites.append(call_site)
 
-        # Apply recursive_decorator(dec) on function
+        # Apply call site on function
+        yield LOAD_CONST(call_site)
         yield ROT_TWO()
         yield CALL_FUNCTION(1)
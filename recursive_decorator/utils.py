@@ -1,20 +1,86 @@
 """Utilities for recursive decorator."""
+import threading
+from heapq import heappop, heappush
+from itertools import count
 from types import CodeType, FunctionType, MethodType
+from weakref import WeakMethod, ref
 
 import sys
 
+# Code flags of var arguments, as in inspect, which is slow to import
+CO_VARARGS = 0x0004
+CO_VARKEYWORDS = 0x0008
+
 DECORATOR_LIST_FIELD_NAME = "__wraped_with_"
+DECORATOR_MASK_FIELD_NAME = "__wrapped_with_mask__"
+DECORATORS_FIELD_NAME = "__wrapped_with_decorators__"
+
+# (bit, decorator ref) by the decorator identity
+_decorator_bits = {}
+# Bits of collected decorators, the lowest is given first
+_free_decorator_bits = []
+_decorator_bit_numbers = count()
+# Reentrant, since collected decorators are forgotten by the collecting
+# thread while it may hold the lock
+_decorator_bits_lock = threading.RLock()
+
+# Types of callees wrapped by call sites, others are called as is
+FUNCTION_TYPES = (FunctionType, MethodType)
 
+CODE_FIELDS = ("co_argcount", "co_kwonlyargcount", "co_nlocals",
+               "co_stacksize", "co_flags", "co_code", "co_consts",
+               "co_names", "co_varnames", "co_filename", "co_name",
+               "co_firstlineno", "co_lnotab", "co_freevars", "co_cellvars")
 
-def mount_to_module(module_to_mount, object_to_mount, name_in_module):
-    """Mount Given function to given module.
+
+def replace_code(code, **fields):
+    """Return copy of given code with given fields replaced.
 
     Args:
-        module_to_mount(module): module to mount function.
-        object_to_mount(object): object to mount.
-        name_in_module(str): name of object after mount to module.
+        code(code): code to copy.
+        fields(dict): new values of code fields by their names.
+
+    Return:
+        code. the new code.
+    """
+    if hasattr(code, "replace"):
+        return code.replace(**fields)
+
+    return CodeType(*(fields.get(field, getattr(code, field))
+                      for field in CODE_FIELDS))
+
+
+def get_code_line_table(code):
+    """Return line numbers table of code.
+
+    co_lnotab is replaced by co_linetable since 3.10, and deprecated since
+    3.12.
+
+    Args:
+        code(code): code to return its table.
+
+    Return:
+        bytes. the line numbers table.
+    """
+    if hasattr(code, "co_linetable"):
+        return code.co_linetable
+
+    return code.co_lnotab
+
+
+def get_code_args_count(code):
+    """Return number of arguments of code.
+
+    Args:
+        code(code): code to count its arguments.
+
+    Return:
+        int. number of positional, keyword only, var positional and var
+            keyword arguments, the first names of co_varnames.
     """
-    setattr(module_to_mount, name_in_module, object_to_mount)
+    return code.co_argcount + code.co_kwonlyargcount + \
+        bool(code.co_flags & CO_VARARGS) + \
+        bool(code.co_flags & CO_VARKEYWORDS)
 
 
 def set_func_args_and_kwargs_count(function, args_count, kwargs_count):
@@ -25,22 +91,26 @@ def set_func_args_and_kwargs_count(function, args_count, kwargs_count):
         args_count(int): arg count to apply.
         kwargs_count(int): kwarg count to apply.
     """
-    code = function.__code__
-    function.__code__ = CodeType(args_count,
-                                 kwargs_count,
-                                 code.co_nlocals,
-                                 code.co_stacksize,
-                                 code.co_flags,
-                                 code.co_code,
-                                 code.co_consts,
-                                 code.co_names,
-                                 code.co_varnames,
-                                 code.co_filename,
-                                 code.co_name,
-                                 code.co_firstlineno,
-                                 code.co_lnotab,
-                                 code.co_freevars,
-                                 code.co_cellvars)
+    function.__code__ = replace_code(function.__code__,
+                                     co_argcount=args_count,
+                                     co_kwonlyargcount=kwargs_count)
+
+
+def rebuild_function(func, code):
+    """Return new function with given code and the state of given function.
+
+    Args:
+        func(function): function to take globals, name, defaults and closure.
+        code(code): code of the new function.
+
+    Return:
+        function. new function running given code.
+    """
+    return FunctionType(code,
+                        func.__globals__,
+                        func.__name__,
+                        func.__defaults__,
+                        func.__closure__)
 
 
 def set_function_kwargs_default_values(func, kwargs_default_values):
@@ -53,6 +123,28 @@ def set_function_kwargs_default_values(func, kwargs_default_values):
     func.__kwdefaults__ = kwargs_default_values
 
 
+def weak_callback(method):
+    """Return weak reference callback calling given method while alive.
+
+    The callback doesn't keep the method's instance alive, so instances
+    holding weak references with the callback don't form a cycle.
+
+    Args:
+        method(method): bound method to call with the dead reference.
+
+    Return:
+        function. the weak reference callback.
+    """
+    weak_method = WeakMethod(method)
+
+    def callback(dead_ref):
+        method = weak_method()
+        if method is not None:
+            method(dead_ref)
+
+    return callback
+
+
 def get_func_module(func):
     """Return function module.
 
@@ -86,6 +178,126 @@ def is_method(obj):
     return type(obj) is MethodType
 
 
+def _decorator_identity(decorator):
+    """Return identity key of decorator, bound methods by their parts."""
+    if is_method(decorator):
+        return id(decorator.__func__), id(decorator.__self__)
+
+    return id(decorator)
+
+
+def _forget_decorator_bit(identity, decorator_ref):
+    """Remove bit of collected decorator, and free it for new decorators.
+
+    Args:
+        identity(object): identity key of the collected decorator.
+        decorator_ref(ref): weak reference to the collected decorator.
+    """
+    with _decorator_bits_lock:
+        entry = _decorator_bits.get(identity)
+        if entry is not None and entry[1] is decorator_ref:
+            del _decorator_bits[identity]
+            heappush(_free_decorator_bits, entry[0])
+
+
+def get_decorator_bit(decorator):
+    """Return bit of decorator in the wrapped masks of functions.
+
+    Every decorator gets its own bit by its identity, so decorators of the
+    same name are told apart. The decorator is referenced weakly if
+    possible, and the bits of collected decorators are given again, so
+    masks are as long as the number of live decorators. Functions keep the
+    decorators of their mask alive, so a bit is freed once no function has
+    it set.
+
+    Args:
+        decorator(function): decorator applied by recursive_decorator.
+
+    Return:
+        int. the decorator bit.
+    """
+    identity = _decorator_identity(decorator)
+    entry = _decorator_bits.get(identity)
+    if entry is not None:
+        return entry[0]
+
+    reference_type = WeakMethod if is_method(decorator) else ref
+    with _decorator_bits_lock:
+        entry = _decorator_bits.get(identity)
+        if entry is not None:
+            return entry[0]
+
+        bit = heappop(_free_decorator_bits) if _free_decorator_bits else \
+            1 << next(_decorator_bit_numbers)
+        try:
+            decorator_ref = reference_type(
+                decorator,
+                lambda dead_ref: _forget_decorator_bit(identity, dead_ref))
+
+        except TypeError:
+            # Not weakly referable, kept alive so its identity isn't reused
+            decorator_ref = decorator
+
+        _decorator_bits[identity] = (bit, decorator_ref)
+
+    return bit
+
+
+def get_decorators_mask(decorators):
+    """Return wrapped mask of given decorators.
+
+    Args:
+        decorators(iterable): decorators applied by recursive_decorator.
+
+    Return:
+        int. the bits of all decorators.
+    """
+    mask = 0
+    for decorator in decorators:
+        mask |= get_decorator_bit(decorator)
+
+    return mask
+
+
+def get_function_wrapped_mask(func):
+    """Return mask of decorators applied on func by recursive_decorator.
+
+    Args:
+        func(function): function to get its decorators mask.
+
+    Return:
+        int. bits of decorators applied on func.
+    """
+    return getattr(func, DECORATOR_MASK_FIELD_NAME, 0)
+
+
+def get_function_wrapped_decorators(func):
+    """Return decorators of the mask of func.
+
+    Args:
+        func(function): function to get its decorators.
+
+    Return:
+        tuple. decorators applied on func by recursive_decorator.
+    """
+    return getattr(func, DECORATORS_FIELD_NAME, ())
+
+
+def set_function_wrapped_mask(func, mask, decorators):
+    """Set mask of decorators applied by recursive_decorator.
+
+    The function references the decorators, so their bits aren't given to
+    other decorators while set in its mask.
+
+    Args:
+        func(function): function to set its decorators mask.
+        mask(int): bits of decorators applied by recursive_decorator.
+        decorators(tuple): decorators of the bits of mask.
+    """
+    setattr(func, DECORATOR_MASK_FIELD_NAME, mask)
+    setattr(func, DECORATORS_FIELD_NAME, decorators)
+
+
 def is_wrapped(func, decorator):
     """Return if function is already wrapped with the given decorator.
 
@@ -96,10 +308,8 @@ def is_wrapped(func, decorator):
     Return:
          bool. true if is function is already wrapped else false.
     """
-    if hasattr(func, DECORATOR_LIST_FIELD_NAME):
-        return decorator.__name__ in getattr(func, DECORATOR_LIST_FIELD_NAME)
-
-    return False
+    return bool(get_function_wrapped_mask(func) &
+                get_decorator_bit(decorator))
 
 
 def get_function_wrapped_value(func):
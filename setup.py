@@ -13,8 +13,10 @@ setup(
     author_email="ronenya4321@gmail.com",
     url="https://github.com/ronen-y/recursive_decorator",
     keywords="decorator recursive recursive_decorator recursive-decorator",
-    install_requires=["codetransformer", "cached-property"],
+    install_requires=["codetransformer; python_version < '3.8'",
+                      "cached-property; python_version < '3.8'"],
     packages=["recursive_decorator"],
+    python_requires=">=3.4, <3.13",
     extras_require={
         'dev': [
             'mock',
@@ -31,6 +33,11 @@ setup(
         'Programming Language :: Python :: 3.4',
         'Programming Language :: Python :: 3.5',
         'Programming Language :: Python :: 3.6',
+        'Programming Language :: Python :: 3.8',
+        'Programming Language :: Python :: 3.9',
+        'Programming Language :: Python :: 3.10',
+        'Programming Language :: Python :: 3.11',
+        'Programming Language :: Python :: 3.12',
         'Programming Language :: Python :: 3 :: Only',
         'Programming Language :: Python :: Implementation :: CPython',
         'Operating System :: POSIX',
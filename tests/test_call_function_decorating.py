@@ -62,7 +62,7 @@ def test_applying_decorator_with_args_on_call_function(mock_decorator,
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.has_been_called is True
     assert func_to_decorate.has_been_called is True
@@ -86,7 +86,7 @@ def test_applying_decorator_with_kwargs_on_call_function(mock_decorator,
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.has_been_called is True
     assert func_to_decorate.has_been_called is True
@@ -112,7 +112,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.has_been_called is True
     assert func_to_decorate.has_been_called is True
@@ -157,7 +157,7 @@ def test_applying_decorator_with_args_on_call_function_with_positional_args(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert func_to_decorate.has_been_called is True
@@ -182,7 +182,7 @@ def test_applying_decorator_with_kwargs_on_call_function_with_positional_args(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert func_to_decorate.has_been_called is True
@@ -207,7 +207,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_with_positiona
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert func_to_decorate.has_been_called is True
@@ -252,7 +252,7 @@ def test_applying_decorator_with_args_on_call_function_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
     assert func_to_decorate.has_been_called is True
@@ -277,7 +277,7 @@ def test_applying_decorator_with_kwargs_on_call_function_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
     assert func_to_decorate.has_been_called is True
@@ -302,7 +302,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
     assert func_to_decorate.has_been_called is True
@@ -351,7 +351,7 @@ def test_applying_decorator_with_args_on_call_function_with_positional_args_and_
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -378,7 +378,7 @@ def test_applying_decorator_with_kwargs_on_call_function_with_positional_args_an
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -405,7 +405,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_with_positiona
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
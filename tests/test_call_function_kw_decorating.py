@@ -65,7 +65,7 @@ def test_applying_decorator_with_args_on_call_function_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == another_func_kwargs
     assert func_to_decorate.has_been_called is True
@@ -91,7 +91,7 @@ def test_applying_decorator_with_kwargs_on_call_function_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == another_func_kwargs
     assert func_to_decorate.has_been_called is True
@@ -118,7 +118,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == another_func_kwargs
     assert func_to_decorate.has_been_called is True
@@ -169,7 +169,7 @@ def test_applying_decorator_with_args_on_call_function_kw_with_positional_args(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == another_func_kwargs
@@ -197,7 +197,7 @@ def test_applying_decorator_with_kwargs_on_call_function_kw_with_positional_args
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == another_func_kwargs
@@ -225,7 +225,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_kw_with_positi
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == another_func_kwargs
@@ -275,7 +275,7 @@ def test_applying_decorator_with_args_on_call_function_kw_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
                                        **another_func_kwargs)
@@ -302,7 +302,7 @@ def test_applying_decorator_with_kwargs_on_call_function_kw_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
                                        **another_func_kwargs)
@@ -329,7 +329,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_kw_with_keywor
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
                                        **another_func_kwargs)
@@ -382,7 +382,7 @@ def test_applying_decorator_with_args_on_call_function_kw_with_postional_args_an
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -411,7 +411,7 @@ def test_applying_decorator_with_kwargs_on_call_function_kw_with_postional_args_
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -440,7 +440,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_kw_with_positi
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
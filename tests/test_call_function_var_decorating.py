@@ -65,7 +65,7 @@ def test_applying_decorator_with_args_on_call_function_var(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert func_to_decorate.has_been_called is True
@@ -91,7 +91,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert func_to_decorate.has_been_called is True
@@ -118,7 +118,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert func_to_decorate.has_been_called is True
@@ -166,7 +166,7 @@ def test_applying_decorator_with_args_on_call_function_var_with_positional_args(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert func_to_decorate.has_been_called is True
@@ -192,7 +192,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_with_positional_arg
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert func_to_decorate.has_been_called is True
@@ -218,7 +218,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_with_posit
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert func_to_decorate.has_been_called is True
@@ -269,7 +269,7 @@ def test_applying_decorator_with_args_on_call_function_var_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
     assert another_func.args == another_func_args
@@ -297,7 +297,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -325,7 +325,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_with_keywo
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -377,7 +377,7 @@ def test_applying_decorator_with_args_on_call_function_var_with_postional_args_a
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -405,7 +405,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_with_postional_args
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -433,7 +433,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_with_posit
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -70,7 +70,7 @@ def test_applying_decorator_with_args_on_call_function_var_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -99,7 +99,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -129,7 +129,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_kw(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -183,7 +183,7 @@ def test_applying_decorator_with_args_on_call_function_var_kw_with_positional_ar
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -212,7 +212,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_kw_with_positional_
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -241,7 +241,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_kw_with_po
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == another_func_kwargs
@@ -296,7 +296,7 @@ def test_applying_decorator_with_args_on_call_function_var_kw_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -326,7 +326,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_kw_with_keyword(
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -356,7 +356,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_var_kw_with_ke
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -414,7 +414,7 @@ def test_applying_decorator_with_args_on_call_function_var_kw_with_postional_arg
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -445,7 +445,7 @@ def test_applying_decorator_with_kwargs_on_call_function_var_kw_with_postional_a
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -476,7 +476,7 @@ def test_applying_decorator_with_args_and_kwargs_on_call_function_kw_with_positi
 
     func_to_decorate()
 
-    assert mock_decorator.call_count == 2
+    assert mock_decorator.call_count == 1
     assert mock_wrapper.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
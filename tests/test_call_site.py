@@ -0,0 +1,229 @@
+"""Validating call sites cache the wrapped callees."""
+import dis
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.call_site import CallSite, get_call_sites
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+    decorator.side_effect = lambda func: func
+
+    return decorator
+
+
+def sites_of(mock_decorator):
+    return [site for site in get_call_sites()
+            if site.decorate.__wrapped__ is mock_decorator]
+
+
+def test_call_site_hits_on_same_callee(mock_decorator):
+    def another_func():
+        another_func.call_count += 1
+
+    another_func.call_count = 0
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        for _ in range(5):
+            another_func()
+
+    func_to_decorate()
+
+    assert another_func.call_count == 5
+    assert mock_decorator.call_count == 2
+
+    another_func_site, = [site for site in sites_of(mock_decorator)
+                          if site.misses]
+    assert another_func_site.misses == 1
+    assert another_func_site.hits == 4
+    assert another_func_site.megamorphic is False
+
+
+def test_call_site_with_polymorphic_callees(mock_decorator):
+    def make_func():
+        def func():
+            pass
+
+        return func
+
+    funcs = [make_func() for _ in range(CallSite.POLYMORPHIC_LIMIT)]
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(callees):
+        for callee in callees:
+            callee()
+
+    func_to_decorate(funcs)
+    func_to_decorate(funcs)
+
+    site, = [site for site in sites_of(mock_decorator) if site.misses]
+    assert site.misses == CallSite.POLYMORPHIC_LIMIT
+    assert site.hits == CallSite.POLYMORPHIC_LIMIT
+    assert site.megamorphic is False
+
+
+def test_call_site_with_megamorphic_callees(mock_decorator):
+    def make_func():
+        def func():
+            pass
+
+        return func
+
+    funcs = [make_func() for _ in range(CallSite.POLYMORPHIC_LIMIT + 1)]
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(callees):
+        for callee in callees:
+            callee()
+
+    func_to_decorate(funcs)
+    func_to_decorate(funcs)
+
+    site, = [site for site in sites_of(mock_decorator) if site.misses]
+    assert site.megamorphic is True
+    assert site.misses == CallSite.POLYMORPHIC_LIMIT + 2
+
+
+def test_call_site_binds_cached_method(mock_decorator):
+    class A:
+        def __init__(self, value):
+            self.value = value
+
+        def method(self):
+            return self.value
+
+    instances = [A(1), A(2)]
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        values = []
+        for instance in instances:
+            values.append(instance.method())
+
+        return values
+
+    assert func_to_decorate() == [1, 2]
+    assert func_to_decorate() == [1, 2]
+    assert mock_decorator.call_count == 2
+
+
+def test_call_site_does_not_cache_builtins(mock_decorator):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        values = []
+        values.append(len(values))
+        return values
+
+    assert func_to_decorate() == [0]
+
+    assert all(site.misses == 0 and site.hits == 0
+               for site in sites_of(mock_decorator))
+
+
+@pytest.fixture()
+def site_call_spy():
+    with mock.patch.object(CallSite, "__call__", autospec=True,
+                           side_effect=CallSite.__call__) as site_call:
+        yield site_call
+
+
+def test_non_function_callees_skip_call_site(mock_decorator, site_call_spy):
+    class A:
+        def __init__(self, value, key=None):
+            self.value = value
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        values = [A(1).value, A(2, key=3).value, len([])]
+        values.append(dict(a=4)['a'])
+        return values
+
+    assert func_to_decorate() == [1, 2, 0, 4]
+    assert func_to_decorate() == [1, 2, 0, 4]
+    assert site_call_spy.call_count == 0
+
+
+def test_non_function_callees_without_arguments(mock_decorator,
+                                                site_call_spy):
+    class A:
+        pass
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        return type(A()), dict()
+
+    assert func_to_decorate() == (A, {})
+    assert site_call_spy.call_count == 0
+
+
+def test_function_callees_reach_call_site(mock_decorator, site_call_spy):
+    def another_func(value, key=None):
+        return value
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        return [another_func(1), another_func(2, key=3), len([])]
+
+    assert func_to_decorate() == [1, 2, 0]
+    assert site_call_spy.call_count == 2
+
+
+def test_stacked_decorators_skip_call_sites(mock_decorator, site_call_spy):
+    another_decorator = mock.MagicMock()
+    another_decorator.__name__ = 'another_decorator'
+    another_decorator.side_effect = lambda func: func
+
+    @recursive_decorator(another_decorator)
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(values):
+        return sorted(values, key=abs)
+
+    assert func_to_decorate([2, -1]) == [-1, 2]
+    assert site_call_spy.call_count == 0
+
+
+def another_func(*args, **kwargs):
+    return args, kwargs
+
+
+def test_call_arguments_are_not_moved(mock_decorator):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(x):
+        return another_func(x, another_func(x + 1, k=x), *[x], k=2)
+
+    opnames = {instr.opname
+               for instr in dis.get_instructions(func_to_decorate)}
+
+    assert func_to_decorate(1) == \
+        ((1, ((2,), {'k': 1}), 1), {'k': 2})
+    assert "UNPACK_SEQUENCE" not in opnames
+    assert mock_decorator.call_count == 3
+
+
+def test_call_arguments_with_jumps(mock_decorator, site_call_spy):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(x):
+        return another_func(x if x else -x, x and another_func(x))
+
+    assert func_to_decorate(1) == ((1, ((1,), {})), {})
+    assert func_to_decorate(0) == ((0, 0), {})
+    assert site_call_spy.call_count == 3
+
+
+def test_call_sites_are_code_constants(mock_decorator):
+    module_names = set(globals())
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(x):
+        return another_func(x)
+
+    assert func_to_decorate(1) == ((1,), {})
+    assert set(globals()) == module_names
+    assert any(isinstance(const, CallSite)
+               for const in func_to_decorate.__code__.co_consts)
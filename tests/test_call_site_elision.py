@@ -0,0 +1,134 @@
+"""Validating call sites of C callees are elided at transform time."""
+import math
+from types import CodeType
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.call_site import CallSite
+from recursive_decorator.elision import call_site_elision
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+    decorator.side_effect = lambda func: func
+
+    return decorator
+
+
+@pytest.fixture()
+def site_call_spy():
+    with mock.patch.object(CallSite, "__call__", autospec=True,
+                           side_effect=CallSite.__call__) as site_call:
+        yield site_call
+
+
+@pytest.fixture()
+def elision():
+    yield call_site_elision
+
+    call_site_elision.configure(known_callees=(), elide_builtins=True)
+
+
+def code_consts(code):
+    consts = []
+    for const in code.co_consts:
+        if isinstance(const, CodeType):
+            consts.extend(code_consts(const))
+
+        else:
+            consts.append(const)
+
+    return consts
+
+
+def is_const(value, code):
+    return any(const is value for const in code_consts(code))
+
+
+def test_builtin_call_site_elided(mock_decorator, site_call_spy):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(values):
+        return [abs(values[0]), len(values)]
+
+    assert func_to_decorate([-1, 2]) == [1, 2]
+    assert site_call_spy.call_count == 0
+    assert is_const(abs, func_to_decorate.__code__)
+    assert is_const(len, func_to_decorate.__code__)
+
+
+def test_shadowed_builtin_falls_back_to_call_site(mock_decorator,
+                                                  site_call_spy,
+                                                  monkeypatch):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(value):
+        return divmod(value, 3)
+
+    assert func_to_decorate(7) == (2, 1)
+    assert site_call_spy.call_count == 0
+
+    def shadowing_divmod(value, divisor):
+        return value
+
+    monkeypatch.setitem(globals(), "divmod", shadowing_divmod)
+
+    assert func_to_decorate(7) == 7
+    assert site_call_spy.call_count == 1
+    assert mock_decorator.call_args[0][0].__name__ == "shadowing_divmod"
+
+
+def test_global_builtin_name_not_elided(mock_decorator, site_call_spy,
+                                        monkeypatch):
+    monkeypatch.setitem(globals(), "divmod", divmod)
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(value):
+        return divmod(value, 3)
+
+    assert func_to_decorate(7) == (2, 1)
+    assert not is_const(divmod, func_to_decorate.__code__)
+
+
+def test_builtins_elision_disabled(mock_decorator, elision):
+    elision.configure(elide_builtins=False)
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(values):
+        return len(values)
+
+    assert func_to_decorate([1]) == 1
+    assert not is_const(len, func_to_decorate.__code__)
+
+
+def test_known_callee_call_site_elided(mock_decorator, site_call_spy,
+                                       elision, monkeypatch):
+    elision.configure(known_callees=[math.sqrt])
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(value):
+        return math.sqrt(value)
+
+    assert func_to_decorate(4) == 2
+    assert site_call_spy.call_count == 0
+    assert is_const(math.sqrt, func_to_decorate.__code__)
+
+    def sqrt(value):
+        return value
+
+    monkeypatch.setattr(math, "sqrt", sqrt)
+
+    assert func_to_decorate(4) == 4
+    assert site_call_spy.call_count == 1
+    assert mock_decorator.call_args[0][0].__name__ == "sqrt"
+
+
+def test_unknown_attribute_callee_not_elided(mock_decorator):
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate(value):
+        return math.floor(value)
+
+    assert func_to_decorate(2.5) == 2
+    assert not is_const(math.floor, func_to_decorate.__code__)
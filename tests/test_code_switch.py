@@ -0,0 +1,100 @@
+"""Validating swapping the code of decorated functions process wide."""
+import gc
+
+import pytest
+
+from recursive_decorator import recursive_decorator, disable_all, \
+    enable_all
+from recursive_decorator.code_switch import code_switch
+from recursive_decorator.hooks import recursive_hooks
+
+
+@pytest.fixture()
+def calls():
+    return []
+
+
+@pytest.fixture()
+def logging_decorator(calls):
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@pytest.fixture(autouse=True)
+def enabled_code_switch():
+    yield
+    enable_all()
+
+
+def leaf(value):
+    return value + 1
+
+
+def node(value):
+    return leaf(value) * 2
+
+
+def test_disabling_and_enabling_all(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator)(node)
+    assert decorated(1) == 4
+    assert calls == ["node", "leaf"]
+
+    stats = disable_all()
+    assert stats.functions >= 2
+    assert stats.seconds >= 0
+    assert not code_switch.enabled
+
+    assert decorated(1) == 4
+    assert calls == ["node", "leaf", "node"]
+
+    assert enable_all().functions == stats.functions
+    assert decorated(1) == 4
+    assert calls == ["node", "leaf", "node", "node", "leaf"]
+
+
+def test_decorating_while_disabled(calls, logging_decorator):
+    disable_all()
+    decorated = recursive_decorator(logging_decorator)(node)
+
+    assert decorated(1) == 4
+    assert calls == ["node"]
+
+    enable_all()
+    assert decorated(1) == 4
+    assert calls == ["node", "node", "leaf"]
+
+
+def test_disabling_hooks():
+    events = []
+
+    @recursive_hooks(on_enter=lambda code, args: events.append(code.co_name))
+    def func_to_decorate():
+        return leaf(1)
+
+    disable_all()
+    assert func_to_decorate() == 2
+    assert events == []
+
+    enable_all()
+    assert func_to_decorate() == 2
+    assert events == ["func_to_decorate", "leaf"]
+
+
+def test_forgetting_collected_functions(logging_decorator):
+    namespace = {}
+    exec("def func():\n    return len([])", globals(), namespace)
+    decorated = recursive_decorator(logging_decorator)(namespace.pop("func"))
+    function_id = id(decorated.__closure__[
+        decorated.__code__.co_freevars.index("func")].cell_contents)
+    assert function_id in code_switch.functions
+
+    del decorated
+    gc.collect()
+
+    assert function_id not in code_switch.functions
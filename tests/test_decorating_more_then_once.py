@@ -1,9 +1,16 @@
 """Validating decorating with recursive_decorator more then once."""
+import gc
+import weakref
+
 import mock
 import pytest
 
-from recursive_decorator import recursive_decorator
-from recursive_decorator.utils import DECORATOR_LIST_FIELD_NAME
+from recursive_decorator import recursive_decorator, compose
+from recursive_decorator.call_site import get_code_call_sites
+from recursive_decorator.transform_cache import transform_cache
+from recursive_decorator.utils import DECORATOR_LIST_FIELD_NAME, \
+    is_wrapped, get_decorator_bit, get_function_wrapped_mask, \
+    _decorator_bits, _decorator_identity
 
 
 @pytest.fixture()
@@ -144,9 +151,9 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_with_posi
     decorator2_args = (5, 13, 'a11', "33b")
     decorator2_kwargs = {'a': 55, 'c': '11', 'b': 22, 'd': '12'}
     mock_decorator1_calls = [mock.call(*decorator1_args,
-                                       **decorator1_kwargs)] * 2
+                                       **decorator1_kwargs)]
     mock_decorator2_calls = [mock.call(*decorator2_args,
-                                       **decorator2_kwargs)] * 2
+                                       **decorator2_kwargs)]
 
     def another_func(*args, **kwargs):
         another_func.args = args
@@ -170,8 +177,8 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_with_posi
     mock_decorator1.assert_has_calls(mock_decorator1_calls, any_order=True)
     mock_decorator2.assert_has_calls(mock_decorator2_calls, any_order=True)
 
-    assert mock_decorator1.call_count == 2
-    assert mock_decorator2.call_count == 2
+    assert mock_decorator1.call_count == 1
+    assert mock_decorator2.call_count == 1
     assert mock_wrapper1.call_count == 2
     assert mock_wrapper2.call_count == 2
     assert another_func.args == (1, 2, '3')
@@ -189,9 +196,9 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_kw_with_p
     decorator2_kwargs = {'a': 55, 'c': '11', 'b': 22, 'd': '12'}
     another_func_kwargs = {'e': 1, 'f': '1'}
     mock_decorator1_calls = [mock.call(*decorator1_args,
-                                       **decorator1_kwargs)] * 2
+                                       **decorator1_kwargs)]
     mock_decorator2_calls = [mock.call(*decorator2_args,
-                                       **decorator2_kwargs)] * 2
+                                       **decorator2_kwargs)]
 
     def another_func(*args, **kwargs):
         another_func.kwargs = kwargs
@@ -215,7 +222,7 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_kw_with_p
     mock_decorator1.assert_has_calls(mock_decorator1_calls, any_order=True)
     mock_decorator2.assert_has_calls(mock_decorator2_calls, any_order=True)
 
-    assert mock_decorator1.call_count == 2
+    assert mock_decorator1.call_count == 1
     assert mock_wrapper1.call_count == 2
     assert another_func.args == (1, 2, '3')
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -233,9 +240,9 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_var_with_
     decorator2_args = (5, 13, 'a11', "33b")
     decorator2_kwargs = {'a': 55, 'c': '11', 'b': 22, 'd': '12'}
     mock_decorator1_calls = [mock.call(*decorator1_args,
-                                       **decorator1_kwargs)] * 2
+                                       **decorator1_kwargs)]
     mock_decorator2_calls = [mock.call(*decorator2_args,
-                                       **decorator2_kwargs)] * 2
+                                       **decorator2_kwargs)]
 
     def another_func(*args, **kwargs):
         another_func.kwargs = kwargs
@@ -259,7 +266,7 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_var_with_
     mock_decorator1.assert_has_calls(mock_decorator1_calls, any_order=True)
     mock_decorator2.assert_has_calls(mock_decorator2_calls, any_order=True)
 
-    assert mock_decorator1.call_count == 2
+    assert mock_decorator1.call_count == 1
     assert mock_wrapper1.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == {'a': 1, 'b': 2, 'c': '3'}
@@ -275,9 +282,9 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_var_kw_wi
     decorator2_args = (5, 13, 'a11', "33b")
     decorator2_kwargs = {'a': 55, 'c': '11', 'b': 22, 'd': '12'}
     mock_decorator1_calls = [mock.call(*decorator1_args,
-                                       **decorator1_kwargs)] * 2
+                                       **decorator1_kwargs)]
     mock_decorator2_calls = [mock.call(*decorator2_args,
-                                       **decorator2_kwargs)] * 2
+                                       **decorator2_kwargs)]
     another_func_args = (7, 4, '3')
     another_func_kwargs = {'e': 1, 'f': '1'}
 
@@ -304,7 +311,7 @@ def test_wrapping_function_twice_with_args_and_kwargs_on_call_function_var_kw_wi
     mock_decorator1.assert_has_calls(mock_decorator1_calls, any_order=True)
     mock_decorator2.assert_has_calls(mock_decorator2_calls, any_order=True)
 
-    assert mock_decorator1.call_count == 2
+    assert mock_decorator1.call_count == 1
     assert mock_wrapper1.call_count == 2
     assert another_func.args == (1, 2, '3') + another_func_args
     assert another_func.kwargs == dict({'a': 1, 'b': 2, 'c': '3'},
@@ -366,3 +373,166 @@ def test_wrapped_value_of_wrapped_method(mock_decorator1, mock_decorator2):
            ["mock_decorator1", "mock_decorator2"]
 
     assert func_after_two_decoration_list != method_after_decorating_list
+
+
+def logging_decorator(name, log):
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            log.append((name, func.__name__))
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    decorator.__name__ = name
+    return decorator
+
+
+def test_composing_decorators():
+    log = []
+    outer = logging_decorator("outer", log)
+    inner = logging_decorator("inner", log)
+
+    def another_func():
+        return 1
+
+    @compose(outer, inner)
+    def func_to_decorate():
+        return another_func()
+
+    assert func_to_decorate() == 1
+    assert log == [("outer", "wrapper"), ("inner", "func_to_decorate"),
+                   ("outer", "wrapper"), ("inner", "another_func")]
+    assert getattr(func_to_decorate, DECORATOR_LIST_FIELD_NAME) == \
+        ["inner", "outer"]
+
+
+def test_composed_decorators_transform_once(mock_decorator1,
+                                            mock_decorator2):
+    mock_decorator1.side_effect = lambda func: func
+    mock_decorator2.side_effect = lambda func: func
+
+    def another_func():
+        pass
+
+    def func_to_decorate():
+        another_func()
+
+    stacked = recursive_decorator(mock_decorator1)(
+        recursive_decorator(mock_decorator2)(func_to_decorate))
+    composed = compose(mock_decorator1, mock_decorator2)(func_to_decorate)
+
+    assert len(get_code_call_sites(stacked.__code__)) == 2
+    assert len(get_code_call_sites(composed.__code__)) == 1
+
+    composed()
+
+    assert mock_decorator1.call_count == 3
+    assert mock_decorator2.call_count == 3
+
+
+def test_stacking_decorator_of_composed_function(mock_decorator1,
+                                                 mock_decorator2):
+    mock_decorator1.side_effect = lambda func: func
+    mock_decorator2.side_effect = lambda func: func
+
+    def func_to_decorate():
+        pass
+
+    composed = compose(mock_decorator1, mock_decorator2)(func_to_decorate)
+
+    assert recursive_decorator(mock_decorator1)(composed) is composed
+    assert compose(mock_decorator2, mock_decorator1)(composed) is composed
+    assert mock_decorator1.call_count == 1
+
+
+def test_composing_no_decorators():
+    with pytest.raises(TypeError):
+        compose()
+
+
+def test_decorating_with_same_named_decorators():
+    log = []
+    first = logging_decorator("wrapper", log)
+    second = logging_decorator("wrapper", log)
+
+    def func_to_decorate():
+        return 1
+
+    decorated = recursive_decorator(first)(func_to_decorate)
+    twice_decorated = recursive_decorator(second)(decorated)
+
+    assert twice_decorated is not decorated
+    assert recursive_decorator(first)(twice_decorated) is twice_decorated
+    assert twice_decorated() == 1
+    assert log[0] == ("wrapper", "wrapper")
+    assert is_wrapped(twice_decorated, first) and \
+        is_wrapped(twice_decorated, second)
+    assert not is_wrapped(func_to_decorate, first)
+
+
+def test_decorating_with_bound_method_decorator():
+    class Decorators(object):
+        def identity(self, func):
+            return func
+
+    instance = Decorators()
+
+    def func_to_decorate():
+        pass
+
+    decorated = recursive_decorator(instance.identity)(func_to_decorate)
+
+    assert is_wrapped(decorated, instance.identity)
+    assert not is_wrapped(decorated, Decorators().identity)
+
+
+def test_bit_of_collected_decorator_is_given_again():
+    def decorator(func):
+        return func
+
+    # Free the bits of decorators collected by previous tests first
+    while gc.collect():
+        pass
+
+    bit = get_decorator_bit(decorator)
+    identity = _decorator_identity(decorator)
+    assert _decorator_bits[identity][0] == bit
+
+    del decorator
+    gc.collect()
+
+    assert identity not in _decorator_bits
+    assert get_decorator_bit(lambda func: func) == bit
+
+
+def test_decorated_function_keeps_its_decorator_bit():
+    def decorator(func):
+        return func
+
+    def func_to_decorate():
+        return 1
+
+    decorated = recursive_decorator(decorator)(func_to_decorate)
+    decorator_ref = weakref.ref(decorator)
+
+    del decorator
+    transform_cache.clear()
+    gc.collect()
+
+    assert decorator_ref() is not None
+    assert is_wrapped(decorated, decorator_ref())
+    assert not is_wrapped(decorated, lambda func: func)
+
+
+def test_masks_of_transient_decorators_stay_short():
+    def func_to_decorate():
+        return 1
+
+    for _ in range(1000):
+        recursive_decorator(lambda func: func)(func_to_decorate)
+
+    transform_cache.clear()
+    gc.collect()
+    decorated = recursive_decorator(lambda func: func)(func_to_decorate)
+
+    assert get_function_wrapped_mask(decorated).bit_length() < 100
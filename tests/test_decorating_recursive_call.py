@@ -50,5 +50,5 @@ def test_apply_decorator_on_function_with_recursive_sub_call(mock_decorator1):
     func_to_decorate()
 
     assert another_func.call_count == 5
-    assert mock_decorator1.call_count == 6
+    assert mock_decorator1.call_count == 3
     assert func_to_decorate.has_been_called is True
@@ -0,0 +1,106 @@
+"""Validating the decoration switch of the running context."""
+import threading
+
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.decoration_switch import decoration_switch, \
+    ContextVar
+
+
+@pytest.fixture()
+def calls():
+    return []
+
+
+@pytest.fixture()
+def logging_decorator(calls):
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+@pytest.fixture()
+def disabled_by_default():
+    decoration_switch.set_default(False)
+    yield
+    decoration_switch.set_default(True)
+
+
+def leaf(value):
+    return value + 1
+
+
+def node(value):
+    return leaf(value) * 2
+
+
+def test_disabling_decoration(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator)(node)
+
+    with decoration_switch.disabled():
+        assert decorated(1) == 4
+        assert not decoration_switch.is_enabled()
+
+    assert calls == ["node"]
+    assert decorated(1) == 4
+    assert calls == ["node", "node", "leaf"]
+
+
+def test_enabling_decoration(calls, logging_decorator, disabled_by_default):
+    decorated = recursive_decorator(logging_decorator)(node)
+
+    assert decorated(1) == 4
+    with decoration_switch.enabled():
+        assert decorated(1) == 4
+
+    assert calls == ["node", "node", "leaf"]
+
+
+def test_decoration_switch_of_threads(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator)(node)
+    disabled = threading.Event()
+    called = threading.Event()
+
+    def run_disabled():
+        with decoration_switch.disabled():
+            disabled.set()
+            called.wait()
+
+    thread = threading.Thread(target=run_disabled)
+    thread.start()
+    disabled.wait()
+    assert decorated(1) == 4
+    called.set()
+    thread.join()
+
+    assert calls == ["node", "leaf"]
+
+
+@pytest.mark.skipif(ContextVar is None, reason="contextvars since 3.7")
+def test_decoration_switch_of_tasks(calls, logging_decorator):
+    import asyncio
+
+    decorated = recursive_decorator(logging_decorator)(node)
+
+    async def call(enabled):
+        with decoration_switch.enabled(enabled):
+            await asyncio.sleep(0)
+            return decorated(1)
+
+    async def call_together():
+        return await asyncio.gather(call(False), call(True), call(False))
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(call_together()) == [4, 4, 4]
+
+    finally:
+        loop.close()
+
+    assert calls == ["node", "node", "leaf", "node"]
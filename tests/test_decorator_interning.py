@@ -0,0 +1,90 @@
+"""Validating recursive_decorator is created once per decorator args."""
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+
+    return decorator
+
+
+@pytest.fixture()
+def mock_wrapper():
+    # Set mocking decorator
+    wrapper = mock.MagicMock()
+    wrapper.__name__ = 'wrapper'
+    # Identity function
+    wrapper.side_effect = lambda func: func
+
+    return wrapper
+
+
+def test_same_decorator_for_same_args(mock_decorator):
+    assert recursive_decorator(mock_decorator, 1, a=2) is \
+        recursive_decorator(mock_decorator, 1, a=2)
+
+
+def test_another_decorator_for_another_args(mock_decorator):
+    assert recursive_decorator(mock_decorator, 1, a=2) is not \
+        recursive_decorator(mock_decorator, 1, a=3)
+
+
+def test_same_decorator_for_same_unhashable_args(mock_decorator):
+    args = [1, 2]
+    kwargs = {'a': 1}
+
+    assert recursive_decorator(mock_decorator, args, kwargs=kwargs) is \
+        recursive_decorator(mock_decorator, args, kwargs=kwargs)
+
+
+def test_another_decorator_for_equal_unhashable_args(mock_decorator):
+    assert recursive_decorator(mock_decorator, [1, 2]) is not \
+        recursive_decorator(mock_decorator, [1, 2])
+
+
+def test_decorator_factory_called_once(mock_decorator, mock_wrapper):
+    mock_decorator.return_value = mock_wrapper
+
+    def first_func():
+        pass
+
+    def second_func():
+        pass
+
+    @recursive_decorator(mock_decorator, 1, a=2)
+    def func_to_decorate():
+        first_func()
+        second_func()
+
+    func_to_decorate()
+    recursive_decorator(mock_decorator, 1, a=2)(second_func)
+
+    mock_decorator.assert_called_once_with(1, a=2)
+    assert mock_wrapper.call_count == 4
+
+
+def test_another_decorator_for_equal_args_of_another_type(mock_decorator):
+    decorators = [recursive_decorator(mock_decorator, threshold=1),
+                  recursive_decorator(mock_decorator, threshold=True),
+                  recursive_decorator(mock_decorator, threshold=1.0)]
+
+    assert len(set(map(id, decorators))) == 3
+
+
+def test_decorator_factory_called_with_args_of_each_type(mock_decorator,
+                                                         mock_wrapper):
+    mock_decorator.return_value = mock_wrapper
+
+    def func():
+        pass
+
+    recursive_decorator(mock_decorator, 1)(func)
+    recursive_decorator(mock_decorator, True)(func)
+
+    assert [type(call[0][0]) for call in mock_decorator.call_args_list] == \
+        [int, bool]
@@ -0,0 +1,203 @@
+"""Validating transformed code is persisted in the disk cache."""
+import os
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.call_site import get_code_call_sites
+from recursive_decorator.disk_cache import disk_cache, DiskCache
+from recursive_decorator.elision import call_site_elision
+from recursive_decorator.transform_cache import transform_cache
+from recursive_decorator.backend import get_transformer_class
+
+
+def identity_decorator(func):
+    return func
+
+
+def another_func(*args, **kwargs):
+    another_func.args = args
+    another_func.kwargs = kwargs
+
+
+def func_to_decorate(x, *args, k=1, **kwargs):
+    another_func(x, *args, k=k, **kwargs)
+    return x
+
+
+@pytest.fixture()
+def cache_directory(tmpdir):
+    disk_cache.configure(str(tmpdir))
+    transform_cache.clear()
+    yield str(tmpdir)
+
+    disk_cache.configure(None)
+    transform_cache.clear()
+
+
+@pytest.fixture()
+def transform_spy():
+    transformer_class = get_transformer_class()
+    with mock.patch.object(transformer_class, "transform", autospec=True,
+                           side_effect=transformer_class.transform) \
+            as transform:
+        yield transform
+
+
+def test_loading_transformed_code_from_disk(cache_directory, transform_spy):
+    recursive_decorator(identity_decorator)(func_to_decorate)
+    assert len(os.listdir(cache_directory)) == 1
+    transform_calls = transform_spy.call_count
+
+    # Simulate new process
+    transform_cache.clear()
+
+    decorated = recursive_decorator(identity_decorator)(func_to_decorate)
+
+    assert transform_spy.call_count == transform_calls
+    assert decorated(1, 2, k=3, a=4) == 1
+    assert another_func.args == (1, 2)
+    assert another_func.kwargs == {'k': 3, 'a': 4}
+
+
+def test_loaded_code_has_new_call_sites(cache_directory):
+    stored = recursive_decorator(identity_decorator)(func_to_decorate)
+
+    transform_cache.clear()
+    loaded = recursive_decorator(identity_decorator)(func_to_decorate)
+
+    stored_sites = get_code_call_sites(stored.__code__)
+    loaded_sites = get_code_call_sites(loaded.__code__)
+    assert len(stored_sites) == 1
+    assert len(loaded_sites) == 1
+    assert stored_sites[0] is not loaded_sites[0]
+    assert (loaded_sites[0].location, loaded_sites[0].static_callee) == \
+        (stored_sites[0].location, stored_sites[0].static_callee)
+
+
+def test_ignoring_cache_file_of_another_version(cache_directory,
+                                                transform_spy):
+    recursive_decorator(identity_decorator)(func_to_decorate)
+    transform_calls = transform_spy.call_count
+    transform_cache.clear()
+
+    with mock.patch.object(DiskCache, "FORMAT_VERSION",
+                           DiskCache.FORMAT_VERSION + 1):
+        decorated = recursive_decorator(identity_decorator)(func_to_decorate)
+
+    assert transform_spy.call_count > transform_calls
+    assert decorated(1) == 1
+
+
+def test_ignoring_corrupted_cache_file(cache_directory, transform_spy):
+    recursive_decorator(identity_decorator)(func_to_decorate)
+    transform_calls = transform_spy.call_count
+    transform_cache.clear()
+
+    cache_file, = os.listdir(cache_directory)
+    with open(os.path.join(cache_directory, cache_file), "wb") as corrupted:
+        corrupted.write(b"corrupted")
+
+    decorated = recursive_decorator(identity_decorator)(func_to_decorate)
+
+    assert transform_spy.call_count > transform_calls
+    assert decorated(1) == 1
+
+
+def test_not_leaving_temporary_files(cache_directory):
+    recursive_decorator(identity_decorator)(func_to_decorate)
+    recursive_decorator(identity_decorator)(another_func)
+
+    assert all(name.endswith(".rdc") for name in os.listdir(cache_directory))
+
+
+def test_disabled_cache_does_not_write(tmpdir):
+    transform_cache.clear()
+    recursive_decorator(identity_decorator)(func_to_decorate)
+
+    assert os.listdir(str(tmpdir)) == []
+
+
+def func_calling_builtins(values):
+    return len(values), abs(values[0])
+
+
+def test_loading_code_of_elided_call_sites(cache_directory, transform_spy):
+    stored = recursive_decorator(identity_decorator)(func_calling_builtins)
+    assert len(os.listdir(cache_directory)) == 1
+    transform_calls = transform_spy.call_count
+
+    transform_cache.clear()
+    loaded = recursive_decorator(identity_decorator)(func_calling_builtins)
+
+    assert transform_spy.call_count == transform_calls
+    assert loaded([-2]) == stored([-2]) == (1, 2)
+    assert len in loaded.__code__.co_consts
+
+
+def test_ignoring_code_of_another_elision_policy(cache_directory,
+                                                 transform_spy):
+    recursive_decorator(identity_decorator)(func_calling_builtins)
+    transform_calls = transform_spy.call_count
+
+    transform_cache.clear()
+    call_site_elision.configure(elide_builtins=False)
+    try:
+        decorated = recursive_decorator(identity_decorator)(
+            func_calling_builtins)
+
+    finally:
+        call_site_elision.configure(elide_builtins=True)
+
+    assert transform_spy.call_count > transform_calls
+    assert len(os.listdir(cache_directory)) == 2
+    assert len not in decorated.__code__.co_consts
+    assert decorated([-2]) == (1, 2)
+
+
+def func_with_nested_function(x):
+    def nested_function():
+        another_func(x)
+
+    nested_function()
+    return x
+
+
+def test_warm_restart_stores_nothing_new(cache_directory, transform_spy):
+    assert recursive_decorator(identity_decorator)(
+        func_with_nested_function)(1) == 1
+    stores = disk_cache.stores
+    cache_files = sorted(os.listdir(cache_directory))
+    transform_calls = transform_spy.call_count
+
+    transform_cache.clear()
+    assert recursive_decorator(identity_decorator)(
+        func_with_nested_function)(1) == 1
+
+    assert disk_cache.stores == stores
+    assert sorted(os.listdir(cache_directory)) == cache_files
+    assert transform_spy.call_count == transform_calls
+
+
+def test_loaded_code_keeps_decorators_of_its_call_sites(cache_directory):
+    called = []
+
+    def outer_decorator(func):
+        called.append(("outer", func.__name__))
+        return func
+
+    def inner_decorator(func):
+        called.append(("inner", func.__name__))
+        return func
+
+    inner = recursive_decorator(inner_decorator)(func_to_decorate)
+    recursive_decorator(outer_decorator)(inner)
+
+    transform_cache.clear()
+    inner = recursive_decorator(inner_decorator)(func_to_decorate)
+    del called[:]
+    recursive_decorator(outer_decorator)(inner)(1)
+
+    assert ("inner", "another_func") in called
+    assert ("outer", "another_func") in called
@@ -0,0 +1,93 @@
+"""Validating eager decorating of static sub functions."""
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+    decorator.side_effect = lambda func: func
+
+    return decorator
+
+
+def decorated_names(mock_decorator):
+    return [call[0][0].__name__ for call in mock_decorator.call_args_list]
+
+
+def first_func():
+    return second_func() + 1
+
+
+def second_func():
+    return third_func() + 1
+
+
+def third_func():
+    return fourth_func() + 1
+
+
+def fourth_func():
+    return 1
+
+
+def ping(count):
+    return pong(count - 1) if count else 0
+
+
+def pong(count):
+    return ping(count - 1) + 1 if count else 0
+
+
+class Helper(object):
+    @staticmethod
+    def static_func():
+        return fourth_func()
+
+
+def func_with_attribute_call():
+    return Helper.static_func()
+
+
+def test_eager_decorating_before_first_call(mock_decorator):
+    decorated = recursive_decorator(mock_decorator, eager=True)(first_func)
+
+    assert decorated_names(mock_decorator) == ["first_func", "second_func",
+                                               "third_func", "fourth_func"]
+
+    assert decorated() == 4
+    assert mock_decorator.call_count == 4
+
+
+def test_eager_decorating_depth(mock_decorator):
+    recursive_decorator(mock_decorator, eager=2)(first_func)
+
+    assert decorated_names(mock_decorator) == ["first_func", "second_func",
+                                               "third_func"]
+
+
+def test_eager_decorating_recursive_functions(mock_decorator):
+    decorated = recursive_decorator(mock_decorator, eager=True)(ping)
+
+    assert decorated_names(mock_decorator) == ["ping", "pong", "ping"]
+
+    assert decorated(6) == 3
+    assert mock_decorator.call_count == 3
+
+
+def test_eager_decorating_attribute_callee(mock_decorator):
+    recursive_decorator(mock_decorator, eager=True)(func_with_attribute_call)
+
+    assert decorated_names(mock_decorator) == ["func_with_attribute_call",
+                                               "static_func", "fourth_func"]
+
+
+def test_eager_decorator_is_interned_separately(mock_decorator):
+    assert recursive_decorator(mock_decorator, eager=True) is \
+        recursive_decorator(mock_decorator, eager=True)
+
+    assert recursive_decorator(mock_decorator, eager=True) is not \
+        recursive_decorator(mock_decorator)
@@ -0,0 +1,166 @@
+"""Validating hooks injected into the bytecode of sub functions."""
+import sys
+
+import pytest
+
+from recursive_decorator.hooks import recursive_hooks, HooksDecorator
+
+
+@pytest.fixture()
+def events():
+    return []
+
+
+def hooks(events):
+    def on_enter(code, frame_args):
+        events.append(("enter", code.co_name, frame_args))
+
+    def on_exit(code, result):
+        events.append(("exit", code.co_name, result))
+
+    return {"on_enter": on_enter, "on_exit": on_exit}
+
+
+def leaf(value, *args, key=None, **kwargs):
+    return value * 2
+
+
+def raising():
+    raise ValueError()
+
+
+def generator(count):
+    for value in range(count):
+        yield leaf(value)
+
+
+def caller_name():
+    return sys._getframe(1).f_code.co_name
+
+
+def test_reporting_sub_functions(events):
+    @recursive_hooks(**hooks(events))
+    def func_to_decorate(value):
+        return leaf(value, 1, key=2, other=3)
+
+    assert func_to_decorate(5) == 10
+    assert events == [("enter", "func_to_decorate", (5,)),
+                      ("enter", "leaf", (5, 2, (1,), {"other": 3})),
+                      ("exit", "leaf", 10),
+                      ("exit", "func_to_decorate", 10)]
+
+
+def test_reporting_raising_functions_and_generators(events):
+    @recursive_hooks(**hooks(events))
+    def func_to_decorate():
+        try:
+            raising()
+
+        except ValueError:
+            pass
+
+        return sum(generator(2))
+
+    assert func_to_decorate() == 2
+    assert [event[:2] for event in events] == [
+        ("enter", "func_to_decorate"),
+        ("enter", "raising"), ("exit", "raising"),
+        ("enter", "generator"),
+        ("enter", "leaf"), ("exit", "leaf"),
+        ("enter", "leaf"), ("exit", "leaf"),
+        ("exit", "generator"),
+        ("exit", "func_to_decorate")]
+    assert events[2] == ("exit", "raising", None)
+
+
+def test_instrumented_functions_add_no_frame(events):
+    @recursive_hooks(**hooks(events))
+    def func_to_decorate():
+        return caller_name()
+
+    assert func_to_decorate() == "func_to_decorate"
+    assert events[-1] == ("exit", "func_to_decorate", "func_to_decorate")
+
+
+def test_returns_from_blocks(events):
+    @recursive_hooks(**hooks(events))
+    def func_to_decorate(values):
+        for value in values:
+            try:
+                if value:
+                    return leaf(value)
+
+            finally:
+                events.append(("finally", value))
+
+        return None
+
+    assert func_to_decorate([0, 3]) == 6
+    assert func_to_decorate([]) is None
+    assert [event for event in events if event[1] != "leaf"] == [
+        ("enter", "func_to_decorate", ([0, 3],)),
+        ("finally", 0), ("finally", 3),
+        ("exit", "func_to_decorate", 6),
+        ("enter", "func_to_decorate", ([],)),
+        ("exit", "func_to_decorate", None)]
+
+
+def test_arguments_of_closures(events):
+    @recursive_hooks(**hooks(events))
+    def func_to_decorate(value, *, key=4):
+        def closure():
+            return value + key
+
+        return closure()
+
+    assert func_to_decorate(1) == 5
+    assert events == [("enter", "func_to_decorate", (1, 4)),
+                      ("enter", "closure", ()),
+                      ("exit", "closure", 5),
+                      ("exit", "func_to_decorate", 5)]
+
+
+def test_single_hook(events):
+    on_exit = hooks(events)["on_exit"]
+
+    @recursive_hooks(on_exit=on_exit)
+    def func_to_decorate(value):
+        if value:
+            raising()
+
+        return leaf(value)
+
+    assert func_to_decorate(0) == 0
+    with pytest.raises(ValueError):
+        func_to_decorate(1)
+
+    assert events == [("exit", "leaf", 0),
+                      ("exit", "func_to_decorate", 0),
+                      ("exit", "raising", None),
+                      ("exit", "func_to_decorate", None)]
+
+
+def test_hooks_injected_once_per_code(events):
+    decorator = HooksDecorator(**hooks(events))
+
+    first, second = decorator(leaf), decorator(leaf)
+
+    assert first is not second
+    assert first.__code__ is second.__code__
+    assert first.__kwdefaults__ == {"key": None}
+    assert list(decorator.codes) == [id(leaf.__code__)]
+
+
+def test_hooks_receive_original_code():
+    codes = []
+
+    def func_to_decorate():
+        return leaf(1)
+
+    decorated = recursive_hooks(on_enter=lambda code, args: codes.append(
+        code))(func_to_decorate)
+
+    assert decorated() == 2
+    first, second = codes
+    assert first is func_to_decorate.__code__
+    assert second is leaf.__code__
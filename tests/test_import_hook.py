@@ -0,0 +1,127 @@
+"""Validating recursive_decorator import hook decorates imported modules."""
+import sys
+import textwrap
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.import_hook import install_import_hook, \
+    match_module
+
+PACKAGE_NAME = "hooked_package"
+
+MODULE_SOURCE = textwrap.dedent("""
+    from os.path import join
+
+
+    def helper():
+        return "helper"
+
+
+    def function():
+        return helper()
+
+
+    class A(object):
+        def method(self):
+            return helper()
+
+        @staticmethod
+        def static_method():
+            return helper()
+
+        @classmethod
+        def class_method(cls):
+            return helper()
+""")
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+    decorator.side_effect = lambda func: func
+
+    return decorator
+
+
+@pytest.fixture()
+def package(tmpdir):
+    package_directory = tmpdir.mkdir(PACKAGE_NAME)
+    package_directory.join("__init__.py").write("")
+    package_directory.join("module.py").write(MODULE_SOURCE)
+    package_directory.join("excluded.py").write(MODULE_SOURCE)
+
+    sys.path.insert(0, str(tmpdir))
+    yield PACKAGE_NAME
+
+    sys.path.remove(str(tmpdir))
+    for module_name in list(sys.modules):
+        if match_module(module_name, [PACKAGE_NAME]):
+            del sys.modules[module_name]
+
+
+@pytest.fixture()
+def hook(mock_decorator, package):
+    hook = install_import_hook(recursive_decorator(mock_decorator),
+                               include=[package],
+                               exclude=[package + ".excluded"])
+    yield hook
+
+    hook.uninstall()
+
+
+def decorated_names(mock_decorator):
+    return [call[0][0].__name__ for call in mock_decorator.call_args_list]
+
+
+def test_decorating_module_functions_on_import(mock_decorator, hook):
+    from hooked_package import module
+
+    assert sorted(decorated_names(mock_decorator)) == \
+        ["class_method", "function", "helper", "method", "static_method"]
+
+    assert module.function() == "helper"
+    assert module.A().method() == "helper"
+    assert module.A.static_method() == "helper"
+    assert module.A.class_method() == "helper"
+
+    # Sub calls are resolved to the already decorated helper
+    assert mock_decorator.call_count == 5
+
+
+def test_not_decorating_imported_functions(mock_decorator, hook):
+    from os.path import join
+    from hooked_package import module
+
+    assert module.join is join
+
+
+def test_not_decorating_excluded_module(mock_decorator, hook):
+    from hooked_package import excluded
+
+    excluded.function()
+
+    mock_decorator.assert_not_called()
+
+
+def test_not_decorating_after_uninstall(mock_decorator, hook):
+    hook.uninstall()
+
+    from hooked_package import module
+
+    module.function()
+
+    mock_decorator.assert_not_called()
+
+
+@pytest.mark.parametrize("module_name, patterns, expected", [
+    ("package", ["package"], True),
+    ("package.module", ["package"], True),
+    ("package_other", ["package"], False),
+    ("package.module", ["package.mod*"], True),
+    ("other.package", ["package"], False),
+])
+def test_matching_module(module_name, patterns, expected):
+    assert match_module(module_name, patterns) is expected
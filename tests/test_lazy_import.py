@@ -0,0 +1,35 @@
+"""Validating the rewriting engine is imported on the first decoration."""
+import json
+import subprocess
+import sys
+
+from recursive_decorator.backend import BACKENDS, backend_name
+
+IMPORTED_MODULES_SCRIPT = """\
+import json
+import sys
+
+import recursive_decorator
+imported = set(sys.modules)
+
+recursive_decorator.recursive_decorator(lambda func: func)(lambda: None)()
+print(json.dumps([sorted(imported), sorted(sys.modules)]))
+"""
+
+# Until 3.8 the cached_property package imports inspect and asyncio
+LAZY_MODULES = ("cached_property", "inspect", "hashlib", "tempfile")
+
+
+def test_engine_imported_on_first_decoration():
+    output = subprocess.run([sys.executable, "-c", IMPORTED_MODULES_SCRIPT],
+                            stdout=subprocess.PIPE,
+                            universal_newlines=True,
+                            check=True).stdout
+    imported, decorated = map(set, json.loads(output))
+    backend_module = BACKENDS[backend_name][0]
+
+    assert backend_module not in imported
+    assert backend_module in decorated
+    assert "codetransformer" not in imported
+    if sys.version_info >= (3, 8):
+        assert not imported.intersection(LAZY_MODULES)
@@ -0,0 +1,146 @@
+"""Validating recursive_decorator doesn't keep decorated objects alive."""
+import gc
+import tracemalloc
+import weakref
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.call_site import get_call_sites
+from recursive_decorator.transform_cache import transform_cache
+
+CLOSURES_COUNT = 100000
+MEMORY_GROWTH_LIMIT = 256 * 1024
+
+
+def identity_decorator(func):
+    return func
+
+
+def make_closure(value):
+    def helper():
+        return value
+
+    def closure():
+        return helper()
+
+    return closure
+
+
+def decorate_and_call_closures(count):
+    for value in range(count):
+        assert recursive_decorator(identity_decorator)(
+            make_closure(value))() == value
+
+
+def test_memory_returns_to_baseline_after_transient_closures():
+    decorate_and_call_closures(10)
+    gc.collect()
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        decorate_and_call_closures(CLOSURES_COUNT)
+        gc.collect()
+        current, _ = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    assert current - baseline < MEMORY_GROWTH_LIMIT
+
+    # Call sites are collected with the code of the closures
+    helper_sites = [site for site in get_call_sites()
+                    if site.decorate.__wrapped__ is identity_decorator and
+                    "(closure)" in site.location]
+    assert not helper_sites
+
+
+def test_call_site_forgets_collected_callee():
+    closure = make_closure(1)
+    helper_ref = weakref.ref(closure.__closure__[0].cell_contents)
+    decorated = recursive_decorator(identity_decorator)(closure)
+
+    assert decorated() == 1
+    del closure, decorated
+    gc.collect()
+
+    assert helper_ref() is None
+
+
+def test_transform_cache_forgets_collected_code():
+    namespace = {}
+    exec("def func():\n    return len([])", globals(), namespace)
+    func = namespace.pop("func")
+    code_ref = weakref.ref(func.__code__)
+    code_id = id(func.__code__)
+
+    recursive_decorator(identity_decorator)(func)()
+    assert any(key == code_id for key in transform_cache.entries)
+
+    del func
+    gc.collect()
+
+    assert code_ref() is None
+    assert not any(key == code_id for key in transform_cache.entries)
+
+
+def callee():
+    return 1
+
+
+def func_to_decorate():
+    return callee()
+
+
+def test_transient_decorators_are_collected():
+    decorator_refs = []
+    for _ in range(100):
+        def decorator(func):
+            return func
+
+        decorator_refs.append(weakref.ref(decorator))
+        assert recursive_decorator(decorator)(func_to_decorate)() == 1
+
+    del decorator
+    gc.collect()
+
+    assert all(decorator_ref() is None for decorator_ref in decorator_refs)
+
+
+def test_transient_decorator_args_are_collected():
+    class Context(object):
+        pass
+
+    def decorator_factory(context):
+        def decorator(func):
+            return func
+
+        return decorator
+
+    context_refs = []
+    for _ in range(100):
+        context = Context()
+        context_refs.append(weakref.ref(context))
+        assert recursive_decorator(decorator_factory, context)(
+            func_to_decorate)() == 1
+
+    del context
+    gc.collect()
+
+    assert all(context_ref() is None for context_ref in context_refs)
+
+
+def test_decorated_method_does_not_keep_instance_alive():
+    class A(object):
+        def method(self):
+            return self
+
+    instance = A()
+    instance_ref = weakref.ref(instance)
+
+    decorated = recursive_decorator(identity_decorator)(instance.method)
+    assert decorated() is instance
+
+    del instance, decorated
+    gc.collect()
+
+    assert instance_ref() is None
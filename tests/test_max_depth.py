@@ -0,0 +1,114 @@
+"""Validating decorating sub functions up to a depth of calls."""
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.hooks import recursive_hooks
+
+
+@pytest.fixture()
+def calls():
+    return []
+
+
+@pytest.fixture()
+def decorations():
+    return []
+
+
+@pytest.fixture()
+def logging_decorator(calls, decorations):
+    def decorator(func):
+        decorations.append(func.__name__)
+
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def third(value):
+    return value + 1
+
+
+def second(value):
+    return third(value) * 2
+
+
+def first(value):
+    return second(value) + third(value)
+
+
+def countdown(value):
+    if value:
+        return countdown(value - 1)
+
+    return value
+
+
+def test_decorating_up_to_max_depth(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator, max_depth=1)(first)
+
+    assert decorated(1) == 6
+    assert calls == ["first", "second", "third"]
+
+
+def test_decorating_only_function(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator, max_depth=0)(first)
+
+    assert decorated(1) == 6
+    assert calls == ["first"]
+
+
+def test_decorating_recursive_calls_up_to_max_depth(calls,
+                                                    logging_decorator):
+    decorated = recursive_decorator(logging_decorator,
+                                    max_depth=2)(countdown)
+
+    assert decorated(5) == 0
+    assert calls == ["countdown"] * 3
+
+
+def test_decorating_ahead_up_to_max_depth(decorations, logging_decorator):
+    recursive_decorator(logging_decorator, eager=True, max_depth=1)(first)
+
+    assert sorted(decorations) == ["first", "second", "third"]
+
+
+def test_unlimited_and_limited_decorators(calls, logging_decorator):
+    limited = recursive_decorator(logging_decorator, max_depth=1)
+    unlimited = recursive_decorator(logging_decorator)
+
+    assert limited is not unlimited
+    assert unlimited(first)(1) == 6
+    assert calls == ["first", "second", "third", "third"]
+
+    del calls[:]
+    assert limited(first)(1) == 6
+    assert calls == ["first", "second", "third"]
+
+
+def test_decorators_of_different_max_depth(calls, logging_decorator):
+    deep = recursive_decorator(logging_decorator, max_depth=5)
+    shallow = recursive_decorator(logging_decorator, max_depth=1)
+
+    assert deep(first)(1) == 6
+    assert calls == ["first", "second", "third", "third"]
+
+    del calls[:]
+    assert shallow(first)(1) == 6
+    assert calls == ["first", "second", "third"]
+
+
+def test_hooks_up_to_max_depth():
+    events = []
+
+    @recursive_hooks(on_enter=lambda code, args: events.append(code.co_name),
+                     max_depth=1)
+    def func_to_decorate():
+        return first(1)
+
+    assert func_to_decorate() == 6
+    assert events == ["func_to_decorate", "first"]
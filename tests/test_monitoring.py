@@ -0,0 +1,154 @@
+"""Validating the sys.monitoring engine reports sub functions to hooks."""
+import sys
+import threading
+
+import pytest
+
+from recursive_decorator.monitoring import MONITORING_AVAILABLE, \
+    monitoring_engine, recursive_monitor
+
+pytestmark = pytest.mark.skipif(not MONITORING_AVAILABLE,
+                                reason="sys.monitoring requires Python 3.12")
+
+
+@pytest.fixture()
+def events():
+    events = []
+    yield events
+    monitoring_engine.reset()
+
+
+def hooks(events):
+    def on_enter(code, frame_args):
+        events.append(("enter", code.co_name, frame_args))
+
+    def on_exit(code, result):
+        events.append(("exit", code.co_name, result))
+
+    return {"on_enter": on_enter, "on_exit": on_exit}
+
+
+def leaf(value, *args, key=None, **kwargs):
+    return value * 2
+
+
+def raising():
+    raise ValueError()
+
+
+def generator(count):
+    for value in range(count):
+        yield leaf(value)
+
+
+def test_reporting_sub_functions(events):
+    @recursive_monitor(**hooks(events))
+    def func_to_monitor(value):
+        return leaf(value, 1, key=2, other=3)
+
+    assert func_to_monitor(5) == 10
+    assert events == [("enter", "func_to_monitor", (5,)),
+                      ("enter", "leaf", (5, 2, (1,), {"other": 3})),
+                      ("exit", "leaf", 10),
+                      ("exit", "func_to_monitor", 10)]
+
+    assert monitoring_engine.active_calls == 0
+    assert sys.monitoring.get_events(monitoring_engine.tool_id) == 0
+
+
+def test_reporting_raising_functions_and_generators(events):
+    @recursive_monitor(**hooks(events))
+    def func_to_monitor():
+        try:
+            raising()
+
+        except ValueError:
+            pass
+
+        return sum(generator(2))
+
+    assert func_to_monitor() == 2
+    assert [event[:2] for event in events] == [
+        ("enter", "func_to_monitor"),
+        ("enter", "raising"), ("exit", "raising"),
+        ("enter", "generator"),
+        ("enter", "leaf"), ("exit", "leaf"),
+        ("enter", "leaf"), ("exit", "leaf"),
+        ("exit", "generator"),
+        ("exit", "func_to_monitor")]
+
+
+def test_disabling_code_from_hook(events):
+    def on_enter(code, frame_args):
+        events.append(code.co_name)
+        if code is leaf.__code__:
+            return sys.monitoring.DISABLE
+
+    @recursive_monitor(on_enter=on_enter)
+    def func_to_monitor():
+        leaf(1)
+        leaf(2)
+
+    func_to_monitor()
+    func_to_monitor()
+    assert events == ["func_to_monitor", "leaf", "func_to_monitor"]
+
+    monitoring_engine.reset()
+    func_to_monitor()
+    assert events[3:] == ["func_to_monitor", "leaf"]
+
+
+def test_not_reporting_other_threads(events):
+    @recursive_monitor(**hooks(events))
+    def func_to_monitor():
+        thread = threading.Thread(target=leaf, args=(1,))
+        thread.start()
+        thread.join()
+
+    func_to_monitor()
+
+    assert "leaf" not in [event[1] for event in events]
+
+
+def factorial(value):
+    return 1 if value <= 1 else value * factorial(value - 1)
+
+
+def test_reporting_recursive_monitored_function_once_per_call(events):
+    global factorial
+    original_factorial = factorial
+    factorial = recursive_monitor(**hooks(events))(factorial)
+    try:
+        assert factorial(4) == 24
+
+    finally:
+        factorial = original_factorial
+
+    assert [event[:2] for event in events] == \
+        [("enter", "factorial")] * 4 + [("exit", "factorial")] * 4
+    assert monitoring_engine.active_calls == 0
+
+
+def test_reporting_sub_functions_of_recursive_calls_once(events):
+    @recursive_monitor(**hooks(events))
+    def func_to_monitor(count):
+        leaf(count)
+        if count:
+            func_to_monitor(count - 1)
+
+    func_to_monitor(2)
+
+    assert [event[1] for event in events].count("leaf") == 2 * 3
+
+
+def test_not_reporting_engine_code(events):
+    @recursive_monitor(**hooks(events))
+    def outer():
+        return inner()
+
+    @recursive_monitor(**hooks(events))
+    def inner():
+        return leaf(1)
+
+    assert outer() == 2
+    assert {event[1] for event in events} == {"outer", "inner", "leaf"}
@@ -0,0 +1,128 @@
+"""Validating the native backend rewrites calls without codetransformer."""
+import sys
+import traceback
+from types import ModuleType
+
+import mock
+import pytest
+
+from recursive_decorator import backend
+from recursive_decorator.backend import default_backend, \
+    get_transformer_class, NATIVE_BACKEND
+from recursive_decorator.native_transformer import NativeCallTransformer, \
+    disassemble, assemble
+
+MODULE = sys.modules[__name__]
+
+
+@pytest.fixture()
+def mock_decorate():
+    decorate = mock.MagicMock()
+    decorate.__name__ = 'mock_decorate'
+    decorate.side_effect = lambda func: func
+
+    return decorate
+
+
+def another_func(*args, **kwargs):
+    return args, kwargs
+
+
+def raising_func():
+    raise ValueError()
+
+
+class Base(object):
+    def method(self, value, key=None):
+        return value, key
+
+
+class Derived(Base):
+    def method(self, value, key=None):
+        return super().method(value, key=key)
+
+
+def test_native_backend_is_default_since_3_8():
+    if (3, 8) <= sys.version_info[:2] <= (3, 12):
+        assert default_backend() == NATIVE_BACKEND
+
+
+def test_no_default_backend_after_3_12():
+    with mock.patch.object(backend.sys, "version_info", (3, 13, 0)):
+        assert default_backend() is None
+
+
+def test_unsupported_interpreter_raises_import_error():
+    with mock.patch.object(backend, "backend_name", None):
+        with pytest.raises(ImportError, match="last supported version"):
+            get_transformer_class()
+
+
+def test_transforming_code_with_long_jumps(mock_decorate):
+    source = "def func(values):\n" \
+             "    for value in values:\n" \
+             "        try:\n" \
+             "            another_func()\n" + \
+             "            value += 1\n" * 300 + \
+             "        except ValueError:\n" \
+             "            continue\n" \
+             "    return value\n"
+    module = ModuleType("generated")
+    module.another_func = another_func
+    exec(source, vars(module))
+    func = module.func
+
+    instrs, _ = disassemble(func.__code__)
+    assemble(instrs)
+    assert any(instr.extended_args for instr in instrs)
+
+    decorated = NativeCallTransformer(module, mock_decorate)(func)
+
+    assert decorated([1, 2]) == func([1, 2]) == 302
+    mock_decorate.assert_called_once_with(another_func)
+
+
+def test_wrapping_calls(mock_decorate):
+    def func_to_decorate():
+        return another_func(1, *[2], k=3, **{"a": 4}), another_func(5, k=6)
+
+    decorated = NativeCallTransformer(MODULE, mock_decorate)(func_to_decorate)
+
+    assert decorated() == (((1, 2), {"k": 3, "a": 4}), ((5,), {"k": 6}))
+    assert mock_decorate.call_args_list == [mock.call(another_func)] * 2
+
+
+def test_wrapping_method_calls(mock_decorate):
+    def func_to_decorate(instance):
+        return instance.method(1, key=2)
+
+    decorated = NativeCallTransformer(MODULE, mock_decorate)(func_to_decorate)
+
+    assert decorated(Derived()) == (1, 2)
+    assert mock_decorate.call_args_list == [mock.call(Derived.method)]
+
+
+def test_transformed_code_handles_exceptions(mock_decorate):
+    def func_to_decorate():
+        try:
+            raising_func()
+
+        except ValueError:
+            return traceback.extract_tb(sys.exc_info()[2])[0].lineno
+
+    decorated = NativeCallTransformer(MODULE, mock_decorate)(func_to_decorate)
+
+    assert decorated() == func_to_decorate.__code__.co_firstlineno + 2
+
+
+def test_transformer_records_static_callees(mock_decorate):
+    def func_to_decorate(instance):
+        another_func()
+        MODULE.another_func()
+        instance.method(1)
+
+    transformer = NativeCallTransformer(MODULE, mock_decorate)
+    transformer(func_to_decorate)
+
+    assert [call_site.static_callee for call_site in transformer.call_sites] \
+        == [("another_func",), ("MODULE", "another_func"), None]
@@ -0,0 +1,129 @@
+"""Validating include and exclude rules of decorated functions."""
+import posixpath
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.hooks import recursive_hooks
+from recursive_decorator.policy import CompiledRules, DecorationPolicy, \
+    library_paths
+
+
+@pytest.fixture()
+def calls():
+    return []
+
+
+@pytest.fixture()
+def logging_decorator(calls):
+    def decorator(func):
+        def wrapper(*args, **kwargs):
+            calls.append(func.__name__)
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def second(value):
+    return posixpath.join("a", value)
+
+
+def first(value):
+    return second(value) + posixpath.join("b", value)
+
+
+def leaf(value):
+    return value + 1
+
+
+def tree(value):
+    return leaf(value) * 2
+
+
+def test_matching_rules():
+    rules = CompiledRules(["ourcompany", "other.*.api", "/opt/app/",
+                           lambda func: func.__name__ == "second"])
+
+    assert rules.paths == ("/opt/app/",)
+    assert rules.modules.match("ourcompany")
+    assert rules.modules.match("ourcompany.service")
+    assert rules.modules.match("other.payments.api")
+    assert not rules.modules.match("ourcompany2")
+    assert rules.match(second)
+    assert not rules.match(first)
+
+
+def test_including_modules(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator,
+                                    include=[__name__])(first)
+
+    assert decorated("c") == "a/cb/c"
+    assert calls == ["first", "second"]
+
+
+def test_excluding_library_paths(calls, logging_decorator):
+    decorated = recursive_decorator(logging_decorator,
+                                    exclude=library_paths())(first)
+
+    assert decorated("c") == "a/cb/c"
+    assert calls == ["first", "second"]
+
+
+def test_excluding_by_predicate(calls, logging_decorator):
+    decorated = recursive_decorator(
+        logging_decorator, include=[__name__],
+        exclude=[lambda func: func.__name__ == "second"])(first)
+
+    assert decorated("c") == "a/cb/c"
+    assert calls == ["first"]
+
+
+def test_unrestricted_and_restricted_decorators(calls, logging_decorator):
+    unrestricted = recursive_decorator(logging_decorator)
+    restricted = recursive_decorator(
+        logging_decorator, exclude=[lambda func: func.__name__ == "leaf"])
+
+    assert unrestricted(tree)(1) == 4
+    assert calls == ["tree", "leaf"]
+
+    del calls[:]
+    assert restricted(tree)(1) == 4
+    assert calls == ["tree"]
+
+
+def test_decorating_excluded_function_explicitly(calls, logging_decorator):
+    decorated = recursive_decorator(
+        logging_decorator,
+        exclude=[lambda func: func.__name__ in ("tree", "leaf")])(tree)
+
+    assert decorated(1) == 4
+    assert calls == ["tree"]
+
+
+def test_deciding_once_per_code():
+    predicate = mock.MagicMock(return_value=False)
+    policy = DecorationPolicy(exclude=[predicate])
+
+    def make_closure(value):
+        def closure():
+            return value
+
+        return closure
+
+    assert all(policy.allows(make_closure(value)) for value in range(3))
+    assert predicate.call_count == 1
+
+
+def test_hooks_of_included_modules():
+    events = []
+
+    @recursive_hooks(on_enter=lambda code, args: events.append(code.co_name),
+                     include=[__name__])
+    def func_to_decorate():
+        return first("c")
+
+    assert func_to_decorate() == "a/cb/c"
+    assert events == ["func_to_decorate", "first", "second"]
@@ -0,0 +1,143 @@
+"""Validating wrappers generated with the signature of sub functions."""
+import inspect
+import sys
+from types import CodeType, FunctionType
+
+import pytest
+
+from recursive_decorator.specialized import recursive_specialized, \
+    SpecializedWrapperDecorator, get_signature_shape, get_wrapper_factory
+
+
+@pytest.fixture()
+def events():
+    return []
+
+
+def hooks(events):
+    def on_enter(code, frame_args):
+        events.append(("enter", code.co_name, frame_args))
+
+    def on_exit(code, result):
+        events.append(("exit", code.co_name, result))
+
+    return {"on_enter": on_enter, "on_exit": on_exit}
+
+
+def leaf(value, func=1, *args, key=None, code, **kwargs):
+    return value * 2
+
+
+def fixed(first, second=2):
+    return first + second
+
+
+def raising():
+    raise ValueError()
+
+
+def comprehensions(values):
+    return [fixed(value) for value in values], \
+        sum(fixed(value) for value in values)
+
+
+def test_reporting_sub_functions(events):
+    @recursive_specialized(**hooks(events))
+    def func_to_decorate(value):
+        try:
+            raising()
+
+        except ValueError:
+            pass
+
+        return leaf(value, 1, 3, code=4, other=5) + fixed(value)
+
+    assert func_to_decorate(5) == 17
+    assert events == [("enter", "func_to_decorate", (5,)),
+                      ("enter", "raising", ()),
+                      ("exit", "raising", None),
+                      ("enter", "leaf", (5, 1, None, 4, (3,), {"other": 5})),
+                      ("exit", "leaf", 10),
+                      ("enter", "fixed", (5, 2)),
+                      ("exit", "fixed", 7),
+                      ("exit", "func_to_decorate", 17)]
+
+
+@pytest.mark.parametrize("func", [leaf, fixed, raising])
+def test_wrapper_has_signature_of_function(events, func):
+    wrapper = SpecializedWrapperDecorator(**hooks(events))(func)
+
+    assert inspect.signature(wrapper, follow_wrapped=False) == \
+        inspect.signature(func)
+    assert wrapper.__name__ == func.__name__
+    assert wrapper.__wrapped__ is func
+
+
+def test_fixed_arity_wrapper_takes_no_var_arguments(events):
+    wrapper = SpecializedWrapperDecorator(**hooks(events))(fixed)
+
+    assert wrapper.__code__.co_flags & \
+        (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS) == 0
+    assert wrapper(1) == 3
+    assert wrapper(1, second=3) == 4
+    with pytest.raises(TypeError):
+        wrapper(1, third=3)
+
+
+@pytest.mark.skipif(sys.version_info < (3, 8),
+                    reason="Positional only arguments require Python 3.8")
+def test_wrapping_positional_only_arguments(events):
+    namespace = {}
+    exec("def func(first, /, second, *, third=3):\n"
+         "    return first, second, third\n", namespace)
+    wrapper = SpecializedWrapperDecorator(**hooks(events))(namespace["func"])
+
+    assert wrapper(1, second=2) == (1, 2, 3)
+    assert events == [("enter", "func", (1, 2, 3)),
+                      ("exit", "func", (1, 2, 3))]
+    with pytest.raises(TypeError):
+        wrapper(first=1, second=2)
+
+
+def test_functions_of_same_shape_share_factory():
+    def other_fixed(first, second=3):
+        return first - second
+
+    assert get_signature_shape(fixed) == get_signature_shape(other_fixed)
+    assert get_wrapper_factory(get_signature_shape(fixed), True, False) is \
+        get_wrapper_factory(get_signature_shape(other_fixed), True, False)
+
+
+def test_single_hook(events):
+    on_exit = hooks(events)["on_exit"]
+
+    @recursive_specialized(on_exit=on_exit)
+    def func_to_decorate(value):
+        return fixed(value, 1)
+
+    assert func_to_decorate(1) == 2
+    assert events == [("exit", "fixed", 2),
+                      ("exit", "func_to_decorate", 2)]
+
+
+def test_wrapping_comprehensions(events):
+    @recursive_specialized(**hooks(events))
+    def func_to_decorate(values):
+        return comprehensions(values)
+
+    assert func_to_decorate([1, 2]) == ([3, 4], 7)
+    assert [name for event, name, _ in events
+            if event == "enter" and name == "fixed"] == ["fixed"] * 4
+
+
+def test_wrapping_arguments_that_are_not_identifiers(events):
+    genexpr_code = next(const for const in comprehensions.__code__.co_consts
+                        if isinstance(const, CodeType) and
+                        const.co_name == "<genexpr>")
+    genexpr = FunctionType(genexpr_code, globals())
+    values = iter([1, 2])
+
+    wrapper = SpecializedWrapperDecorator(**hooks(events))(genexpr)
+
+    assert list(wrapper(values)) == [3, 4]
+    assert events[0] == ("enter", "<genexpr>", (values,))
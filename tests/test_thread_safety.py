@@ -0,0 +1,120 @@
+"""Validating concurrent first calls transform and decorate callees once."""
+import threading
+import time
+from collections import Counter
+
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.backend import get_transformer_class
+from recursive_decorator.transform_cache import transform_cache
+
+THREADS_COUNT = 64
+TRANSFORM_DELAY = 0.01
+
+
+@pytest.fixture()
+def slow_transform_spy():
+    transformer_class = get_transformer_class()
+    transform = transformer_class.transform
+    # Callees are transformed once for all decorators
+    transform_cache.clear()
+
+    def slow_transform(self, code, *args, **kwargs):
+        time.sleep(TRANSFORM_DELAY)
+        return transform(self, code, *args, **kwargs)
+
+    with mock.patch.object(transformer_class, "transform", autospec=True,
+                           side_effect=slow_transform) as transform_spy:
+        yield transform_spy
+
+
+def transformed_names(transform_spy):
+    return Counter(getattr(call[0][1], "co_name", None) or call[0][1].name
+                   for call in transform_spy.call_args_list)
+
+
+def run_together(target):
+    barrier = threading.Barrier(THREADS_COUNT)
+    errors = []
+
+    def run():
+        try:
+            barrier.wait()
+            target()
+
+        except BaseException as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run) for _ in range(THREADS_COUNT)]
+    for thread in threads:
+        thread.start()
+
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+
+
+def first_callee(value):
+    return second_callee(value) + 1
+
+
+def second_callee(value):
+    return value * 2
+
+
+def test_concurrent_first_calls(slow_transform_spy):
+    decorated = Counter()
+    results = []
+
+    def counting_decorator(func):
+        decorated[func.__name__] += 1
+        return func
+
+    @recursive_decorator(counting_decorator)
+    def func_to_decorate():
+        return first_callee(1), second_callee(2)
+
+    run_together(lambda: results.append(func_to_decorate()))
+
+    assert results == [(3, 4)] * THREADS_COUNT
+
+    assert transformed_names(slow_transform_spy) == {
+        "func_to_decorate": 1, "first_callee": 1, "second_callee": 1}
+    assert decorated == {
+        "func_to_decorate": 1, "first_callee": 1, "second_callee": 2}
+
+
+def test_concurrent_decorations(slow_transform_spy):
+    def decorator(func):
+        return func
+
+    def func_to_decorate():
+        return first_callee(1)
+
+    decorate = recursive_decorator(decorator)
+    run_together(lambda: decorate(func_to_decorate)())
+
+    assert transformed_names(slow_transform_spy) == {
+        "func_to_decorate": 1, "first_callee": 1, "second_callee": 1}
+
+
+def test_concurrent_decorations_create_decorator_once():
+    created = []
+
+    def decorator_factory(name):
+        created.append(name)
+        return lambda func: func
+
+    def func_to_decorate():
+        return first_callee(1)
+
+    def decorate_and_call():
+        assert recursive_decorator(decorator_factory, "factory")(
+            func_to_decorate)() == 3
+
+    run_together(decorate_and_call)
+
+    assert created == ["factory"]
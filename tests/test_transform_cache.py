@@ -0,0 +1,177 @@
+"""Validating callees are transformed once."""
+import mock
+import pytest
+
+from recursive_decorator import recursive_decorator
+from recursive_decorator.transform_cache import TransformCache, \
+    estimate_code_size
+from recursive_decorator.backend import get_transformer_class
+
+
+@pytest.fixture()
+def mock_decorator():
+    decorator = mock.MagicMock()
+    decorator.__name__ = 'mock_decorator'
+    decorator.side_effect = lambda func: func
+
+    return decorator
+
+
+@pytest.fixture()
+def transform_spy():
+    transformer_class = get_transformer_class()
+    with mock.patch.object(transformer_class, "transform", autospec=True,
+                           side_effect=transformer_class.transform) \
+            as transform:
+        yield transform
+
+
+def transformed_names(transform_spy):
+    return [getattr(call[0][1], "co_name", None) or call[0][1].name
+            for call in transform_spy.call_args_list]
+
+
+def test_transforming_sub_call_once(mock_decorator, transform_spy):
+    def another_func():
+        another_func.call_count += 1
+
+    another_func.call_count = 0
+
+    @recursive_decorator(mock_decorator)
+    def func_to_decorate():
+        another_func()
+        another_func()
+
+    func_to_decorate()
+
+    assert another_func.call_count == 2
+    assert mock_decorator.call_count == 3
+    assert transformed_names(transform_spy).count("another_func") == 1
+
+
+def test_transforming_closures_of_same_code_once(mock_decorator,
+                                                 transform_spy):
+    values = []
+
+    def make_closure(value):
+        def closure():
+            values.append(value)
+
+        return closure
+
+    for value in range(3):
+        recursive_decorator(mock_decorator)(make_closure(value))()
+
+    assert values == [0, 1, 2]
+
+    assert transformed_names(transform_spy).count("closure") == 1
+
+
+def test_transforming_once_for_all_decorator_args(mock_decorator,
+                                                  transform_spy):
+    mock_decorator.side_effect = None
+    mock_decorator.return_value = lambda func: func
+
+    def func_to_decorate():
+        pass
+
+    recursive_decorator(mock_decorator, 1)(func_to_decorate)
+    recursive_decorator(mock_decorator, 1)(func_to_decorate)
+    recursive_decorator(mock_decorator, 2)(func_to_decorate)
+
+    assert transformed_names(transform_spy).count("func_to_decorate") == 1
+
+
+def test_transforming_with_unhashable_decorator_args(mock_decorator,
+                                                     transform_spy):
+    mock_decorator.side_effect = None
+    mock_decorator.return_value = lambda func: func
+
+    def func_to_decorate():
+        pass
+
+    recursive_decorator(mock_decorator, [])(func_to_decorate)
+    recursive_decorator(mock_decorator, [])(func_to_decorate)
+
+    assert transformed_names(transform_spy).count("func_to_decorate") == 1
+
+
+def test_transforming_once_for_all_decorators(transform_spy):
+    def first_decorator(func):
+        return func
+
+    def second_decorator(func):
+        return func
+
+    def another_func():
+        pass
+
+    def func_to_decorate():
+        another_func()
+
+    recursive_decorator(first_decorator)(func_to_decorate)()
+    recursive_decorator(second_decorator)(func_to_decorate)()
+
+    names = transformed_names(transform_spy)
+    assert names.count("func_to_decorate") == 1
+    assert names.count("another_func") == 1
+
+
+def make_code(value):
+    namespace = {}
+    exec("def func():\n    return {}".format(value), namespace)
+
+    return namespace["func"].__code__
+
+
+def test_evicting_least_recently_used_entry():
+    cache = TransformCache(max_entries=2, max_bytes=None)
+    codes = [make_code(value) for value in range(3)]
+
+    cache.set(codes[0], codes[0])
+    cache.set(codes[1], codes[1])
+    assert cache.get(codes[0]) is codes[0]
+
+    cache.set(codes[2], codes[2])
+
+    assert cache.get(codes[0]) is codes[0]
+    assert cache.get(codes[1]) is None
+    assert cache.get(codes[2]) is codes[2]
+    assert cache.stats().entries == 2
+    assert cache.stats().evictions == 1
+
+
+def test_evicting_entries_exceeding_bytes_budget():
+    codes = [make_code(value) for value in range(3)]
+    code_size = estimate_code_size(codes[0])
+    cache = TransformCache(max_entries=None, max_bytes=2 * code_size)
+
+    for code in codes:
+        cache.set(code, code)
+
+    assert cache.get(codes[0]) is None
+    assert cache.stats() == (2, 2 * code_size, 1)
+
+
+def test_configuring_smaller_limits_evicts_entries():
+    cache = TransformCache()
+    codes = [make_code(value) for value in range(3)]
+
+    for code in codes:
+        cache.set(code, code)
+
+    cache.configure(max_entries=1)
+
+    assert cache.stats().entries == 1
+    assert cache.stats().evictions == 2
+    assert cache.stats().bytes == estimate_code_size(codes[2])
+
+
+def test_setting_same_entry_again():
+    cache = TransformCache()
+    code = make_code(1)
+
+    cache.set(code, code)
+    cache.set(code, code)
+
+    assert cache.stats() == (1, estimate_code_size(code), 0)